@@ -7,7 +7,7 @@ for different purposes, routing by path prefix.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from loguru import logger
 
@@ -161,6 +161,25 @@ class SparrowCompositeBackend:
         backend = self._get_backend_for_path(file_path)
         return backend.read(file_path, offset=offset, limit=limit)
 
+    def read_with_info(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 2000,
+    ) -> Optional[Tuple[str, FileInfo]]:
+        """Read content and file info from the appropriate backend.
+
+        Args:
+            file_path: Path to read.
+            offset: Line offset.
+            limit: Line limit.
+
+        Returns:
+            (content, FileInfo) or None.
+        """
+        backend = self._get_backend_for_path(file_path)
+        return backend.read_with_info(file_path, offset=offset, limit=limit)
+
     def write(
         self,
         file_path: str,
@@ -281,6 +300,7 @@ class SparrowCompositeBackend:
         old_string: str,
         new_string: str,
         replace_all: bool = False,
+        expected_version: Optional[int] = None,
     ) -> EditResult:
         """Edit file in the appropriate backend.
 
@@ -289,12 +309,19 @@ class SparrowCompositeBackend:
             old_string: String to find.
             new_string: Replacement string.
             replace_all: Replace all occurrences.
+            expected_version: Optional optimistic version check.
 
         Returns:
-            EditResult.
+            EditResult (``retryable`` set on version conflicts).
         """
         backend = self._get_backend_for_path(file_path)
-        return backend.edit(file_path, old_string, new_string, replace_all=replace_all)
+        return backend.edit(
+            file_path,
+            old_string,
+            new_string,
+            replace_all=replace_all,
+            expected_version=expected_version,
+        )
 
     def exists(self, file_path: str) -> bool:
         """Check if file exists in appropriate backend.
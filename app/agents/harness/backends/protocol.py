@@ -16,18 +16,23 @@ as the canonical source, imported by other backend implementations.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Dict, List, Optional, Protocol, Tuple, runtime_checkable
 
 
 @dataclass
 class FileInfo:
-    """Information about a stored file."""
+    """Information about a stored file.
+
+    ``version`` is the value to pass as ``expected_version`` to ``edit``
+    (None when the backend does not track versions).
+    """
 
     path: str
     size: int
     created_at: str
     updated_at: str
     metadata: Dict[str, Any]
+    version: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict."""
@@ -37,6 +42,7 @@ class FileInfo:
             "created_at": self.created_at,
             "updated_at": self.updated_at,
             "metadata": self.metadata,
+            "version": self.version,
         }
 
 
@@ -61,11 +67,18 @@ class WriteResult:
 
 @dataclass
 class EditResult:
-    """Result of an edit operation."""
+    """Result of an edit operation.
+
+    ``version`` is the file version after the edit (or the current version on
+    a conflict). ``retryable`` marks failures caused by a concurrent change,
+    where re-reading and retrying the edit is expected to succeed.
+    """
 
     success: bool
     replacements: int
     error: Optional[str] = None
+    version: Optional[int] = None
+    retryable: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dict."""
@@ -73,6 +86,8 @@ class EditResult:
             "success": self.success,
             "replacements": self.replacements,
             "error": self.error,
+            "version": self.version,
+            "retryable": self.retryable,
         }
 
 
@@ -140,6 +155,27 @@ class BackendProtocol(Protocol):
         """
         ...
 
+    def read_with_info(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 500,
+    ) -> Optional[Tuple[str, FileInfo]]:
+        """Read content together with the file's info in one operation.
+
+        The returned ``FileInfo.version`` matches the returned content, so it
+        can be passed to ``edit`` as ``expected_version``.
+
+        Args:
+            file_path: Path to the file to read.
+            offset: Line offset to start reading from (0-indexed).
+            limit: Maximum number of lines to return.
+
+        Returns:
+            (content, FileInfo) tuple, or None if file not found.
+        """
+        ...
+
     def write(
         self,
         file_path: str,
@@ -216,14 +252,21 @@ class BackendProtocol(Protocol):
         old_string: str,
         new_string: str,
         replace_all: bool = False,
+        expected_version: Optional[int] = None,
     ) -> EditResult:
         """Edit a file by replacing strings.
 
+        The replacement is applied atomically against the current content, so
+        concurrent edits to different parts of a file do not overwrite each
+        other.
+
         Args:
             file_path: Path to the file to edit.
             old_string: String to find and replace.
             new_string: Replacement string.
             replace_all: If True, replace all occurrences; otherwise replace first only.
+            expected_version: Optional version the caller last saw; the edit
+                fails with ``retryable=True`` if the file changed since.
 
         Returns:
             EditResult with success status, replacement count, and error if any.
@@ -260,6 +303,29 @@ class InMemoryBackend:
         selected = lines[offset : offset + limit]
         return "\n".join(selected)
 
+    def read_with_info(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = 500,
+    ) -> Optional[Tuple[str, FileInfo]]:
+        entry = self._storage.get(file_path)
+        if entry is None:
+            return None
+        content = self.read(file_path, offset=offset, limit=limit) or ""
+        return content, self._file_info(file_path, entry)
+
+    @staticmethod
+    def _file_info(file_path: str, entry: Dict[str, Any]) -> FileInfo:
+        return FileInfo(
+            path=file_path,
+            size=len(entry.get("content", "")),
+            created_at=entry.get("created_at", ""),
+            updated_at=entry.get("updated_at", ""),
+            metadata=entry.get("metadata", {}),
+            version=entry.get("version"),
+        )
+
     def write(
         self,
         file_path: str,
@@ -269,11 +335,13 @@ class InMemoryBackend:
         from datetime import datetime, timezone
 
         now = datetime.now(timezone.utc).isoformat()
+        previous = self._storage.get(file_path, {})
         self._storage[file_path] = {
             "content": content,
             "metadata": metadata or {},
-            "created_at": self._storage.get(file_path, {}).get("created_at", now),
+            "created_at": previous.get("created_at", now),
             "updated_at": now,
+            "version": previous.get("version", 0) + 1,
         }
         return WriteResult(success=True, path=file_path, size=len(content))
 
@@ -290,15 +358,7 @@ class InMemoryBackend:
         for file_path, entry in self._storage.items():
             # Match if: exact file, or file is in directory (starts with path/)
             if file_path == path or file_path.startswith(normalized_path):
-                results.append(
-                    FileInfo(
-                        path=file_path,
-                        size=len(entry.get("content", "")),
-                        created_at=entry.get("created_at", ""),
-                        updated_at=entry.get("updated_at", ""),
-                        metadata=entry.get("metadata", {}),
-                    )
-                )
+                results.append(self._file_info(file_path, entry))
         return results
 
     def glob_info(self, pattern: str, path: str = "/") -> List[FileInfo]:
@@ -360,11 +420,24 @@ class InMemoryBackend:
         old_string: str,
         new_string: str,
         replace_all: bool = False,
+        expected_version: Optional[int] = None,
     ) -> EditResult:
-        content = self.read(file_path, limit=100000)
-        if content is None:
+        entry = self._storage.get(file_path)
+        if entry is None:
             return EditResult(success=False, replacements=0, error="File not found")
 
+        version = entry.get("version", 1)
+        if expected_version is not None and expected_version != version:
+            return EditResult(
+                success=False,
+                replacements=0,
+                error=f"Version conflict: expected {expected_version}, found {version}",
+                version=version,
+                retryable=True,
+            )
+
+        content = entry.get("content", "")
+
         if old_string not in content:
             return EditResult(success=False, replacements=0, error="String not found")
 
@@ -375,8 +448,12 @@ class InMemoryBackend:
             replacements = 1
             new_content = content.replace(old_string, new_string, 1)
 
-        self.write(file_path, new_content)
-        return EditResult(success=True, replacements=replacements)
+        self.write(file_path, new_content, metadata=entry.get("metadata"))
+        return EditResult(
+            success=True,
+            replacements=replacements,
+            version=self._storage[file_path]["version"],
+        )
 
     def exists(self, file_path: str) -> bool:
         """Check if a file exists.
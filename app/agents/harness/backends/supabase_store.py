@@ -8,11 +8,15 @@ This backend provides persistent storage for:
 
 from __future__ import annotations
 
+import fnmatch
+import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from loguru import logger
 
+from app.db.supabase.client import is_missing_rpc
+
 # Import data types from protocol (canonical source)
 from .protocol import FileInfo, WriteResult, EditResult, GrepMatch
 
@@ -24,6 +28,104 @@ if TYPE_CHECKING:
 DEFAULT_TABLE = "agent_files"
 MAX_CONTENT_SIZE = 10_000_000  # 10MB limit
 DEFAULT_READ_LIMIT = 500  # lines
+GREP_RPC = "grep_agent_files"  # migration 044
+GLOB_RPC = "glob_agent_files"  # migration 044
+EDIT_RPC = "edit_agent_file"  # migration 045
+MAX_SEARCH_RESULTS = 5000
+
+
+def _to_postgres_regex(pattern: str) -> Optional[str]:
+    """Translate a Python regex to a Postgres ARE, or None if not portable.
+
+    ``\\b``/``\\B`` are word boundaries in Python but backspace / unsupported
+    in an ARE (``\\y``/``\\Y`` there). Group extensions other than ``(?:``
+    (inline flags, named groups, lookaround, atomic groups) differ between
+    the dialects, so those patterns are matched client-side instead.
+    """
+    translated: List[str] = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escaped = pattern[i + 1]
+            if not in_class and escaped == "b":
+                translated.append("\\y")
+            elif not in_class and escaped == "B":
+                translated.append("\\Y")
+            else:
+                translated.append(pattern[i : i + 2])
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            translated.append(char)
+            i += 1
+            # A leading "]" (after an optional "^") is a literal member.
+            if pattern.startswith("^", i):
+                translated.append("^")
+                i += 1
+            if pattern.startswith("]", i):
+                translated.append("]")
+                i += 1
+            continue
+        elif char == "(" and pattern.startswith("?", i + 1):
+            if not pattern.startswith(":", i + 2):
+                return None
+        translated.append(char)
+        i += 1
+    return "".join(translated)
+
+
+def _row_to_file_info(row: Dict[str, Any]) -> FileInfo:
+    """Build a FileInfo from an agent_files row or a glob RPC row."""
+    size = row.get("size")
+    if size is None:
+        # Calculate size from content in the same row (no extra query)
+        size = len(row.get("content") or "")
+    version = row.get("version")
+    return FileInfo(
+        path=row["path"],
+        size=size,
+        created_at=row.get("created_at", ""),
+        updated_at=row.get("updated_at", ""),
+        metadata=row.get("metadata", {}),
+        version=int(version) if version is not None else None,
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _glob_to_like(pattern: str, path: str) -> str:
+    """Translate a glob relative to ``path`` into a LIKE pattern on full paths.
+
+    The result matches a superset of the glob (``[...]`` becomes a single-char
+    wildcard); callers re-check candidates with ``fnmatch``.
+    """
+    translated: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            if not translated or translated[-1] != "%":
+                translated.append("%")
+        elif char == "?":
+            translated.append("_")
+        elif char == "[" and "]" in pattern[i + 2 :]:
+            translated.append("_")
+            i = pattern.index("]", i + 2)
+        else:
+            translated.append(_escape_like(char))
+        i += 1
+    # "%" between base and pattern absorbs the separator(s) stripped from
+    # relative paths.
+    return f"{_escape_like(path)}%{''.join(translated).lstrip('%')}"
+
 
 # Re-export for backwards compatibility
 __all__ = ["SupabaseStoreBackend", "FileInfo", "WriteResult", "EditResult", "GrepMatch"]
@@ -106,6 +208,43 @@ class SupabaseStoreBackend:
             logger.warning("supabase_read_failed", path=file_path, error=str(exc))
             return None
 
+    def read_with_info(
+        self,
+        file_path: str,
+        offset: int = 0,
+        limit: int = DEFAULT_READ_LIMIT,
+    ) -> Optional[Tuple[str, FileInfo]]:
+        """Read content and file info (including ``version``) in one query.
+
+        Args:
+            file_path: Path to the file.
+            offset: Line offset to start reading from.
+            limit: Maximum number of lines to read (defaults to 500).
+
+        Returns:
+            (content, FileInfo) tuple, or None if not found.
+        """
+        try:
+            # "*" so the version column is included once migration 045 is applied.
+            response = (
+                self.client.table(self.table)
+                .select("*")
+                .eq("path", file_path)
+                .single()
+                .execute()
+            )
+        except Exception as exc:
+            logger.warning("supabase_read_failed", path=file_path, error=str(exc))
+            return None
+
+        row = response.data
+        if not row:
+            return None
+        content = row.get("content") or ""
+        start = max(offset, 0)
+        selected = content.split("\n")[start : start + max(limit, 0)]
+        return "\n".join(selected), _row_to_file_info(row)
+
     def write(
         self,
         file_path: str,
@@ -188,30 +327,15 @@ class SupabaseStoreBackend:
             # Use LIKE to match path prefix
             pattern = f"{path}%"
             # Include content in the query to calculate size without N+1 queries
+            # ("*" also picks up the version column from migration 045)
             response = (
                 self.client.table(self.table)
-                .select("path, content, metadata, created_at, updated_at")
+                .select("*")
                 .like("path", pattern)
                 .execute()
             )
 
-            files = []
-            for row in response.data or []:
-                # Calculate size from content in the same row (no extra query)
-                content = row.get("content", "")
-                size = len(content) if content else 0
-
-                files.append(
-                    FileInfo(
-                        path=row["path"],
-                        size=size,
-                        created_at=row.get("created_at", ""),
-                        updated_at=row.get("updated_at", ""),
-                        metadata=row.get("metadata", {}),
-                    )
-                )
-
-            return files
+            return [_row_to_file_info(row) for row in response.data or []]
 
         except Exception as exc:
             logger.warning("supabase_ls_failed", path=path, error=str(exc))
@@ -220,6 +344,9 @@ class SupabaseStoreBackend:
     def glob_info(self, pattern: str, path: str = "/") -> List[FileInfo]:
         """Find files matching a glob pattern.
 
+        The glob is translated to an indexed LIKE query on ``path`` (via the
+        ``glob_agent_files`` RPC) so content is never transferred.
+
         Args:
             pattern: Glob pattern (e.g., "*.txt", "**/*.json").
             path: Base path to search from.
@@ -227,14 +354,25 @@ class SupabaseStoreBackend:
         Returns:
             List of matching FileInfo objects.
         """
-        import fnmatch
-
-        # Get all files under path
-        all_files = self.ls_info(path)
+        try:
+            response = self.client.rpc(
+                GLOB_RPC,
+                {
+                    "p_like": _glob_to_like(pattern, path or ""),
+                    "p_limit": MAX_SEARCH_RESULTS,
+                },
+            ).execute()
+            candidates = [_row_to_file_info(row) for row in response.data or []]
+        except Exception as exc:
+            if not is_missing_rpc(exc, GLOB_RPC):
+                logger.warning("supabase_glob_failed", pattern=pattern, error=str(exc))
+                return []
+            logger.warning("supabase_glob_rpc_unavailable_fallback", error=str(exc))
+            candidates = self.ls_info(path)
 
         # Filter by pattern
         matched = []
-        for file_info in all_files:
+        for file_info in candidates:
             relative_path = file_info.path
             if path and file_info.path.startswith(path):
                 relative_path = file_info.path[len(path) :].lstrip("/")
@@ -252,6 +390,11 @@ class SupabaseStoreBackend:
     ) -> List[GrepMatch]:
         """Search for pattern in files.
 
+        Matching runs in the database (``grep_agent_files`` RPC, trigram
+        indexed) and only matching lines with their context come back.
+        Patterns that do not translate to Postgres regex syntax are matched
+        client-side.
+
         Args:
             pattern: Regex pattern to search for.
             path: Optional path prefix to limit search.
@@ -260,24 +403,63 @@ class SupabaseStoreBackend:
         Returns:
             List of GrepMatch objects.
         """
-        import re
-
         try:
             regex = re.compile(pattern, re.IGNORECASE)
         except re.error as exc:
             logger.warning("invalid_grep_pattern", pattern=pattern, error=str(exc))
             return []
 
-        # Get files to search
-        if path:
-            files = self.ls_info(path)
-        else:
-            files = self.ls_info("/")
+        db_pattern = _to_postgres_regex(pattern)
+        if db_pattern is None:
+            return self._grep_client_side(regex, path or "/", context_lines)
+
+        try:
+            response = self.client.rpc(
+                GREP_RPC,
+                {
+                    "p_pattern": db_pattern,
+                    "p_path_prefix": path or "/",
+                    "p_context_lines": max(context_lines, 0),
+                    "p_max_matches": MAX_SEARCH_RESULTS,
+                },
+            ).execute()
+            return [
+                GrepMatch(
+                    path=row["path"],
+                    line_number=row["line_number"],
+                    content=row.get("line") or "",
+                    context_before=list(row.get("context_before") or []),
+                    context_after=list(row.get("context_after") or []),
+                )
+                for row in response.data or []
+            ]
+        except Exception as exc:
+            if not is_missing_rpc(exc, GREP_RPC):
+                # e.g. a Python regex the database dialect rejects
+                logger.warning("supabase_grep_rpc_failed", error=str(exc))
+            else:
+                logger.warning("supabase_grep_rpc_unavailable_fallback")
+
+        return self._grep_client_side(regex, path or "/", context_lines)
+
+    def _grep_client_side(
+        self, regex: "re.Pattern[str]", path: str, context_lines: int
+    ) -> List[GrepMatch]:
+        """Fallback grep: one query for all contents, matched in Python."""
+        try:
+            response = (
+                self.client.table(self.table)
+                .select("path, content")
+                .like("path", f"{path}%")
+                .execute()
+            )
+        except Exception as exc:
+            logger.warning("supabase_grep_failed", path=path, error=str(exc))
+            return []
 
         matches = []
-        for file_info in files:
-            # Read full file content (unlimited lines) for grep to work correctly
-            content = self._read_full_content(file_info.path)
+        for row in response.data or []:
+            content = row.get("content") or ""
             if not content:
                 continue
 
@@ -290,7 +472,7 @@ class SupabaseStoreBackend:
 
                     matches.append(
                         GrepMatch(
-                            path=file_info.path,
+                            path=row["path"],
                             line_number=idx + 1,
                             content=line,
                             context_before=lines[start:idx],
@@ -300,61 +482,115 @@ class SupabaseStoreBackend:
 
         return matches
 
-    def _read_full_content(self, file_path: str) -> Optional[str]:
-        """Read full file content without line limits.
-
-        Used internally for grep operations where we need all lines.
-
-        Args:
-            file_path: Path to the file.
-
-        Returns:
-            Full file content or None if not found.
-        """
-        try:
-            response = (
-                self.client.table(self.table)
-                .select("content")
-                .eq("path", file_path)
-                .single()
-                .execute()
-            )
-
-            if not response.data:
-                return None
-
-            return response.data.get("content", "") or ""
-
-        except Exception as exc:
-            logger.warning("supabase_read_full_failed", path=file_path, error=str(exc))
-            return None
-
     def edit(
         self,
         file_path: str,
         old_string: str,
         new_string: str,
         replace_all: bool = False,
+        expected_version: Optional[int] = None,
     ) -> EditResult:
         """Edit a file by replacing strings.
 
+        The replacement runs server-side under a row lock (``edit_agent_file``
+        RPC), so only the strings travel and concurrent edits compose instead
+        of overwriting each other.
+
         Args:
             file_path: Path to the file.
             old_string: String to find.
             new_string: String to replace with.
             replace_all: If True, replace all occurrences.
+            expected_version: Optional version the caller last saw.
 
         Returns:
             EditResult indicating success/failure and replacement count.
+            Version conflicts are returned with ``retryable=True``.
+        """
+        try:
+            response = self.client.rpc(
+                EDIT_RPC,
+                {
+                    "p_path": file_path,
+                    "p_old": old_string,
+                    "p_new": new_string,
+                    "p_replace_all": replace_all,
+                    "p_expected_version": expected_version,
+                },
+            ).execute()
+        except Exception as exc:
+            if not is_missing_rpc(exc, EDIT_RPC):
+                logger.error("supabase_edit_failed", path=file_path, error=str(exc))
+                return EditResult(success=False, replacements=0, error=str(exc))
+            logger.warning("supabase_edit_rpc_unavailable_fallback")
+            return self._edit_compare_and_swap(
+                file_path, old_string, new_string, replace_all
+            )
+
+        rows = response.data or []
+        row = rows[0] if rows else {}
+        status = row.get("status")
+        version = row.get("version")
+        if status == "ok":
+            return EditResult(
+                success=True,
+                replacements=row.get("replacements") or 0,
+                version=version,
+            )
+        if status == "conflict":
+            return EditResult(
+                success=False,
+                replacements=0,
+                error=f"Version conflict: expected {expected_version}, found {version}",
+                version=version,
+                retryable=True,
+            )
+        if status == "no_match":
+            return EditResult(
+                success=False,
+                replacements=0,
+                error=f"String not found in file: {old_string[:50]}...",
+                version=version,
+            )
+        return EditResult(
+            success=False,
+            replacements=0,
+            error=f"File not found: {file_path}",
+        )
+
+    def _edit_compare_and_swap(
+        self,
+        file_path: str,
+        old_string: str,
+        new_string: str,
+        replace_all: bool,
+    ) -> EditResult:
+        """Fallback edit: read, replace, and write back only if unchanged.
+
+        ``updated_at`` acts as the version; a concurrent write in between
+        makes the guarded update match no rows and the edit retryable.
         """
-        content = self.read(file_path, limit=100000)
-        if content is None:
+        try:
+            response = (
+                self.client.table(self.table)
+                .select("content, updated_at")
+                .eq("path", file_path)
+                .maybe_single()
+                .execute()
+            )
+        except Exception as exc:
+            logger.warning("supabase_read_failed", path=file_path, error=str(exc))
+            response = None
+
+        row = getattr(response, "data", None)
+        if not row:
             return EditResult(
                 success=False,
                 replacements=0,
                 error=f"File not found: {file_path}",
             )
 
+        content = row.get("content") or ""
         if old_string not in content:
             return EditResult(
                 success=False,
@@ -369,12 +605,29 @@ class SupabaseStoreBackend:
             new_content = content.replace(old_string, new_string, 1)
             replacements = 1
 
-        result = self.write(file_path, new_content)
-        if not result.success:
+        try:
+            updated = (
+                self.client.table(self.table)
+                .update(
+                    {
+                        "content": new_content,
+                        "updated_at": datetime.now(timezone.utc).isoformat(),
+                    }
+                )
+                .eq("path", file_path)
+                .eq("updated_at", row.get("updated_at"))
+                .execute()
+            )
+        except Exception as exc:
+            logger.error("supabase_write_failed", path=file_path, error=str(exc))
+            return EditResult(success=False, replacements=0, error=str(exc))
+
+        if not updated.data:
             return EditResult(
                 success=False,
                 replacements=0,
-                error=result.error,
+                error=f"File changed concurrently: {file_path}",
+                retryable=True,
             )
 
         return EditResult(
@@ -11,16 +11,28 @@ Enhanced in Phase 3 to support:
 - File size caps with truncation
 - Content type hints for better retrieval
 - Direct `evict_large_result` convenience method
+
+Backend writes are offloaded: the pointer is returned immediately while a
+background thread compresses the payload and persists it, and recently
+evicted payloads are served from a small local cache. Workspace files are
+written before the pointer is returned, since agents read them back through
+the workspace store.
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
 import json
 import os
 import re
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from datetime import datetime, timezone
-from functools import wraps
+from functools import partial, wraps
 from typing import Any, Callable, Dict, Optional, TYPE_CHECKING, Union, cast
 
 from langchain_core.messages import ToolMessage
@@ -64,6 +76,100 @@ MAX_FILE_SIZE_BYTES = 500_000  # 500KB absolute maximum
 SUMMARY_LENGTH = 500  # characters for the summary in pointer message
 PREVIEW_LENGTH = 500  # characters for the preview in pointer message
 TIMESTAMP_PATTERN = re.compile(r"_\d{14}$")
+SUMMARY_KEY_LINES = 6  # salient lines quoted in an extractive summary
+# Headings and error/warning lines are what the model most needs from log
+# dumps and scraped pages (markers are matched against lowercased text).
+SALIENT_MARKERS = (
+    "\n# ",
+    "\n## ",
+    "\n### ",
+    "error",
+    "exception",
+    "traceback",
+    "fatal",
+    "critical",
+    "fail",
+    "warn",
+)
+
+# Backend copies under /large_results/ are stored zlib-compressed.
+COMPRESSED_PAYLOAD_PREFIX = "zlib+b64:"
+EVICTION_CACHE_MAX_BYTES = int(
+    os.getenv("SPARROW_EVICTION_CACHE_MAX_BYTES", str(8 * 1024 * 1024))
+)
+EVICTION_WRITE_WORKERS = 2
+
+_write_executor: Optional[ThreadPoolExecutor] = None
+_write_executor_lock = threading.Lock()
+
+
+def _get_write_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for offloaded eviction writes."""
+    global _write_executor
+    with _write_executor_lock:
+        if _write_executor is None:
+            _write_executor = ThreadPoolExecutor(
+                max_workers=EVICTION_WRITE_WORKERS,
+                thread_name_prefix="tool-result-eviction",
+            )
+        return _write_executor
+
+
+def _encode_stored_payload(blob: bytes) -> str:
+    return COMPRESSED_PAYLOAD_PREFIX + base64.b64encode(blob).decode("ascii")
+
+
+def _decode_stored_payload(stored: str) -> str:
+    if not stored.startswith(COMPRESSED_PAYLOAD_PREFIX):
+        return stored
+    try:
+        blob = base64.b64decode(stored[len(COMPRESSED_PAYLOAD_PREFIX) :])
+        return zlib.decompress(blob).decode("utf-8")
+    except (ValueError, zlib.error):
+        return stored
+
+
+class _EvictedResultCache:
+    """Byte-bounded LRU of recently evicted payloads.
+
+    Entries start as the raw string and are swapped for the zlib-compressed
+    bytes once the background writer has compressed them.
+    """
+
+    def __init__(self, max_bytes: int = EVICTION_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[str, Union[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, path: str, payload: Union[str, bytes]) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[path] = payload
+            self._size += len(payload)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get(self, path: str) -> Optional[str]:
+        with self._lock:
+            payload = self._entries.get(path)
+            if payload is None:
+                return None
+            self._entries.move_to_end(path)
+        if isinstance(payload, bytes):
+            return zlib.decompress(payload).decode("utf-8")
+        return payload
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= len(previous)
 
 
 class ToolResultEvictionMiddleware(AgentMiddleware):
@@ -133,6 +239,8 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
         self.max_file_size_bytes = min(max_file_size_bytes, MAX_FILE_SIZE_BYTES)
         self._stats = EvictionStats()
         self._stats_lock = asyncio.Lock()  # Lock for thread-safe stat updates
+        self._result_cache = _EvictedResultCache()
+        self._pending_writes: set[Future] = set()
 
     def _build_backend(self) -> Any:
         """Build an eviction backend, preferring Supabase when enabled."""
@@ -203,38 +311,22 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
             )
             was_truncated = True
 
-        # Determine storage path based on whether workspace_store is available
-        if self.workspace_store:
-            # Use workspace store (session-scoped /knowledge/tool_results/)
-            path = f"/knowledge/tool_results/{tool_call_id}.md"
-            try:
-                await self.workspace_store.write_file(
-                    path,
-                    result,
-                    metadata={
-                        "content_type": content_type,
-                        "original_size": original_size,
-                        "truncated": was_truncated,
-                        "tool_name": tool_name,
-                        "evicted_at": datetime.now(timezone.utc).isoformat(),
-                    },
-                )
-                success = True
-            except Exception as exc:
-                logger.warning(
-                    "evict_large_result_workspace_failed",
-                    path=path,
-                    error=str(exc),
-                )
-                success = False
-        else:
-            # Fall back to legacy backend
-            timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-            path = f"/large_results/{tool_call_id}_{timestamp}"
-            write_result = self.backend.write(path, result)
-            success = getattr(write_result, "success", write_result)
-
-        if not success:
+        # Session-scoped /knowledge/tool_results/ when a workspace store is set,
+        # legacy backend otherwise (that write happens in the background).
+        path = self._eviction_path(tool_call_id)
+        stored = await self._store_evicted(
+            path,
+            result,
+            tool_name,
+            metadata={
+                "content_type": content_type,
+                "original_size": original_size,
+                "truncated": was_truncated,
+                "tool_name": tool_name,
+                "evicted_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        if not stored:
             logger.warning(
                 "evict_large_result_failed",
                 tool_call_id=tool_call_id,
@@ -517,16 +609,10 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
         Returns:
             Pointer message.
         """
-        # Generate storage path
+        # Generate storage path; the backend write runs in the background
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
         path = f"/large_results/{tool_call_id}_{timestamp}"
-
-        # Write to backend
-        write_result = self.backend.write(path, content)
-        success = getattr(write_result, "success", write_result)
-        if not success:
-            logger.warning("eviction_write_failed", path=path, tool=tool_name)
-            return result
+        self._offload_write(path, content, tool_name)
 
         # Update stats (not thread-safe in sync version)
         self._stats.results_evicted += 1
@@ -568,38 +654,20 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
             was_truncated = True
 
         # Phase 3: Use workspace_store when available
-        if self.workspace_store:
-            # Use session-scoped path in workspace
-            path = f"/knowledge/tool_results/{tool_call_id}.md"
-            try:
-                await self.workspace_store.write_file(
-                    path,
-                    content,
-                    metadata={
-                        "content_type": "text/markdown",
-                        "original_size": original_size,
-                        "truncated": was_truncated,
-                        "tool_name": tool_name,
-                        "evicted_at": datetime.now(timezone.utc).isoformat(),
-                    },
-                )
-                success = True
-            except Exception as exc:
-                logger.warning(
-                    "eviction_workspace_write_failed",
-                    path=path,
-                    tool=tool_name,
-                    error=str(exc),
-                )
-                success = False
-        else:
-            # Fall back to legacy backend
-            timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-            path = f"/large_results/{tool_call_id}_{timestamp}"
-            write_result = self.backend.write(path, content)
-            success = getattr(write_result, "success", write_result)
-
-        if not success:
+        path = self._eviction_path(tool_call_id)
+        stored = await self._store_evicted(
+            path,
+            content,
+            tool_name,
+            metadata={
+                "content_type": "text/markdown",
+                "original_size": original_size,
+                "truncated": was_truncated,
+                "tool_name": tool_name,
+                "evicted_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        if not stored:
             logger.warning("eviction_write_failed", path=path, tool=tool_name)
             return result
 
@@ -613,6 +681,91 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
             tool_call_id, tool_name, content, path, original_size, was_truncated
         )
 
+    # -------------------------------------------------------------------------
+    # Offloaded storage
+    # -------------------------------------------------------------------------
+
+    def _eviction_path(self, tool_call_id: str) -> str:
+        """Storage path for an evicted result."""
+        if self.workspace_store:
+            return f"/knowledge/tool_results/{tool_call_id}.md"
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+        return f"/large_results/{tool_call_id}_{timestamp}"
+
+    async def _store_evicted(
+        self,
+        path: str,
+        content: str,
+        tool_name: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Persist an evicted payload; returns False if the pointer is unusable.
+
+        Workspace files are written inline: agents read them back through
+        ``read_workspace_file``, which only sees the workspace store, so the
+        file must exist before the pointer is returned. Backend copies are
+        offloaded.
+        """
+        if not (path.startswith("/knowledge/") and self.workspace_store):
+            self._offload_write(path, content, tool_name)
+            return True
+        try:
+            await self.workspace_store.write_file(path, content, metadata=metadata)
+        except Exception as exc:
+            logger.warning(
+                "eviction_workspace_write_failed",
+                path=path,
+                tool=tool_name,
+                error=str(exc),
+            )
+            return False
+        self._result_cache.put(path, content)
+        return True
+
+    def _offload_write(self, path: str, content: str, tool_name: str) -> None:
+        """Cache the payload locally and persist it to the backend in the background.
+
+        ``read_evicted_result`` serves the local cache first, so the payload
+        is readable immediately and survives a failed write in this process.
+        """
+        self._result_cache.put(path, content)
+        future = _get_write_executor().submit(self._write_evicted, path, content)
+        self._pending_writes.add(future)
+        future.add_done_callback(partial(self._on_write_done, path, tool_name))
+
+    def _write_evicted(self, path: str, content: str) -> bool:
+        """Compress and persist one backend payload (runs on the writer pool)."""
+        blob = zlib.compress(content.encode("utf-8"), 6)
+        self._result_cache.put(path, blob)
+        write_result = self.backend.write(path, _encode_stored_payload(blob))
+        return bool(getattr(write_result, "success", write_result))
+
+    def _on_write_done(self, path: str, tool_name: str, future: Future) -> None:
+        self._pending_writes.discard(future)
+        try:
+            success = future.result()
+            error = None
+        except Exception as exc:
+            success = False
+            error = str(exc)
+        if not success:
+            logger.warning(
+                "eviction_write_failed", path=path, tool=tool_name, error=error
+            )
+
+    def flush_pending_writes(self, timeout: Optional[float] = None) -> int:
+        """Block until offloaded writes finish; returns how many are still pending."""
+        pending = list(self._pending_writes)
+        if pending:
+            wait_futures(pending, timeout=timeout)
+        return len(self._pending_writes)
+
+    async def aflush_pending_writes(self) -> None:
+        """Await all offloaded writes (e.g. before a session is torn down)."""
+        pending = [asyncio.wrap_future(future) for future in list(self._pending_writes)]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
     def _create_pointer_message(
         self,
         tool_call_id: str,
@@ -764,8 +917,10 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
         Returns:
             Summary string.
         """
-        # Try to parse as JSON and extract key info
+        # Try to parse as JSON and extract key info (only when it can be JSON)
         try:
+            if content.lstrip()[:1] not in ("{", "["):
+                raise TypeError("not JSON")
             data = json.loads(content)
             if isinstance(data, dict):
                 # Look for common summary fields
@@ -788,12 +943,60 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
         except (json.JSONDecodeError, TypeError):
             pass
 
-        # Fall back to text truncation
-        lines = content.strip().split("\n")
-        if len(lines) > 3:
-            preview = "\n".join(lines[:3]) + f"\n... ({len(lines) - 3} more lines)"
-        else:
-            preview = content[:SUMMARY_LENGTH]
+        return self._extractive_summary(content)
+
+    @staticmethod
+    def _extractive_summary(content: str) -> str:
+        """Summarize text locally: opening lines plus salient lines from the rest.
+
+        Salient lines (markdown headings, error/warning lines) are located with
+        plain substring scans, so a megabyte of log output costs milliseconds.
+        """
+        text = content.strip()
+        head_end = 0
+        for _ in range(3):
+            next_break = text.find("\n", head_end)
+            if next_break == -1:
+                return content[:SUMMARY_LENGTH]
+            head_end = next_break + 1
+        total_lines = text.count("\n") + 1
+        preview = text[: head_end - 1]
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Case mapping changed offsets (rare non-ASCII); match case-sensitively
+            lowered = text
+        salient_count = 0
+        line_starts: set[int] = set()
+        search_from = head_end - 1  # keep the newline so headings can match
+        for marker in SALIENT_MARKERS:
+            salient_count += lowered.count(marker, search_from)
+            position = search_from
+            for _ in range(SUMMARY_KEY_LINES):
+                position = lowered.find(marker, position)
+                if position == -1:
+                    break
+                if marker.startswith("\n"):
+                    position += 1
+                line_starts.add(text.rfind("\n", 0, position) + 1)
+                position += len(marker)
+
+        key_lines: list[str] = []
+        budget = SUMMARY_LENGTH - len(preview) - 60
+        for line_start in sorted(line_starts)[:SUMMARY_KEY_LINES]:
+            line_end = text.find("\n", line_start)
+            line = text[line_start : line_end if line_end != -1 else None].strip()
+            line = line[:160]
+            if line and line not in key_lines and len(line) + 3 <= budget:
+                key_lines.append(line)
+                budget -= len(line) + 3
+
+        if key_lines:
+            preview += "\nKey lines:\n" + "\n".join(f"- {line}" for line in key_lines)
+        more = f"{total_lines - 3} more lines"
+        if salient_count:
+            more += f", {salient_count} heading/error/warning mentions"
+        preview += f"\n... ({more})"
 
         if len(preview) > SUMMARY_LENGTH:
             preview = preview[: SUMMARY_LENGTH - 3] + "..."
@@ -809,7 +1012,11 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
         Returns:
             Original content or None if not found.
         """
-        return self.backend.read(path)
+        cached = self._result_cache.get(path)
+        if cached is not None:
+            return cached
+        stored = self.backend.read(path)
+        return _decode_stored_payload(stored) if stored is not None else None
 
     def cleanup_evicted_results(
         self,
@@ -844,6 +1051,7 @@ class ToolResultEvictionMiddleware(AgentMiddleware):
                 except (ValueError, IndexError):
                     # Skip malformed timestamps instead of deleting
                     continue
+            self._result_cache.discard(path)
             if self.backend.delete(path):
                 deleted += 1
         return deleted
@@ -2,7 +2,7 @@
 
 This module provides PostgreSQL-backed checkpointing for LangGraph workflows:
 - SupabaseCheckpointer: Async checkpointer using Supabase/PostgreSQL
-- ThreadManager: Thread lifecycle management (create, fork, switch)
+- ThreadManager: Thread lifecycle management (create, fork, switch, retention)
 - CheckpointerConfig: Configuration dataclass
 
 Usage:
@@ -19,12 +19,13 @@ Usage:
 
 from .config import CheckpointerConfig
 from .postgres_checkpointer import CheckpointResult, SupabaseCheckpointer
-from .thread_manager import ThreadManager
+from .thread_manager import RetentionStats, ThreadManager
 from .utils import decode_json, ensure_dict, get_row_value, rows_to_dicts
 
 __all__ = [
     "CheckpointerConfig",
     "CheckpointResult",
+    "RetentionStats",
     "SupabaseCheckpointer",
     "ThreadManager",
     # Utilities
@@ -14,6 +14,11 @@ class CheckpointerConfig:
         enable_compression: Whether to compress large checkpoints.
         delta_threshold: Number of checkpoints before creating a snapshot.
         cleanup_after_days: Age threshold for checkpoint cleanup.
+        retention_keep_last: Newest checkpoints kept per thread regardless of
+            age (overridable per thread via ``config.checkpoint_keep_last``).
+        retention_batch_size: Checkpoints deleted per retention batch.
+        retention_batch_pause_seconds: Pause between retention batches.
+        retention_interval_seconds: Delay between background retention runs.
     """
 
     db_url: str
@@ -22,3 +27,7 @@ class CheckpointerConfig:
     enable_compression: bool = True
     delta_threshold: int = 10
     cleanup_after_days: int = 30
+    retention_keep_last: int = 10
+    retention_batch_size: int = 500
+    retention_batch_pause_seconds: float = 0.25
+    retention_interval_seconds: float = 3600.0
@@ -3,11 +3,12 @@ from __future__ import annotations
 import json
 import logging
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, is_dataclass, asdict
 from typing import Any, AsyncIterator
 
 from .config import CheckpointerConfig
-from .utils import decode_json
+from .utils import decode_json, get_row_value
 
 logger = logging.getLogger(__name__)
 _DATA_URL_PREFIX = "data:"
@@ -61,12 +62,31 @@ class CheckpointResult:
 def create_connection_pool(
     db_url: str, max_size: int, max_overflow: int
 ):  # pragma: no cover - patched in tests
+    """Build a closed pool of ``max_size`` connections (+ ``max_overflow``).
+
+    Async pools cannot open without a running loop, so the pool is created
+    closed and opened on first use by :func:`pool_connection`.
+    """
     try:
         from psycopg_pool import AsyncConnectionPool  # type: ignore[import-not-found]
-
-        return AsyncConnectionPool(db_url, max_size=max_size, max_overflow=max_overflow)
-    except Exception as e:
+    except ImportError as e:
         raise RuntimeError("psycopg_pool not available") from e
+    size = max(1, max_size)
+    return AsyncConnectionPool(
+        db_url,
+        min_size=size,
+        max_size=size + max(0, max_overflow),
+        open=False,
+    )
+
+
+@asynccontextmanager
+async def pool_connection(pool: Any) -> AsyncIterator[Any]:
+    """Borrow a connection from ``pool``, opening it first if still closed."""
+    if getattr(pool, "closed", False) is True:
+        await pool.open()
+    async with pool.connection() as conn:
+        yield conn
 
 
 class SupabaseCheckpointer:
@@ -82,10 +102,49 @@ class SupabaseCheckpointer:
         )
         # In-memory fallback for tests when using mocked pools without real persistence
         self._last_checkpoints: dict[str, dict[str, Any]] = {}
+        self._cow_supported: bool | None = None
+
+    async def _supports_cow(self, conn) -> bool:
+        """Whether forked checkpoints reference a shared state blob (migration 047)."""
+        if self._cow_supported is None:
+            try:
+                cursor = await conn.execute(
+                    """
+                    SELECT EXISTS (
+                      SELECT 1 FROM information_schema.columns
+                      WHERE table_schema = 'public'
+                        AND table_name = 'langgraph_checkpoints'
+                        AND column_name = 'state_ref_id'
+                    )
+                    """
+                )
+                row = await cursor.fetchone()
+                self._cow_supported = get_row_value(row, "exists", 0) is True
+            except Exception:
+                logger.debug("state_ref_id probe failed; reading state directly")
+                self._cow_supported = False
+        return self._cow_supported
+
+    async def _checkpoint_source(self, conn) -> str:
+        """FROM clause exposing ``resolved_state`` with fork references resolved.
+
+        Copy-on-write forks store an empty state and point at the checkpoint
+        that owns the blob through ``state_ref_id``.
+        """
+        if await self._supports_cow(conn):
+            return """(
+                    SELECT c.*, COALESCE(owner.state, c.state) AS resolved_state
+                    FROM langgraph_checkpoints c
+                    LEFT JOIN langgraph_checkpoints owner
+                      ON owner.id = c.state_ref_id
+                ) AS checkpoints"""
+        return """(
+                    SELECT *, state AS resolved_state FROM langgraph_checkpoints
+                ) AS checkpoints"""
 
     async def setup(self) -> None:
         """Create tables if not exists (DDL) so first writes won't fail."""
-        async with self.pool.connection() as conn:
+        async with pool_connection(self.pool) as conn:
             # Minimal schemas matching expected usage in tests
             # First, perform existence checks via information_schema to match
             # test expectations around table checks being executed.
@@ -251,7 +310,7 @@ class SupabaseCheckpointer:
         state_json = json.dumps(checkpoint_payload)
         metadata_json = json.dumps(metadata_dict)
 
-        async with self.pool.connection() as conn:
+        async with pool_connection(self.pool) as conn:
             try:
                 await conn.execute(
                     """
@@ -298,11 +357,12 @@ class SupabaseCheckpointer:
     async def aget(self, config: dict[str, Any]) -> CheckpointResult:
         """Retrieve latest checkpoint; returns an object with .checkpoint and .config per tests."""
         thread_id = (config or {}).get("configurable", {}).get("thread_id")
-        async with self.pool.connection() as conn:
+        async with pool_connection(self.pool) as conn:
+            source = await self._checkpoint_source(conn)
             res = await conn.execute(
-                """
-                SELECT state
-                FROM langgraph_checkpoints
+                f"""
+                SELECT resolved_state AS state
+                FROM {source}
                 WHERE thread_id = %s
                 ORDER BY created_at DESC
                 LIMIT 1
@@ -351,10 +411,11 @@ class SupabaseCheckpointer:
 
     async def alist(self, config: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
         """List checkpoints; iterate over mocked result from conn.execute()."""
-        async with self.pool.connection() as conn:
-            result = await conn.execute("""
-                SELECT thread_id, checkpoint_id, state, created_at
-                FROM langgraph_checkpoints
+        async with pool_connection(self.pool) as conn:
+            source = await self._checkpoint_source(conn)
+            result = await conn.execute(f"""
+                SELECT thread_id, checkpoint_id, resolved_state AS state, created_at
+                FROM {source}
                 ORDER BY created_at DESC
                 """)
             async for row in result:  # type: ignore
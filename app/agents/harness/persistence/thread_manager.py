@@ -1,15 +1,47 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 import uuid
-from typing import Any
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
 
+from .config import CheckpointerConfig
+from .postgres_checkpointer import pool_connection
 from .utils import decode_json, ensure_dict, get_row_value, rows_to_dicts
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class RetentionStats:
+    """Progress counters for checkpoint retention runs.
+
+    Attributes:
+        runs: Number of (non dry-run) retention runs started.
+        batches: Total delete batches executed.
+        deleted: Total checkpoints deleted.
+        running: Whether a run is in progress.
+        last_run_started_at: Unix timestamp of the latest run start.
+        last_run_deleted: Checkpoints deleted by the latest run so far.
+        last_run_seconds: Duration of the latest finished run.
+        last_batch_ms: Duration of the latest batch.
+        last_error: Error message of the latest failed run.
+    """
+
+    runs: int = 0
+    batches: int = 0
+    deleted: int = 0
+    running: bool = False
+    last_run_started_at: Optional[float] = None
+    last_run_deleted: int = 0
+    last_run_seconds: Optional[float] = None
+    last_batch_ms: Optional[float] = None
+    last_error: Optional[str] = None
+
+
 class ThreadManager:
     """Minimal thread manager that uses the checkpointer's DB pool.
 
@@ -20,6 +52,15 @@ class ThreadManager:
     def __init__(self, checkpointer):
         self.checkpointer = checkpointer
         self.pool = checkpointer.pool
+        config = getattr(checkpointer, "config", None)
+        self._config = (
+            config
+            if isinstance(config, CheckpointerConfig)
+            else CheckpointerConfig(db_url="")
+        )
+        self._cow_supported: Optional[bool] = None
+        self._retention_stats = RetentionStats()
+        self._retention_task: Optional[asyncio.Task] = None
 
     # Preserve static method aliases for backward compatibility with tests
     _ensure_dict = staticmethod(ensure_dict)
@@ -28,7 +69,7 @@ class ThreadManager:
     _rows_to_dicts = staticmethod(rows_to_dicts)
 
     async def get_or_create_thread(self, user_id: str, session_id: int) -> str:
-        async with self.pool.connection() as conn:
+        async with pool_connection(self.pool) as conn:
             select_query = """
                 SELECT id
                 FROM langgraph_threads
@@ -75,7 +116,7 @@ class ThreadManager:
                 return str(new_id)
 
     async def switch_thread(self, user_id: str, thread_id: str) -> dict[str, Any]:
-        async with self.pool.connection() as conn:
+        async with pool_connection(self.pool) as conn:
             select_query = """
                 SELECT id, metadata, config, last_checkpoint_id
                 FROM langgraph_threads
@@ -158,87 +199,72 @@ class ThreadManager:
                 "config": {},
             }
 
+    async def _supports_cow(self, conn) -> bool:
+        """Whether checkpoints can reference a shared state blob (migration 047)."""
+        if self._cow_supported is None:
+            cursor = await conn.execute(
+                """
+                SELECT EXISTS (
+                  SELECT 1 FROM information_schema.columns
+                  WHERE table_schema = 'public'
+                    AND table_name = 'langgraph_checkpoints'
+                    AND column_name = 'state_ref_id'
+                )
+                """
+            )
+            row = await cursor.fetchone()
+            self._cow_supported = bool(self._get_value(row, "exists", 0))
+            if not self._cow_supported:
+                logger.info(
+                    "langgraph_checkpoints.state_ref_id missing; forks copy state"
+                )
+        return self._cow_supported
+
     async def fork_thread(
         self, source_thread_id: str, checkpoint_id: str, note: str
     ) -> str:
+        """Fork ``source_thread_id`` at ``checkpoint_id`` into a new thread.
+
+        Runs as a single statement. With copy-on-write support the forked
+        checkpoint references the parent's state blob instead of copying it,
+        so fork cost does not grow with the size of the thread state.
+        """
         new_thread_id = str(uuid.uuid4())
-        async with self.pool.connection() as conn:
-            try:
-                tx = await conn.transaction()
-                async with tx:
-                    source_query = """
-                        SELECT id, user_id, session_id, title, status, thread_type, metadata, config
-                        FROM langgraph_threads
-                        WHERE id = %s
-                        LIMIT 1
-                        """
-                    source_cursor = await conn.execute(
-                        source_query, (source_thread_id,)
-                    )
-                    source_row = await source_cursor.fetchone()
-                    if not source_row:
-                        raise ValueError(f"Source thread {source_thread_id} not found")
+        new_checkpoint_id = str(uuid.uuid4())
+        fork_metadata: dict[str, Any] = {
+            "forked_from_thread_id": source_thread_id,
+            "forked_from_checkpoint_id": checkpoint_id,
+        }
+        if note:
+            fork_metadata["fork_note"] = note
 
-                    source_user_id = self._get_value(source_row, "user_id", 1)
-                    source_session_id = self._get_value(source_row, "session_id", 2)
-                    source_title = (
-                        self._get_value(source_row, "title", 3) or "Forked Thread"
-                    )
-                    source_status = self._get_value(source_row, "status", 4) or "active"
-                    source_type = (
-                        self._get_value(source_row, "thread_type", 5) or "conversation"
-                    )
-                    source_metadata = self._ensure_dict(
-                        self._get_value(source_row, "metadata", 6)
-                    )
-                    source_config = self._ensure_dict(
-                        self._get_value(source_row, "config", 7)
-                    )
+        async with pool_connection(self.pool) as conn:
+            try:
+                cow = await self._supports_cow(conn)
+                if cow:
+                    state_columns = "state, state_ref_id"
+                    state_values = "'{}'::jsonb, COALESCE(c.state_ref_id, c.id)"
+                    source_columns = "state_ref_id"
+                else:
+                    state_columns = "state"
+                    state_values = "c.state"
+                    source_columns = "state"
 
-                    checkpoint_query = """
-                        SELECT id, state, metadata, version, channel, checkpoint_type
+                fork_query = f"""
+                    WITH source_thread AS (
+                        SELECT id, user_id, session_id, title, status, thread_type,
+                               metadata, config
+                        FROM langgraph_threads
+                        WHERE id = %(source_thread_id)s
+                    ),
+                    source_checkpoint AS (
+                        SELECT id, version, channel, checkpoint_type, metadata,
+                               {source_columns}
                         FROM langgraph_checkpoints
-                        WHERE id = %s AND thread_id = %s
-                        LIMIT 1
-                        """
-                    checkpoint_cursor = await conn.execute(
-                        checkpoint_query, (checkpoint_id, source_thread_id)
-                    )
-                    checkpoint_row = await checkpoint_cursor.fetchone()
-                    if not checkpoint_row:
-                        raise ValueError(
-                            f"Checkpoint {checkpoint_id} not found for thread {source_thread_id}"
-                        )
-
-                    checkpoint_state = self._decode_json(
-                        self._get_value(checkpoint_row, "state", 1), {}
-                    )
-                    checkpoint_metadata = self._ensure_dict(
-                        self._get_value(checkpoint_row, "metadata", 2)
-                    )
-                    checkpoint_version = (
-                        self._get_value(checkpoint_row, "version", 3) or 1
-                    )
-                    checkpoint_channel = (
-                        self._get_value(checkpoint_row, "channel", 4) or "main"
-                    )
-                    checkpoint_type = (
-                        self._get_value(checkpoint_row, "checkpoint_type", 5) or "delta"
-                    )
-
-                    fork_metadata = dict(source_metadata)
-                    fork_metadata.update(
-                        {
-                            "forked_from_thread_id": source_thread_id,
-                            "forked_from_checkpoint_id": checkpoint_id,
-                        }
-                    )
-                    if note:
-                        fork_metadata["fork_note"] = note
-
-                    new_checkpoint_id = str(uuid.uuid4())
-
-                    insert_thread_query = """
+                        WHERE id = %(checkpoint_id)s
+                          AND thread_id = %(source_thread_id)s
+                    ),
+                    new_thread AS (
                         INSERT INTO langgraph_threads (
                             id,
                             user_id,
@@ -253,26 +279,24 @@ class ThreadManager:
                             metadata,
                             config
                         )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s::jsonb, %s::jsonb)
-                        """
-                    await conn.execute(
-                        insert_thread_query,
-                        (
-                            new_thread_id,
-                            source_user_id,
-                            source_session_id,
-                            source_thread_id,
-                            f"{source_title} (Fork)",
-                            source_status,
-                            source_type,
+                        SELECT
+                            %(new_thread_id)s::uuid,
+                            t.user_id,
+                            t.session_id,
+                            t.id,
+                            COALESCE(NULLIF(t.title, ''), 'Forked Thread') || ' (Fork)',
+                            COALESCE(NULLIF(t.status, ''), 'active'),
+                            COALESCE(NULLIF(t.thread_type, ''), 'conversation'),
                             1,
-                            new_checkpoint_id,
-                            json.dumps(fork_metadata),
-                            json.dumps(source_config),
-                        ),
-                    )
-
-                    insert_checkpoint_query = """
+                            %(new_checkpoint_id)s::uuid,
+                            NOW(),
+                            COALESCE(t.metadata, '{{}}'::jsonb) || %(fork_metadata)s::jsonb,
+                            COALESCE(t.config, '{{}}'::jsonb)
+                        FROM source_thread t
+                        CROSS JOIN source_checkpoint c
+                        RETURNING id
+                    ),
+                    new_checkpoint AS (
                         INSERT INTO langgraph_checkpoints (
                             id,
                             thread_id,
@@ -280,27 +304,50 @@ class ThreadManager:
                             version,
                             channel,
                             checkpoint_type,
-                            state,
+                            {state_columns},
                             metadata,
                             is_latest
                         )
-                        VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb, %s::jsonb, TRUE)
-                        """
-                    merged_metadata = dict(checkpoint_metadata)
-                    merged_metadata.update({"forked_from_checkpoint": checkpoint_id})
-                    await conn.execute(
-                        insert_checkpoint_query,
-                        (
-                            new_checkpoint_id,
-                            new_thread_id,
-                            checkpoint_id,
-                            checkpoint_version,
-                            checkpoint_channel,
-                            checkpoint_type,
-                            json.dumps(checkpoint_state),
-                            json.dumps(merged_metadata),
-                        ),
+                        SELECT
+                            %(new_checkpoint_id)s::uuid,
+                            n.id,
+                            c.id,
+                            COALESCE(c.version, 1),
+                            COALESCE(c.channel, 'main'),
+                            COALESCE(c.checkpoint_type, 'delta'),
+                            {state_values},
+                            COALESCE(c.metadata, '{{}}'::jsonb)
+                                || jsonb_build_object('forked_from_checkpoint', c.id::text),
+                            TRUE
+                        FROM new_thread n
+                        CROSS JOIN source_checkpoint c
+                        RETURNING id
                     )
+                    SELECT
+                        (SELECT COUNT(*) FROM source_thread) AS thread_found,
+                        (SELECT COUNT(*) FROM source_checkpoint) AS checkpoint_found,
+                        (SELECT id FROM new_checkpoint) AS new_checkpoint_id
+                    """
+                params = {
+                    "source_thread_id": source_thread_id,
+                    "checkpoint_id": checkpoint_id,
+                    "new_thread_id": new_thread_id,
+                    "new_checkpoint_id": new_checkpoint_id,
+                    "fork_metadata": json.dumps(fork_metadata),
+                }
+
+                tx = await conn.transaction()
+                async with tx:
+                    cursor = await conn.execute(fork_query, params)
+                    row = await cursor.fetchone()
+                    if not self._get_value(row, "thread_found", 0):
+                        raise ValueError(f"Source thread {source_thread_id} not found")
+                    if not self._get_value(row, "checkpoint_found", 1):
+                        raise ValueError(
+                            f"Checkpoint {checkpoint_id} not found for thread {source_thread_id}"
+                        )
+                    if not self._get_value(row, "new_checkpoint_id", 2):
+                        raise RuntimeError("Failed to create forked checkpoint")
 
                 return new_thread_id
             except Exception:
@@ -312,13 +359,25 @@ class ThreadManager:
                 raise
 
     async def get_thread_history(self, thread_id: str) -> list[dict[str, Any]]:
-        async with self.pool.connection() as conn:
-            history_query = """
-                SELECT id, version, checkpoint_type, channel, state, metadata, created_at
-                FROM langgraph_checkpoints
-                WHERE thread_id = %s
-                ORDER BY created_at DESC
-                """
+        async with pool_connection(self.pool) as conn:
+            if await self._supports_cow(conn):
+                # Forked checkpoints read their state from the shared blob.
+                history_query = """
+                    SELECT c.id, c.version, c.checkpoint_type, c.channel,
+                           COALESCE(owner.state, c.state) AS state,
+                           c.metadata, c.created_at
+                    FROM langgraph_checkpoints c
+                    LEFT JOIN langgraph_checkpoints owner ON owner.id = c.state_ref_id
+                    WHERE c.thread_id = %s
+                    ORDER BY c.created_at DESC
+                    """
+            else:
+                history_query = """
+                    SELECT id, version, checkpoint_type, channel, state, metadata, created_at
+                    FROM langgraph_checkpoints
+                    WHERE thread_id = %s
+                    ORDER BY created_at DESC
+                    """
             cursor = await conn.execute(history_query, (thread_id,))
             # Test fixtures stub fetchall() on the connection directly
             try:
@@ -328,46 +387,201 @@ class ThreadManager:
                 rows = await cursor.fetchall()
             return self._rows_to_dicts(cursor, rows)
 
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _retention_query(*, cow: bool, count_only: bool) -> str:
+        """Build the retention statement.
+
+        A checkpoint is eligible when it is older than the cutoff, is not the
+        latest in its channel, falls outside the thread's keep-last-N window
+        (``config.checkpoint_keep_last`` overrides the default), and - with
+        copy-on-write - is not the owner of a blob shared with a fork.
+        """
+        shared_blob_filter = (
+            """
+              AND NOT EXISTS (
+                  SELECT 1 FROM langgraph_checkpoints r WHERE r.state_ref_id = c.id
+              )"""
+            if cow
+            else ""
+        )
+        eligible = f"""
+            FROM langgraph_checkpoints c
+            JOIN langgraph_threads t ON t.id = c.thread_id
+            CROSS JOIN LATERAL (
+                SELECT CASE
+                    WHEN t.config->>'checkpoint_keep_last' ~ '^[0-9]+$'
+                        THEN (t.config->>'checkpoint_keep_last')::int
+                    ELSE %(keep_last)s
+                END AS keep_last
+            ) policy
+            WHERE c.created_at < NOW() - %(interval)s::interval
+              AND c.is_latest IS NOT TRUE
+              AND (
+                  policy.keep_last <= 0
+                  OR c.version < (
+                      SELECT k.version
+                      FROM langgraph_checkpoints k
+                      WHERE k.thread_id = c.thread_id
+                        AND k.channel IS NOT DISTINCT FROM c.channel
+                      ORDER BY k.version DESC
+                      OFFSET GREATEST(policy.keep_last - 1, 0)
+                      LIMIT 1
+                  )
+              ){shared_blob_filter}
+            """
+        if count_only:
+            return f"SELECT COUNT(*) AS deleted_count {eligible}"
+        return f"""
+            WITH batch AS (
+                SELECT c.id
+                {eligible}
+                ORDER BY c.created_at
+                LIMIT %(batch_size)s
+                FOR UPDATE OF c SKIP LOCKED
+            )
+            DELETE FROM langgraph_checkpoints d
+            USING batch
+            WHERE d.id = batch.id
+            RETURNING d.id
+            """
+
     async def cleanup_old_checkpoints(
-        self, days: int = 30, dry_run: bool = True
+        self,
+        days: int = 30,
+        dry_run: bool = True,
+        *,
+        keep_last: int | None = None,
+        batch_size: int | None = None,
+        pause_seconds: float | None = None,
+        max_batches: int | None = None,
     ) -> int:
-        async with self.pool.connection() as conn:
-            interval_param = f"{max(days, 0)} days"
-            if dry_run:
-                query = """
-                    SELECT COUNT(*) AS deleted_count
-                    FROM langgraph_checkpoints
-                    WHERE created_at < NOW() - %s::interval
-                    """
-                await conn.execute(query, (interval_param,))
-                try:
-                    row = await conn.fetchone()  # type: ignore[attr-defined]
-                except Exception:
-                    cursor = await conn.execute(query, (interval_param,))
-                    row = await cursor.fetchone()
-                deleted_count = self._get_value(row, "deleted_count", 0) or 0
-                return int(deleted_count)
+        """Delete checkpoints older than ``days`` in small, paced batches.
 
-            delete_query = """
-                DELETE FROM langgraph_checkpoints
-                WHERE created_at < NOW() - %s::interval
-                RETURNING id
-                """
-            cursor = await conn.execute(delete_query, (interval_param,))
-            # Prefer a single-row count if the mock provides it
-            try:
-                row = await conn.fetchone()  # type: ignore[attr-defined]
-                if row is not None:
-                    val = self._get_value(row, "deleted_count", 0)
-                    if isinstance(val, int) and val > 0:
-                        return int(val)
-            except Exception:
-                pass
-            # Otherwise count returned ids from the cursor
+        Each batch is its own short transaction and skips rows locked by live
+        writers, so retention never holds long locks or deletes a large slice
+        of the table at once. ``dry_run`` only counts eligible checkpoints.
+        Progress is recorded in :meth:`get_retention_stats`.
+        """
+        keep = self._config.retention_keep_last if keep_last is None else keep_last
+        size = max(
+            1,
+            self._config.retention_batch_size if batch_size is None else batch_size,
+        )
+        pause = (
+            self._config.retention_batch_pause_seconds
+            if pause_seconds is None
+            else pause_seconds
+        )
+        params: dict[str, Any] = {
+            "interval": f"{max(days, 0)} days",
+            "keep_last": max(keep, 0),
+            "batch_size": size,
+        }
+
+        if dry_run:
+            async with pool_connection(self.pool) as conn:
+                cow = await self._supports_cow(conn)
+                cursor = await conn.execute(
+                    self._retention_query(cow=cow, count_only=True), params
+                )
+                row = await cursor.fetchone()
+            return int(self._get_value(row, "deleted_count", 0) or 0)
+
+        stats = self._retention_stats
+        stats.running = True
+        stats.runs += 1
+        stats.last_run_started_at = time.time()
+        stats.last_run_deleted = 0
+        stats.last_error = None
+        run_started = time.perf_counter()
+        total = 0
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                batch_started = time.perf_counter()
+                async with pool_connection(self.pool) as conn:
+                    cow = await self._supports_cow(conn)
+                    cursor = await conn.execute(
+                        self._retention_query(cow=cow, count_only=False), params
+                    )
+                    rows = await cursor.fetchall()
+                deleted = len(rows or [])
+                batches += 1
+                total += deleted
+                stats.batches += 1
+                stats.deleted += deleted
+                stats.last_run_deleted = total
+                stats.last_batch_ms = (time.perf_counter() - batch_started) * 1000.0
+                logger.debug(
+                    "Checkpoint retention batch %d deleted %d (total %d)",
+                    batches,
+                    deleted,
+                    total,
+                )
+                if deleted < size:
+                    break
+                if pause > 0:
+                    await asyncio.sleep(pause)
+        except Exception as exc:
+            stats.last_error = str(exc)
+            raise
+        finally:
+            stats.running = False
+            stats.last_run_seconds = time.perf_counter() - run_started
+
+        if total:
+            logger.info(
+                "Checkpoint retention deleted %d checkpoints in %d batches",
+                total,
+                batches,
+            )
+        return total
+
+    def get_retention_stats(self) -> dict[str, Any]:
+        """Return retention progress counters for observability."""
+        return asdict(self._retention_stats)
+
+    def start_retention_job(
+        self, interval_seconds: float | None = None
+    ) -> asyncio.Task:
+        """Run :meth:`cleanup_old_checkpoints` periodically in the background.
+
+        ``app.main`` starts this at startup when ``CHECKPOINTER_DB_URL`` is set
+        (disable with ``CHECKPOINTER_RETENTION_ENABLED=false``).
+        """
+        if self._retention_task is not None and not self._retention_task.done():
+            return self._retention_task
+        interval = (
+            self._config.retention_interval_seconds
+            if interval_seconds is None
+            else interval_seconds
+        )
+        self._retention_task = asyncio.create_task(self._retention_loop(interval))
+        return self._retention_task
+
+    async def stop_retention_job(self) -> None:
+        task = self._retention_task
+        self._retention_task = None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _retention_loop(self, interval: float) -> None:
+        while True:
             try:
-                rows = await conn.fetchall()  # type: ignore[attr-defined]
+                await self.cleanup_old_checkpoints(
+                    days=self._config.cleanup_after_days, dry_run=False
+                )
+            except asyncio.CancelledError:
+                raise
             except Exception:
-                # Fallback to cursor's fetchall if conn doesn't support it
-                rows = await cursor.fetchall()
-            deleted_count = len(rows or [])
-            return int(deleted_count)
+                logger.exception("Checkpoint retention run failed")
+            await asyncio.sleep(max(interval, 1.0))
@@ -5,7 +5,15 @@ Implements progressive disclosure: metadata first, full content on demand.
 Enhanced with context-aware auto-detection for all skill categories.
 """
 
+import os
 import re
+import time
+
+try:  # Python 3.11+
+    from re import _constants as _sre_constants, _parser as _sre_parser
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre_constants  # type: ignore[no-redef]
+    import sre_parse as _sre_parser  # type: ignore[no-redef]
 import yaml  # type: ignore[import-untyped]
 from pathlib import Path
 from dataclasses import dataclass
@@ -14,6 +22,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between file stat checks for a cached skill (hot reload).
+SKILL_RELOAD_CHECK_INTERVAL_SEC = float(
+    os.getenv("SKILLS_RELOAD_CHECK_INTERVAL_SEC", "2.0")
+)
+
+# (path, mtime_ns, size) for every file a cached entry was built from
+FileSignature = tuple[tuple[str, int, int], ...]
+
 # Skill auto-detection triggers: keyword patterns -> skill names
 # When message matches pattern, skill content is auto-injected
 SKILL_TRIGGERS: dict[str, list[str]] = {
@@ -106,6 +122,98 @@ SKILL_TRIGGERS: dict[str, list[str]] = {
 }
 
 
+def _file_signature(paths: list[Path]) -> FileSignature:
+    """Cheap change detector for a set of files (missing files are skipped)."""
+    signature: list[tuple[str, int, int]] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _skill_files(skill_dir: Path) -> list[Path]:
+    """SKILL.md plus reference/*.md - everything load_skill() reads."""
+    files = [skill_dir / "SKILL.md"]
+    ref_dir = skill_dir / "reference"
+    if ref_dir.is_dir():
+        files.extend(sorted(ref_dir.glob("*.md")))
+    return files
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Longest literal run every match of ``pattern`` must contain (lowercased).
+
+    Returns None when no such ASCII literal can be derived, e.g. for a
+    top-level alternation.
+    """
+    try:
+        parsed = _sre_parser.parse(pattern)
+    except Exception:
+        return None
+    best = ""
+    run = ""
+    for op, arg in parsed:
+        if op is _sre_constants.LITERAL:
+            run += chr(arg)
+            if len(run) > len(best):
+                best = run
+        else:
+            run = ""
+    best = best.lower()
+    return best if best and best.isascii() else None
+
+
+class _TriggerMatcher:
+    """All skill triggers indexed by the literal each pattern requires.
+
+    One pass over the distinct literals finds the candidate skills; only their
+    patterns are then run. CPython's ``re`` has no multi-pattern automaton and
+    a single alternation of every trigger defeats its literal-prefix scan, so
+    this literal index is the cheaper way to test all skills at once. Results
+    match running every pattern.
+    """
+
+    def __init__(self, triggers: dict[str, list[str]]):
+        self._names = list(triggers)
+        # per skill: (required literal or None, compiled pattern)
+        self._entries: list[list[tuple[Optional[str], Pattern[str]]]] = [
+            [
+                (_required_literal(pattern), re.compile(pattern, re.IGNORECASE))
+                for pattern in triggers[name]
+            ]
+            for name in self._names
+        ]
+        self._literals = sorted(
+            {literal for entries in self._entries for literal, _ in entries if literal}
+        )
+
+    def match(self, message: str) -> list[str]:
+        """Return every skill with a trigger in ``message``, in trigger order."""
+        present: Optional[set[str]] = None
+        # Case-insensitive regex matches of ASCII literals can only come from
+        # ASCII text, so lowercased substring tests are exact there.
+        if message.isascii():
+            lowered = message.lower()
+            present = {literal for literal in self._literals if literal in lowered}
+
+        detected: list[str] = []
+        for name, entries in zip(self._names, self._entries):
+            for literal, pattern in entries:
+                if (
+                    present is not None
+                    and literal is not None
+                    and literal not in present
+                ):
+                    continue
+                if pattern.search(message):
+                    detected.append(name)
+                    break  # One match per skill is enough
+        return detected
+
+
 @dataclass
 class SkillMetadata:
     """Metadata for a skill (progressive disclosure level 1)."""
@@ -143,22 +251,16 @@ class SkillsRegistry:
         self.skills_dir = project_root / ".sparrow" / "skills"
         self._metadata_cache: dict[str, SkillMetadata] = {}
         self._loaded_cache: dict[str, LoadedSkill] = {}
-        self._compiled_triggers: dict[str, list[Pattern[str]]] = (
-            self._compile_triggers()
-        )
+        # skill_dir -> (SKILL.md signature, parsed metadata or None if invalid)
+        self._metadata_files: dict[
+            Path, tuple[FileSignature, Optional[SkillMetadata]]
+        ] = {}
+        # skill name -> (last stat check, signature of the files it was loaded from)
+        self._loaded_files: dict[str, tuple[float, FileSignature]] = {}
+        self._trigger_matcher = _TriggerMatcher(SKILL_TRIGGERS)
 
         logger.debug(f"SkillsRegistry initialized with skills_dir: {self.skills_dir}")
 
-    @staticmethod
-    def _compile_triggers() -> dict[str, list[Pattern[str]]]:
-        """Compile regex triggers once for reuse."""
-        compiled: dict[str, list[Pattern[str]]] = {}
-        for skill_name, patterns in SKILL_TRIGGERS.items():
-            compiled[skill_name] = [
-                re.compile(pattern, re.IGNORECASE) for pattern in patterns
-            ]
-        return compiled
-
     def discover_skills(self) -> list[SkillMetadata]:
         """
         Discover all available skills (metadata only - progressive disclosure level 1).
@@ -174,7 +276,14 @@ class SkillsRegistry:
         for skill_dir in sorted(self.skills_dir.iterdir()):
             if skill_dir.is_dir() and (skill_dir / "SKILL.md").exists():
                 try:
-                    metadata = self._load_metadata(skill_dir)
+                    # Only re-parse frontmatter when SKILL.md changed on disk
+                    signature = _file_signature([skill_dir / "SKILL.md"])
+                    cached = self._metadata_files.get(skill_dir)
+                    if cached is not None and cached[0] == signature:
+                        metadata = cached[1]
+                    else:
+                        metadata = self._load_metadata(skill_dir)
+                        self._metadata_files[skill_dir] = (signature, metadata)
                     if metadata:
                         skills.append(metadata)
                         self._metadata_cache[metadata.name] = metadata
@@ -230,11 +339,15 @@ class SkillsRegistry:
         Args:
             name: Name of the skill to load.
 
+        Cached skills are reloaded when SKILL.md or a reference file changes
+        on disk (checked at most every SKILL_RELOAD_CHECK_INTERVAL_SEC).
+
         Returns:
             LoadedSkill with full content and references, or None if not found.
         """
-        if name in self._loaded_cache:
-            return self._loaded_cache[name]
+        cached = self._loaded_cache.get(name)
+        if cached is not None and self._is_loaded_fresh(name, cached):
+            return cached
 
         metadata = self._metadata_cache.get(name)
         if not metadata:
@@ -246,7 +359,16 @@ class SkillsRegistry:
                 return None
 
         skill_md = metadata.path / "SKILL.md"
-        content = skill_md.read_text(encoding="utf-8")
+        # Stat before reading so an edit made mid-read triggers another reload
+        signature = _file_signature(_skill_files(metadata.path))
+        try:
+            content = skill_md.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            logger.warning(f"Skill file removed: {skill_md}")
+            self._loaded_cache.pop(name, None)
+            self._loaded_files.pop(name, None)
+            self._metadata_cache.pop(name, None)
+            return None
 
         # Load reference files (progressive disclosure level 3)
         references: dict[str, str] = {}
@@ -263,9 +385,22 @@ class SkillsRegistry:
 
         skill = LoadedSkill(metadata=metadata, content=content, references=references)
         self._loaded_cache[name] = skill
+        self._loaded_files[name] = (time.monotonic(), signature)
         logger.info(f"Loaded skill: {name} with {len(references)} reference files")
         return skill
 
+    def _is_loaded_fresh(self, name: str, skill: LoadedSkill) -> bool:
+        """Return False when files behind a cached skill changed on disk."""
+        checked_at, signature = self._loaded_files.get(name, (0.0, ()))
+        now = time.monotonic()
+        if now - checked_at < SKILL_RELOAD_CHECK_INTERVAL_SEC:
+            return True
+        if _file_signature(_skill_files(skill.metadata.path)) != signature:
+            logger.info(f"Skill files changed on disk, reloading: {name}")
+            return False
+        self._loaded_files[name] = (now, signature)
+        return True
+
     def get_skills_prompt_section(self) -> str:
         """
         Generate skills metadata section for system prompt (~100 tokens per skill).
@@ -329,14 +464,8 @@ class SkillsRegistry:
         if not message:
             return []
 
-        detected = []
-
-        for skill_name, patterns in self._compiled_triggers.items():
-            for pattern in patterns:
-                if pattern.search(message):
-                    if skill_name not in detected:
-                        detected.append(skill_name)
-                    break  # One match per skill is enough
+        # Literal-indexed matcher: only skills whose trigger literals occur are searched
+        detected = self._trigger_matcher.match(message)
 
         # Limit to 3 skills to avoid prompt bloat
         if len(detected) > 3:
@@ -430,6 +559,8 @@ class SkillsRegistry:
         """Clear all cached skills (useful for development/testing)."""
         self._metadata_cache.clear()
         self._loaded_cache.clear()
+        self._metadata_files.clear()
+        self._loaded_files.clear()
         logger.info("Skills cache cleared")
 
 
@@ -97,7 +97,7 @@ from app.agents.helpers.gemma_helper import GemmaHelper
 from app.agents.streaming import StreamEventEmitter, StreamEventHandler
 from app.agents.streaming.handler import ThinkingBlockTracker
 from app.agents.unified.message_preparation import MessagePreparer
-from app.agents.unified.session_cache import get_session_data
+from app.agents.unified.session_cache import ThreadSafeCache, get_session_data
 
 from .model_router import ModelSelectionResult, model_router
 from .tools import get_registered_tools
@@ -1396,6 +1396,108 @@ def _build_memory_system_message(
     return SystemMessage(content="\n\n".join(sections), name=MEMORY_SYSTEM_NAME)
 
 
+_MEMORY_RESULT_CACHE: ThreadSafeCache[list[dict[str, Any]]] = ThreadSafeCache(
+    maxsize=256, ttl=settings.memory_retrieval_cache_ttl_sec
+)
+
+
+async def _fetch_mem0_memories(query: str) -> list[dict[str, Any]]:
+    """Query mem0 and normalize results to dicts."""
+    results: list[dict[str, Any]] = []
+    raw_mem0 = await memory_service.retrieve(
+        agent_id=MEMORY_AGENT_ID,
+        query=query,
+        top_k=settings.memory_top_k,
+    )
+    for item in raw_mem0 or []:
+        if isinstance(item, dict):
+            normalized = dict(item)
+            normalized.setdefault("source", "mem0")
+            results.append(normalized)
+        else:
+            results.append(
+                {
+                    "id": getattr(item, "id", None),
+                    "memory": getattr(item, "memory", None),
+                    "score": getattr(item, "score", None),
+                    "source": "mem0",
+                }
+            )
+    return results
+
+
+async def _fetch_memory_ui_memories(query: str) -> list[dict[str, Any]]:
+    """Query the Memory UI store and normalize results to dicts."""
+    from app.memory.memory_ui_service import get_memory_ui_service
+
+    service = get_memory_ui_service()
+    ui_results = await service.search_memories(
+        query=query,
+        agent_id=getattr(settings, "memory_ui_agent_id", MEMORY_AGENT_ID)
+        or MEMORY_AGENT_ID,
+        tenant_id=getattr(settings, "memory_ui_tenant_id", "mailbot") or "mailbot",
+        limit=settings.memory_top_k,
+        similarity_threshold=0.5,
+    )
+    results: list[dict[str, Any]] = []
+    for item in ui_results or []:
+        if not isinstance(item, dict):
+            continue
+        results.append(
+            {
+                "id": item.get("id"),
+                "memory": item.get("content"),
+                "score": item.get("similarity"),
+                "confidence_score": item.get("confidence_score"),
+                "is_edited": item.get("is_edited"),
+                "edited_boost": item.get("edited_boost"),
+                "hybrid_score": item.get("hybrid_score"),
+                "review_status": item.get("review_status"),
+                "metadata": item.get("metadata") or {},
+                "source": "memory_ui",
+            }
+        )
+    return results
+
+
+async def _lookup_memory_source(
+    source: str,
+    query: str,
+    fetch: Any,
+    *,
+    timeout: float,
+    enabled: bool,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Run one memory lookup with a deadline and a short-lived result cache.
+
+    Returns:
+        Tuple of (results, error). Failures and timeouts yield ``([], error)``
+        so the other source's results can still be used.
+    """
+    if not enabled:
+        return [], None
+
+    cache_key = f"{source}:{settings.memory_top_k}:{query}"
+    if _MEMORY_RESULT_CACHE.ttl > 0:
+        cached = _MEMORY_RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            return [dict(item) for item in cached], None
+
+    try:
+        if timeout and timeout > 0:
+            results = await asyncio.wait_for(fetch(query), timeout=timeout)
+        else:
+            results = await fetch(query)
+    except asyncio.TimeoutError:
+        return [], f"{source} retrieval timed out after {timeout:.1f}s"
+    except Exception as exc:
+        return [], str(exc)
+
+    if _MEMORY_RESULT_CACHE.ttl > 0:
+        _MEMORY_RESULT_CACHE.set(cache_key, [dict(item) for item in results])
+    return results, None
+
+
 async def _retrieve_memory_context(state: GraphState) -> Optional[str]:
     """Retrieve memory context for the conversation.
 
@@ -1425,69 +1527,39 @@ async def _retrieve_memory_context(state: GraphState) -> Optional[str]:
         "mem0_retrieval_enabled": mem0_enabled,
     }
 
-    mem0_results: list[dict[str, Any]] = []
-    memory_ui_results: list[dict[str, Any]] = []
-    memory_ui_retrieved_ids: list[str] = []
-
-    if mem0_enabled:
-        try:
-            raw_mem0 = await memory_service.retrieve(
-                agent_id=MEMORY_AGENT_ID,
-                query=query,
-                top_k=settings.memory_top_k,
-            )
-            for item in raw_mem0 or []:
-                if isinstance(item, dict):
-                    normalized = dict(item)
-                    normalized.setdefault("source", "mem0")
-                    mem0_results.append(normalized)
-                else:
-                    mem0_result = {
-                        "id": getattr(item, "id", None),
-                        "memory": getattr(item, "memory", None),
-                        "score": getattr(item, "score", None),
-                        "source": "mem0",
-                    }
-                    mem0_results.append(mem0_result)
-        except Exception as exc:
-            logger.warning("memory_retrieve_failed", error=str(exc))
-            memory_stats["retrieval_error"] = str(exc)
-
-    if memory_ui_enabled:
-        try:
-            from app.memory.memory_ui_service import get_memory_ui_service
-
-            service = get_memory_ui_service()
-            ui_results = await service.search_memories(
-                query=query,
-                agent_id=getattr(settings, "memory_ui_agent_id", MEMORY_AGENT_ID)
-                or MEMORY_AGENT_ID,
-                tenant_id=getattr(settings, "memory_ui_tenant_id", "mailbot")
-                or "mailbot",
-                limit=settings.memory_top_k,
-                similarity_threshold=0.5,
-            )
-            for item in ui_results or []:
-                if not isinstance(item, dict):
-                    continue
-                memory_id = item.get("id")
-                if isinstance(memory_id, str) and memory_id:
-                    memory_ui_retrieved_ids.append(memory_id)
-                memory_ui_result = {
-                    "id": memory_id,
-                    "memory": item.get("content"),
-                    "score": item.get("similarity"),
-                    "confidence_score": item.get("confidence_score"),
-                    "is_edited": item.get("is_edited"),
-                    "edited_boost": item.get("edited_boost"),
-                    "hybrid_score": item.get("hybrid_score"),
-                    "review_status": item.get("review_status"),
-                    "metadata": item.get("metadata") or {},
-                    "source": "memory_ui",
-                }
-                memory_ui_results.append(memory_ui_result)
-        except Exception as exc:
-            logger.warning("memory_ui_retrieve_failed", error=str(exc))
+    # Query both sources concurrently; each has its own deadline so a slow
+    # source only costs its timeout and the other's results are still used.
+    mem0_outcome, memory_ui_outcome = await asyncio.gather(
+        _lookup_memory_source(
+            "mem0",
+            query,
+            _fetch_mem0_memories,
+            timeout=settings.mem0_retrieval_timeout_sec,
+            enabled=mem0_enabled,
+        ),
+        _lookup_memory_source(
+            "memory_ui",
+            query,
+            _fetch_memory_ui_memories,
+            timeout=settings.memory_ui_retrieval_timeout_sec,
+            enabled=memory_ui_enabled,
+        ),
+    )
+    mem0_results, mem0_error = mem0_outcome
+    memory_ui_results, memory_ui_error = memory_ui_outcome
+
+    if mem0_error:
+        logger.warning("memory_retrieve_failed", error=mem0_error)
+        memory_stats["retrieval_error"] = mem0_error
+    if memory_ui_error:
+        logger.warning("memory_ui_retrieve_failed", error=memory_ui_error)
+        memory_stats["memory_ui_retrieval_error"] = memory_ui_error
+
+    memory_ui_retrieved_ids: list[str] = [
+        item["id"]
+        for item in memory_ui_results
+        if isinstance(item.get("id"), str) and item["id"]
+    ]
 
     retrieved = mem0_results + memory_ui_results
 
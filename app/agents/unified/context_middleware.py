@@ -43,36 +43,7 @@ from app.agents.unified.model_context import (
     DEFAULT_CONTEXT_WINDOW,
     get_model_context_window,
 )
-
-
-def estimate_tokens(messages: List[BaseMessage]) -> int:
-    """Estimate token count for messages using ~4 chars/token heuristic.
-
-    Args:
-        messages: List of messages to count.
-
-    Returns:
-        Estimated token count.
-    """
-    total_chars = 0
-    for msg in messages:
-        content = getattr(msg, "content", "")
-        if isinstance(content, str):
-            total_chars += len(content)
-        elif isinstance(content, list):
-            for part in content:
-                if isinstance(part, dict):
-                    if part.get("type") == "text":
-                        total_chars += len(part.get("text", ""))
-                    elif part.get("type") == "image_url":
-                        # Images are ~765 tokens for standard resolution
-                        total_chars += 3060  # ~765 * 4 chars/token
-                else:
-                    total_chars += len(str(part))
-        else:
-            total_chars += len(str(content))
-
-    return total_chars // 4
+from app.agents.unified.token_accounting import TokenLedger, estimate_tokens
 
 
 @dataclass
@@ -149,6 +120,8 @@ class FractionBasedSummarizationMiddleware(SummarizationMiddleware):
 
         # Initialize parent with calculated threshold
         if AGENT_MIDDLEWARE_AVAILABLE:
+            # Share cached per-message counts instead of rescanning history
+            kwargs.setdefault("token_counter", estimate_tokens)
             super().__init__(
                 model=model,
                 trigger=("tokens", max_tokens),
@@ -236,6 +209,7 @@ class ContextEditingMiddleware(AgentMiddleware):
         self.placeholder = placeholder
         self._stats = ContextStats()
         self._stats_lock = asyncio.Lock()
+        self._ledger = TokenLedger()
 
     @property
     def name(self) -> str:
@@ -302,7 +276,7 @@ class ContextEditingMiddleware(AgentMiddleware):
         if not messages:
             return None
 
-        estimated_tokens = estimate_tokens(messages)
+        estimated_tokens = self._ledger.sync(messages)
         if estimated_tokens < self.trigger_tokens:
             return None
 
@@ -314,7 +288,7 @@ class ContextEditingMiddleware(AgentMiddleware):
         if cleared_now <= 0:
             return None
 
-        self._stats.tokens_after_compaction = estimate_tokens(edited_messages)
+        self._stats.tokens_after_compaction = self._ledger.sync(edited_messages)
 
         logger.info(
             "context_editing_triggered",
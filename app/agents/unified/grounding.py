@@ -20,6 +20,12 @@ from app.core.logging_config import get_logger
 from app.core.config import get_models_config
 from app.core.settings import settings
 from app.core.rate_limiting.agent_wrapper import get_rate_limiter
+from app.tools.research_cache import (
+    SEARCH_TTL_SECONDS,
+    make_key,
+    normalize_query,
+    research_cache,
+)
 from app.tools.research_tools import FirecrawlTool, TavilySearchTool
 
 from .quota_manager import QuotaExceededError
@@ -81,6 +87,22 @@ class GeminiGroundingService:
             }
 
         limit = self._resolve_limit(max_results)
+        # Identical queries share one grounding call (and one quota slot).
+        return await research_cache.aget_or_compute(
+            make_key(
+                "grounding.search",
+                normalize_query(normalized_query),
+                model=self.model,
+                limit=limit,
+            ),
+            lambda: self._search_with_grounding(normalized_query, limit),
+            ttl=SEARCH_TTL_SECONDS,
+            cacheable=lambda payload: bool(payload.get("results")),
+        )
+
+    async def _search_with_grounding(
+        self, normalized_query: str, limit: int
+    ) -> Dict[str, Any]:
         if self.rate_limiter:
             result = await self.rate_limiter.check_and_consume("internal.grounding")
             if not getattr(result, "allowed", False):
@@ -120,6 +142,25 @@ class GeminiGroundingService:
         """
 
         limit = self._resolve_limit(max_results)
+        payload = await research_cache.aget_or_compute(
+            make_key("grounding.fallback", normalize_query(query), limit=limit),
+            lambda: self._fallback_search(query, limit, reason),
+            ttl=SEARCH_TTL_SECONDS,
+            cacheable=lambda payload: bool(
+                payload.get("results") or payload.get("extracted")
+            ),
+        )
+        if payload.get("reason") != reason:
+            payload["reason"] = reason
+            payload["langsmith_metadata"] = {
+                **(payload.get("langsmith_metadata") or {}),
+                "fallback_reason": reason,
+            }
+        return payload
+
+    async def _fallback_search(
+        self, query: str, limit: int, reason: str
+    ) -> Dict[str, Any]:
         tavily = self._get_tavily()
 
         # Track services used for LangSmith
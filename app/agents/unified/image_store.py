@@ -2,20 +2,27 @@
 
 Phase V: remove base64 images end-to-end by storing image bytes in a retrievable
 location and returning stable URLs for UI embedding.
+
+Objects are content-addressed (SHA-256 of the source bytes) within their
+path prefix (e.g. ``zendesk/<ticket_id>``), so an image already stored under
+that prefix is never re-encoded or re-uploaded: a bounded in-process cache
+short-circuits repeats, and a storage existence check covers images stored by
+other workers. Images are never shared across prefixes.
 """
 
 from __future__ import annotations
 
 import asyncio
 import base64
+import hashlib
 import os
 import re
-from dataclasses import dataclass
-from datetime import datetime, timezone
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from io import BytesIO
 from typing import Any
 from typing import Optional
-from uuid import uuid4
 
 from loguru import logger
 
@@ -38,6 +45,10 @@ DEFAULT_SIGNED_URL_TTL_SEC = int(
     os.getenv("AGENT_IMAGE_SIGNED_URL_TTL_SEC", "604800")
 )  # 7d
 DEFAULT_MAX_REWRITES = int(os.getenv("AGENT_IMAGE_MAX_REWRITES", "50"))
+CONTENT_PATH_PREFIX = (
+    os.getenv("AGENT_IMAGE_CONTENT_PREFIX", "sha256").strip().strip("/") or "sha256"
+)
+STORED_IMAGE_CACHE_SIZE = int(os.getenv("AGENT_IMAGE_CACHE_SIZE", "512"))
 
 _BUCKET_READY: set[str] = set()
 _BUCKET_READY_LOCK = asyncio.Lock()
@@ -53,6 +64,15 @@ class StoredImage:
     height: Optional[int] = None
 
 
+_CacheKey = tuple[str, bool, int, str, str]
+
+# (bucket, public, max_dim_px, path_prefix, digest) -> (image, URL expiry or None)
+_STORED_IMAGES: "OrderedDict[_CacheKey, tuple[StoredImage, Optional[float]]]" = (
+    OrderedDict()
+)
+_IN_FLIGHT: dict[_CacheKey, "asyncio.Future[StoredImage]"] = {}
+
+
 def _guess_extension(mime_type: str) -> str:
     normalized = (mime_type or "").split(";")[0].strip().lower()
     return {
@@ -196,67 +216,383 @@ def _decode_base64_payload(payload: str) -> bytes:
     return base64.b64decode(cleaned, validate=False)
 
 
+def _content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _normalize_path_prefix(path_prefix: str) -> str:
+    return (path_prefix or "").strip().strip("/") or "generated"
+
+
+def _content_object_path(
+    digest: str, *, path_prefix: str, max_dim_px: int, ext: str
+) -> str:
+    # The caller's prefix keeps tickets/sessions isolated; max_dim_px is part
+    # of the key because it changes the stored bytes.
+    return (
+        f"{path_prefix}/{CONTENT_PATH_PREFIX}/{digest[:2]}/"
+        f"{digest}_{max_dim_px}.{ext}"
+    )
+
+
+def _cache_key(
+    digest: str, *, bucket: str, public: bool, max_dim_px: int, path_prefix: str
+) -> _CacheKey:
+    return (bucket, public, max_dim_px, path_prefix, digest)
+
+
+def _cache_get(key: _CacheKey, *, signed_url_ttl_sec: int) -> Optional[StoredImage]:
+    """Return a cached image; signed URLs past half their TTL come back blank."""
+    entry = _STORED_IMAGES.get(key)
+    if entry is None:
+        return None
+    _STORED_IMAGES.move_to_end(key)
+    image, url_expires_at = entry
+    if url_expires_at is not None:
+        if url_expires_at - time.time() < signed_url_ttl_sec / 2:
+            return replace(image, url="")
+    return image
+
+
+def _cache_put(
+    key: _CacheKey,
+    image: StoredImage,
+    *,
+    signed_url_ttl_sec: int,
+) -> None:
+    public = key[1]
+    expires_at = None if public else time.time() + int(signed_url_ttl_sec)
+    _STORED_IMAGES[key] = (image, expires_at)
+    _STORED_IMAGES.move_to_end(key)
+    while len(_STORED_IMAGES) > max(1, STORED_IMAGE_CACHE_SIZE):
+        _STORED_IMAGES.popitem(last=False)
+
+
+def clear_stored_image_cache() -> None:
+    """Forget locally cached image hashes/URLs (objects stay in storage)."""
+    _STORED_IMAGES.clear()
+
+
+async def _object_exists(supabase: SupabaseClient, bucket: str, path: str) -> bool:
+    try:
+        return bool(
+            await supabase._exec(
+                lambda: supabase.client.storage.from_(bucket).exists(path)
+            )
+        )
+    except Exception:
+        return False
+
+
+async def _put_image_object(
+    data: bytes,
+    *,
+    digest: str,
+    mime_type: str,
+    bucket: str,
+    public: bool,
+    max_dim_px: int,
+    path_prefix: str,
+) -> StoredImage:
+    """Ensure the content-addressed object exists; return it without a URL."""
+    supabase = get_supabase_client()
+    await _ensure_bucket_ready(supabase, bucket=bucket, public=public)
+
+    # Downscaling keeps jpeg/webp and writes everything else as png, so the
+    # extension (and object path) is known before touching the pixels.
+    ext = _guess_extension(mime_type)
+    object_path = _content_object_path(
+        digest, path_prefix=path_prefix, max_dim_px=max_dim_px, ext=ext
+    )
+
+    if await _object_exists(supabase, bucket, object_path):
+        logger.debug("image_store_dedup_hit", bucket=bucket, path=object_path)
+        return StoredImage(
+            url="",
+            bucket=bucket,
+            path=object_path,
+            mime_type=(mime_type or "").split(";")[0].strip().lower() or mime_type,
+        )
+
+    processed, effective_mime_type, width, height = _maybe_downscale_image(
+        data, mime_type=mime_type, max_dim_px=max_dim_px
+    )
+
+    await supabase._exec(
+        lambda: supabase.client.storage.from_(bucket).upload(
+            object_path,
+            processed,
+            {
+                "content-type": effective_mime_type,
+                "x-upsert": "true",
+            },
+        )
+    )
+
+    return StoredImage(
+        url="",
+        bucket=bucket,
+        path=object_path,
+        mime_type=effective_mime_type,
+        width=width,
+        height=height,
+    )
+
+
+async def _resolve_urls(
+    images: list[StoredImage],
+    *,
+    bucket: str,
+    public: bool,
+    signed_url_ttl_sec: int,
+) -> list[StoredImage]:
+    """Attach retrievable URLs, signing all private paths in one request."""
+    pending = [image for image in images if not image.url]
+    if not pending:
+        return images
+
+    supabase = get_supabase_client()
+    urls: dict[str, Optional[str]] = {}
+    paths = list(dict.fromkeys(image.path for image in pending))
+
+    if public:
+        public_urls = await supabase._exec(
+            lambda: [
+                supabase.client.storage.from_(bucket).get_public_url(path)
+                for path in paths
+            ]
+        )
+        for path, public_url in zip(paths, public_urls):
+            urls[path] = _extract_public_url(public_url)
+    elif len(paths) == 1:
+        signed = await supabase._exec(
+            lambda: supabase.client.storage.from_(bucket).create_signed_url(
+                paths[0], int(signed_url_ttl_sec)
+            )
+        )
+        urls[paths[0]] = _extract_signed_url(signed)
+    else:
+        signed_batch = await supabase._exec(
+            lambda: supabase.client.storage.from_(bucket).create_signed_urls(
+                paths, int(signed_url_ttl_sec)
+            )
+        )
+        for item in signed_batch or []:
+            if isinstance(item, dict) and not item.get("error"):
+                urls[str(item.get("path"))] = _extract_signed_url(item)
+
+    resolved: list[StoredImage] = []
+    for image in images:
+        if not image.url:
+            url = urls.get(image.path)
+            if not url:
+                raise RuntimeError("Failed to resolve a retrievable image URL")
+            image = replace(image, url=url)
+        resolved.append(image)
+    return resolved
+
+
+async def _store_image_object(
+    data: bytes,
+    *,
+    digest: str,
+    mime_type: str,
+    bucket: str,
+    public: bool,
+    signed_url_ttl_sec: int,
+    max_dim_px: int,
+    path_prefix: str,
+) -> StoredImage:
+    """Store (or find) an image; the result has no URL unless one is cached."""
+    key = _cache_key(
+        digest,
+        bucket=bucket,
+        public=public,
+        max_dim_px=max_dim_px,
+        path_prefix=path_prefix,
+    )
+
+    cached = _cache_get(key, signed_url_ttl_sec=signed_url_ttl_sec)
+    if cached is not None:
+        return cached
+
+    in_flight = _IN_FLIGHT.get(key)
+    if in_flight is not None:
+        return await asyncio.shield(in_flight)
+
+    future: "asyncio.Future[StoredImage]" = asyncio.get_running_loop().create_future()
+    _IN_FLIGHT[key] = future
+    try:
+        stored = await _put_image_object(
+            data,
+            digest=digest,
+            mime_type=mime_type,
+            bucket=bucket,
+            public=public,
+            max_dim_px=max_dim_px,
+            path_prefix=path_prefix,
+        )
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Mark retrieved so failures without waiters are not logged as unhandled.
+        future.exception()
+        raise
+    else:
+        future.set_result(stored)
+        return stored
+    finally:
+        _IN_FLIGHT.pop(key, None)
+
+
 _DATA_URI_IMAGE_RE = re.compile(
     r"data:(image/[a-zA-Z0-9.+-]+);base64,([A-Za-z0-9+/=\s]+)",
     flags=re.IGNORECASE,
 )
 
 
-async def rewrite_base64_images_in_text(
-    text: str,
+def _collect_data_uris(value: Any, found: list[tuple[str, str]]) -> None:
+    if isinstance(value, str):
+        if "data:image" in value.lower():
+            found.extend(
+                (match.group(1), match.group(2))
+                for match in _DATA_URI_IMAGE_RE.finditer(value)
+            )
+    elif isinstance(value, list):
+        for item in value:
+            _collect_data_uris(item, found)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect_data_uris(item, found)
+
+
+async def _store_data_uris(
+    occurrences: list[tuple[str, str]],
     *,
     path_prefix: str,
-    max_images: int = DEFAULT_MAX_REWRITES,
-) -> tuple[str, int]:
-    """Replace data: image URIs with stored URLs (best-effort).
+    max_images: int,
+) -> tuple[list[str], int]:
+    """Store data URI images and return one replacement per occurrence.
 
-    Returns:
-        Tuple of (rewritten_text, replaced_count)
+    Identical payloads are decoded and stored once, and any private URLs
+    are signed in a single batch. Occurrences past ``max_images`` successful
+    replacements map to "" so no base64 leaks through.
     """
-    if not text or "data:image" not in text.lower():
-        return text, 0
-
-    if max_images <= 0:
-        return _DATA_URI_IMAGE_RE.sub("", text), 0
-
-    rewritten: list[str] = []
-    last_end = 0
+    path_prefix = _normalize_path_prefix(path_prefix)
+    replacements: list[str] = []
+    stored_by_payload: dict[tuple[str, str], Optional[int]] = {}
+    stored: list[tuple[str, StoredImage]] = []
+    slots: list[Optional[int]] = []
     replaced = 0
 
-    for match in _DATA_URI_IMAGE_RE.finditer(text):
+    for mime_type, payload in occurrences:
         if replaced >= max_images:
-            break
+            slots.append(None)
+            continue
 
-        mime_type = match.group(1)
-        payload = match.group(2)
+        key = (mime_type.lower(), payload)
+        if key not in stored_by_payload:
+            try:
+                data = _decode_base64_payload(payload)
+                if not data:
+                    raise ValueError("Empty base64 image payload")
+                digest = _content_digest(data)
+                image = await _store_image_object(
+                    data,
+                    digest=digest,
+                    mime_type=mime_type,
+                    bucket=DEFAULT_IMAGE_BUCKET,
+                    public=DEFAULT_BUCKET_PUBLIC,
+                    signed_url_ttl_sec=DEFAULT_SIGNED_URL_TTL_SEC,
+                    max_dim_px=DEFAULT_MAX_DIM_PX,
+                    path_prefix=path_prefix,
+                )
+                stored_by_payload[key] = len(stored)
+                stored.append((digest, image))
+            except Exception as exc:  # pragma: no cover - best effort
+                logger.warning(
+                    "rewrite_base64_image_failed",
+                    path_prefix=path_prefix,
+                    error=str(exc),
+                )
+                stored_by_payload[key] = None
 
-        rewritten.append(text[last_end : match.start()])
+        slot = stored_by_payload[key]
+        slots.append(slot)
+        if slot is not None:
+            replaced += 1
+
+    urls: list[str] = []
+    if stored:
         try:
-            stored = await store_image_base64(
-                payload,
-                mime_type=mime_type,
-                path_prefix=path_prefix,
+            resolved = await _resolve_urls(
+                [image for _, image in stored],
+                bucket=DEFAULT_IMAGE_BUCKET,
+                public=DEFAULT_BUCKET_PUBLIC,
+                signed_url_ttl_sec=DEFAULT_SIGNED_URL_TTL_SEC,
             )
+            for (digest, _), image in zip(stored, resolved):
+                _cache_put(
+                    _cache_key(
+                        digest,
+                        bucket=DEFAULT_IMAGE_BUCKET,
+                        public=DEFAULT_BUCKET_PUBLIC,
+                        max_dim_px=DEFAULT_MAX_DIM_PX,
+                        path_prefix=path_prefix,
+                    ),
+                    image,
+                    signed_url_ttl_sec=DEFAULT_SIGNED_URL_TTL_SEC,
+                )
+            urls = [image.url for image in resolved]
         except Exception as exc:  # pragma: no cover - best effort
             logger.warning("rewrite_base64_image_failed", error=str(exc))
-            stored = None
+            slots = [None] * len(slots)
+            replaced = 0
 
-        rewritten.append(stored.url if stored else "")
-        last_end = match.end()
-        if stored:
-            replaced += 1
+    for slot in slots:
+        replacements.append(urls[slot] if slot is not None else "")
+    return replacements, replaced
 
-    if replaced == 0 and last_end == 0:
-        return text, 0
 
-    rewritten.append(text[last_end:])
+def _apply_replacements(value: Any, replacements: list[str], cursor: list[int]) -> Any:
+    def _substitute(_: re.Match[str]) -> str:
+        index = cursor[0]
+        cursor[0] += 1
+        return replacements[index] if index < len(replacements) else ""
 
-    # If we hit the cap, strip remaining data URIs to avoid base64 leakage.
-    remainder = "".join(rewritten)
-    if replaced >= max_images and "data:image" in remainder.lower():
-        remainder = _DATA_URI_IMAGE_RE.sub("", remainder)
+    if isinstance(value, str):
+        if "data:image" not in value.lower():
+            return value
+        return _DATA_URI_IMAGE_RE.sub(_substitute, value)
+    if isinstance(value, list):
+        return [_apply_replacements(item, replacements, cursor) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: _apply_replacements(item, replacements, cursor)
+            for key, item in value.items()
+        }
+    return value
 
-    return remainder, replaced
+
+async def rewrite_base64_images_in_text(
+    text: str,
+    *,
+    path_prefix: str,
+    max_images: int = DEFAULT_MAX_REWRITES,
+) -> tuple[str, int]:
+    """Replace data: image URIs with stored URLs (best-effort).
+
+    Returns:
+        Tuple of (rewritten_text, replaced_count)
+    """
+    if not text or "data:image" not in text.lower():
+        return text, 0
+
+    return await rewrite_base64_images(
+        text, path_prefix=path_prefix, max_images=max_images
+    )
 
 
 async def rewrite_base64_images(
@@ -265,37 +601,23 @@ async def rewrite_base64_images(
     path_prefix: str,
     max_images: int = DEFAULT_MAX_REWRITES,
 ) -> tuple[Any, int]:
-    """Recursively replace base64 data URIs with stored URLs."""
-    if isinstance(value, str):
-        return await rewrite_base64_images_in_text(
-            value,
-            path_prefix=path_prefix,
-            max_images=max_images,
-        )
+    """Recursively replace base64 data URIs with stored URLs.
 
-    if isinstance(value, list):
-        total = 0
-        rewritten_list: list[Any] = []
-        for item in value:
-            rewritten_item, used = await rewrite_base64_images(
-                item, path_prefix=path_prefix, max_images=max_images - total
-            )
-            total += used
-            rewritten_list.append(rewritten_item)
-        return rewritten_list, total
+    All images in ``value`` are stored first and their URLs resolved in one
+    batch, then the structure is rewritten in a single pass.
+    """
+    occurrences: list[tuple[str, str]] = []
+    _collect_data_uris(value, occurrences)
+    if not occurrences:
+        return value, 0
 
-    if isinstance(value, dict):
-        total = 0
-        rewritten_dict: dict[str, Any] = {}
-        for key, item in value.items():
-            rewritten_item, used = await rewrite_base64_images(
-                item, path_prefix=path_prefix, max_images=max_images - total
-            )
-            total += used
-            rewritten_dict[key] = rewritten_item
-        return rewritten_dict, total
+    if max_images <= 0:
+        return _apply_replacements(value, [], [0]), 0
 
-    return value, 0
+    replacements, replaced = await _store_data_uris(
+        occurrences, path_prefix=path_prefix, max_images=max_images
+    )
+    return _apply_replacements(value, replacements, [0]), replaced
 
 
 async def store_image_bytes(
@@ -312,52 +634,41 @@ async def store_image_bytes(
 
     If `public=True`, the URL is a stable public URL. If `public=False`, this
     returns a signed URL (expires based on `signed_url_ttl_sec`).
-    """
-    supabase = get_supabase_client()
-    await _ensure_bucket_ready(supabase, bucket=bucket, public=public)
 
-    processed, effective_mime_type, width, height = _maybe_downscale_image(
-        data, mime_type=mime_type, max_dim_px=max_dim_px
+    Objects are stored under `path_prefix` by content hash, so repeat images
+    within the same prefix skip the downscale and upload entirely.
+    """
+    path_prefix = _normalize_path_prefix(path_prefix)
+    digest = _content_digest(data)
+    image = await _store_image_object(
+        data,
+        digest=digest,
+        mime_type=mime_type,
+        bucket=bucket,
+        public=public,
+        signed_url_ttl_sec=signed_url_ttl_sec,
+        max_dim_px=max_dim_px,
+        path_prefix=path_prefix,
     )
-    ext = _guess_extension(effective_mime_type)
-    date_prefix = datetime.now(timezone.utc).strftime("%Y%m%d")
-    object_path = f"{path_prefix}/{date_prefix}/{uuid4().hex}.{ext}"
+    if image.url:
+        return image
 
-    await supabase._exec(
-        lambda: supabase.client.storage.from_(bucket).upload(
-            object_path,
-            processed,
-            {
-                "content-type": effective_mime_type,
-                "x-upsert": "true",
-            },
-        )
+    (resolved,) = await _resolve_urls(
+        [image], bucket=bucket, public=public, signed_url_ttl_sec=signed_url_ttl_sec
     )
-
-    if public:
-        public_url = await supabase._exec(
-            lambda: supabase.client.storage.from_(bucket).get_public_url(object_path)
-        )
-        url = _extract_public_url(public_url)
-    else:
-        signed = await supabase._exec(
-            lambda: supabase.client.storage.from_(bucket).create_signed_url(
-                object_path, int(signed_url_ttl_sec)
-            )
-        )
-        url = _extract_signed_url(signed)
-
-    if not url:
-        raise RuntimeError("Failed to resolve a retrievable image URL")
-
-    return StoredImage(
-        url=url,
-        bucket=bucket,
-        path=object_path,
-        mime_type=effective_mime_type,
-        width=width,
-        height=height,
+    _cache_put(
+        _cache_key(
+            digest,
+            bucket=bucket,
+            public=public,
+            max_dim_px=max_dim_px,
+            path_prefix=path_prefix,
+        ),
+        resolved,
+        signed_url_ttl_sec=signed_url_ttl_sec,
     )
+    logger.debug("image_stored", path_prefix=path_prefix, path=resolved.path)
+    return resolved
 
 
 async def store_image_base64(
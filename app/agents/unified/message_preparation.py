@@ -22,6 +22,7 @@ from .multimodal_processor import (
     ProcessedAttachments,
 )
 from app.agents.unified.model_context import get_model_context_window
+from app.agents.unified.token_accounting import estimate_tokens
 from app.agents.unified.provider_factory import build_chat_model
 from app.core.config import get_models_config, resolve_coordinator_config
 from app.core.config.model_registry import get_model_by_id
@@ -37,7 +38,6 @@ if TYPE_CHECKING:
 HELPER_TIMEOUT_SECONDS = 8.0
 LONG_HISTORY_THRESHOLD = 8  # Number of messages before summarization
 TOKEN_LIMIT_BEFORE_COMPACT = 9000  # Estimated tokens before compaction
-_BASE64_SAMPLE_RE = re.compile(r"^[A-Za-z0-9+/]+$")
 
 # Attachment summarization (chunked) to avoid oversized context payloads
 ATTACHMENT_SUMMARIZE_THRESHOLD_CHARS = 20_000
@@ -1056,54 +1056,8 @@ class MessagePreparer:
         return text[: max_chars - 3] + "..."
 
     def _estimate_tokens(self, messages: List[BaseMessage]) -> int:
-        """Rough token estimation (~4 chars per token, ~1000 tokens per image)."""
-        total_tokens = 0
-
-        for msg in messages:
-            content = getattr(msg, "content", "")
-
-            if isinstance(content, str):
-                total_tokens += self._estimate_text_tokens(content)
-            elif isinstance(content, list):
-                for part in content:
-                    if isinstance(part, dict):
-                        if part.get("type") == "text":
-                            total_tokens += self._estimate_text_tokens(
-                                str(part.get("text", ""))
-                            )
-                        elif part.get("type") == "image_url":
-                            # Conservative estimate: ~1000 tokens per image/PDF
-                            total_tokens += 1000
-                    else:
-                        total_tokens += self._estimate_text_tokens(str(part))
-            else:
-                total_tokens += (
-                    self._estimate_text_tokens(str(content)) if content else 0
-                )
-
-        return total_tokens
-
-    def _estimate_text_tokens(self, text: str) -> int:
-        """Estimate tokens for text content with base64-aware heuristics."""
-        if self._looks_like_base64(text):
-            return max(1, len(text))
-        return max(1, len(text) // 4)
-
-    @staticmethod
-    def _looks_like_base64(text: str) -> bool:
-        """Detect base64-like blobs to avoid undercounting tokens."""
-        if not text or len(text) < 2000:
-            return False
-
-        sample = text.strip().replace("\n", "").replace(" ", "")
-        if len(sample) < 2000:
-            return False
-
-        sample = sample[:2000].rstrip("=")
-        if not sample:
-            return False
-
-        return bool(_BASE64_SAMPLE_RE.match(sample))
+        """Token estimate via the shared per-message cache (base64-aware)."""
+        return estimate_tokens(messages)
 
     def _context_threshold(self, state: "GraphState") -> int:
         """Compute a dynamic compaction threshold based on model context window."""
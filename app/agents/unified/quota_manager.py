@@ -2,14 +2,49 @@
 
 from __future__ import annotations
 
+import asyncio
+import time
 from datetime import datetime
-from typing import Dict, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 
 import redis
+import redis.asyncio as aioredis
 
 from app.core.logging_config import get_logger
+from app.core.rate_limiting.token_bucket import TokenBucket
 from app.core.settings import settings
 
+MINUTE_TTL_SECONDS = 120
+DAILY_TTL_SECONDS = 86400 + 60
+REDIS_RETRY_BACKOFF_SECONDS = 30.0
+
+# All-or-nothing increment across several counters in one round trip.
+# KEYS: counter keys. ARGV: n triples of (increment, limit, ttl_seconds).
+# Returns 0 when every counter was incremented, else the 1-based index of the
+# first counter that would exceed its limit (nothing is incremented then).
+_TRACK_LUA = """
+for i, key in ipairs(KEYS) do
+    local increment = tonumber(ARGV[i * 3 - 2])
+    local limit = tonumber(ARGV[i * 3 - 1])
+    local current = tonumber(redis.call('GET', key) or '0')
+    if current + increment > limit then
+        return i
+    end
+end
+for i, key in ipairs(KEYS) do
+    local increment = tonumber(ARGV[i * 3 - 2])
+    local ttl = tonumber(ARGV[i * 3])
+    local value = redis.call('INCRBY', key, increment)
+    if value == increment then
+        redis.call('EXPIRE', key, ttl)
+    end
+end
+return 0
+"""
+
+# (key, increment, limit, ttl_seconds, service, window)
+_Counter = Tuple[str, int, int, int, str, str]
+
 
 class QuotaManagerError(RuntimeError):
     """Base error for quota manager operations."""
@@ -28,11 +63,16 @@ class QuotaManager:
 
     Note: This implementation requires Redis for cross-process safety. In-memory
     limiters are single-process only; ensure `settings.redis_url` is reachable.
+
+    Async callers should use ``acheck_and_track`` / ``acheck_and_track_many``,
+    which never block the event loop and fall back to per-process token
+    buckets while Redis is unavailable.
     """
 
     def __init__(
         self,
         redis_client: Optional[redis.Redis] = None,
+        async_redis_client: Optional[aioredis.Redis] = None,
         key_prefix: str = "ag_unified_quota",
         per_minute_limits: Optional[Dict[str, int]] = None,
         per_day_limits: Optional[Dict[str, int]] = None,
@@ -42,6 +82,10 @@ class QuotaManager:
             settings.redis_url, decode_responses=True
         )
         self.redis_client = self.redis  # Expose as redis_client for compatibility
+        self._async_redis = async_redis_client
+        self._async_redis_retry_at = 0.0
+        self._fallback_buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._fallback_lock = asyncio.Lock()
         self.key_prefix = key_prefix
         # Prefer config-driven limits; fall back to provided overrides or conservative defaults.
         self.minute_limits = per_minute_limits or {
@@ -66,35 +110,76 @@ class QuotaManager:
         if minute_limit <= 0 and daily_limit <= 0:
             return True
 
-        now = datetime.utcnow()
-        minute_key, daily_key = self._build_keys(service, now)
+        counters = self._build_counters({service: increment}, datetime.utcnow())
 
         try:
-            minute_count = (
-                self._increment(minute_key, increment, ttl_seconds=120)
-                if minute_limit > 0
-                else None
-            )
-            daily_count = (
-                self._increment(daily_key, increment, ttl_seconds=86400 + 60)
-                if daily_limit > 0
-                else None
-            )
+            exceeded = self._to_int(self.redis.eval(*self._track_args(counters)))
         except redis.RedisError as exc:  # pragma: no cover - network failure
             self.logger.warning("quota_manager_redis_error", error=str(exc))
             return True  # Fail-open to avoid blocking traffic when Redis is down
 
-        if minute_limit > 0 and (minute_count or 0) > minute_limit:
-            self._decrement(minute_key, increment)
-            self.logger.info(
-                "quota_exceeded_minute", service=service, limit=minute_limit
-            )
+        return self._report(counters, exceeded)
+
+    async def acheck_and_track(self, service: str, increment: int = 1) -> bool:
+        """Async ``check_and_track``: one atomic round trip, never blocks."""
+        return await self.acheck_and_track_many({service: increment})
+
+    async def acheck_and_track_many(self, increments: Mapping[str, int]) -> bool:
+        """Check and track several services at once, all-or-nothing.
+
+        Every configured window (minute/day) of every service is checked and
+        incremented in a single Redis script call. If any would exceed its
+        limit nothing is counted and False is returned. While Redis is
+        unreachable, per-process token buckets enforce the same limits.
+        """
+        for service, increment in increments.items():
+            if increment <= 0:
+                self.logger.warning(
+                    "quota_increment_non_positive",
+                    service=service,
+                    increment=increment,
+                )
+        counters = self._build_counters(
+            {s: n for s, n in increments.items() if n > 0}, datetime.utcnow()
+        )
+        if not counters:
+            return True
+
+        client = self._get_async_redis()
+        if client is not None:
+            try:
+                exceeded = self._to_int(await client.eval(*self._track_args(counters)))
+                return self._report(counters, exceeded)
+            except (redis.RedisError, OSError) as exc:
+                self._async_redis_retry_at = (
+                    time.monotonic() + REDIS_RETRY_BACKOFF_SECONDS
+                )
+                self.logger.warning(
+                    "quota_manager_redis_fallback", error=str(exc), backend="local"
+                )
+
+        return await self._track_local(counters)
+
+    async def acheck_quota(self, service: str) -> bool:
+        """Async ``check_quota`` reading both windows in one round trip."""
+        minute_limit, daily_limit = self._get_limits(service)
+        if minute_limit <= 0 and daily_limit <= 0:
+            return True
+
+        client = self._get_async_redis()
+        if client is None:
+            return True  # Fail-open, as check_quota does
+
+        minute_key, daily_key = self._build_keys(service, datetime.utcnow())
+        try:
+            minute_count, daily_count = await client.mget(minute_key, daily_key)
+        except (redis.RedisError, OSError) as exc:
+            self.logger.warning("quota_check_redis_error", error=str(exc))
+            return True
+
+        if minute_limit > 0 and self._to_int(minute_count) >= minute_limit:
             return False
-        if daily_limit > 0 and (daily_count or 0) > daily_limit:
-            self._decrement(daily_key, increment)
-            if minute_limit > 0:
-                self._decrement(minute_key, increment)
-            self.logger.info("quota_exceeded_daily", service=service, limit=daily_limit)
+        if daily_limit > 0 and self._to_int(daily_count) >= daily_limit:
             return False
         return True
 
@@ -160,11 +245,79 @@ class QuotaManager:
             "daily_usage_pct": self.get_usage_percentage(service),
         }
 
-    def _increment(self, key: str, increment: int, ttl_seconds: int) -> int:
-        value = self._to_int(self.redis.incrby(key, increment))
-        if value == increment:
-            self.redis.expire(key, ttl_seconds)
-        return value
+    def _get_async_redis(self) -> Optional[aioredis.Redis]:
+        if time.monotonic() < self._async_redis_retry_at:
+            return None
+        if self._async_redis is None:
+            self._async_redis = aioredis.Redis.from_url(
+                settings.redis_url, decode_responses=True
+            )
+        return self._async_redis
+
+    def _build_counters(
+        self, increments: Mapping[str, int], now: datetime
+    ) -> List[_Counter]:
+        counters: List[_Counter] = []
+        for service, increment in increments.items():
+            minute_limit, daily_limit = self._get_limits(service)
+            minute_key, daily_key = self._build_keys(service, now)
+            if minute_limit > 0:
+                counters.append(
+                    (
+                        minute_key,
+                        increment,
+                        minute_limit,
+                        MINUTE_TTL_SECONDS,
+                        service,
+                        "minute",
+                    )
+                )
+            if daily_limit > 0:
+                counters.append(
+                    (
+                        daily_key,
+                        increment,
+                        daily_limit,
+                        DAILY_TTL_SECONDS,
+                        service,
+                        "daily",
+                    )
+                )
+        return counters
+
+    @staticmethod
+    def _track_args(counters: List[_Counter]) -> List[Any]:
+        args: List[Any] = [_TRACK_LUA, len(counters)]
+        args.extend(counter[0] for counter in counters)
+        for _, increment, limit, ttl, _, _ in counters:
+            args.extend((increment, limit, ttl))
+        return args
+
+    def _report(self, counters: List[_Counter], exceeded: int) -> bool:
+        if not exceeded:
+            return True
+        _, _, limit, _, service, window = counters[exceeded - 1]
+        self.logger.info(f"quota_exceeded_{window}", service=service, limit=limit)
+        return False
+
+    async def _track_local(self, counters: List[_Counter]) -> bool:
+        """Per-process token-bucket fallback with the same limits."""
+        async with self._fallback_lock:
+            buckets = []
+            for _, increment, limit, _, service, window in counters:
+                bucket = self._fallback_buckets.get((service, window))
+                if bucket is None or bucket.capacity != limit:
+                    window_seconds = 60 if window == "minute" else 86400
+                    bucket = TokenBucket(limit, limit / window_seconds)
+                    self._fallback_buckets[(service, window)] = bucket
+                buckets.append((bucket, increment))
+
+            for index, (bucket, increment) in enumerate(buckets):
+                if await bucket.get_current_tokens() < increment:
+                    return self._report(counters, index + 1)
+            for bucket, increment in buckets:
+                await bucket.consume(increment)
+        return True
 
     def _to_int(self, value: Any) -> int:
         if value is None:
@@ -179,12 +332,6 @@ class QuotaManager:
         except (TypeError, ValueError):
             return 0
 
-    def _decrement(self, key: str, decrement: int) -> None:
-        try:
-            self.redis.decrby(key, decrement)
-        except redis.RedisError:  # pragma: no cover - best effort
-            pass
-
     def _build_keys(self, service: str, now: datetime) -> tuple[str, str]:
         """Construct minute and daily keys for the service."""
         minute_key = f"{self.key_prefix}:{service}:minute:{now:%Y%m%d%H%M}"
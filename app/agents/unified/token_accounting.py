@@ -0,0 +1,310 @@
+"""Shared token accounting for context management.
+
+Every context check (message preparation, context editing, summarization
+triggers) used to rescan the whole message history. This
+module centralises the estimate and caches it per message so repeated checks
+within a turn only pay for messages that are new or changed:
+
+- ``count_message_tokens`` - cached per-message estimate keyed by content fingerprint
+- ``estimate_tokens`` - drop-in total for a list of messages
+- ``TokenLedger`` - incremental running total for a growing message list
+
+Counting defaults to the ~4 chars/token heuristic. Set
+``AGENT_TOKEN_COUNTER=tiktoken`` to count text with a local tokenizer instead
+(falls back to the heuristic if the encoding cannot be loaded).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Sequence
+
+from loguru import logger
+
+TOKEN_COUNTER_MODE = os.getenv("AGENT_TOKEN_COUNTER", "heuristic").strip().lower()
+TOKENIZER_ENCODING = os.getenv("AGENT_TOKENIZER_ENCODING", "o200k_base").strip()
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AGENT_TOKEN_CACHE_MAX_ENTRIES", "20000"))
+
+CHARS_PER_TOKEN = 4
+IMAGE_TOKEN_ESTIMATE = 1000  # Conservative estimate per image/PDF part
+MESSAGE_OVERHEAD_TOKENS = 3  # Role/formatting overhead per message
+
+_BASE64_SAMPLE_RE = re.compile(r"^[A-Za-z0-9+/]+$")
+_BASE64_MIN_CHARS = 2000
+_MEDIA_PART_TYPES = frozenset({"image_url", "image", "file", "media"})
+
+
+def looks_like_base64(text: str) -> bool:
+    """Detect base64-like blobs to avoid undercounting tokens."""
+    if not text or len(text) < _BASE64_MIN_CHARS:
+        return False
+
+    sample = text.strip().replace("\n", "").replace(" ", "")
+    if len(sample) < _BASE64_MIN_CHARS:
+        return False
+
+    sample = sample[:_BASE64_MIN_CHARS].rstrip("=")
+    if not sample:
+        return False
+
+    return bool(_BASE64_SAMPLE_RE.match(sample))
+
+
+# ---------------------------------------------------------------------------
+# Text counting
+# ---------------------------------------------------------------------------
+
+_encoder: Any = None
+_encoder_lock = threading.Lock()
+_encoder_failed = False
+
+
+def _get_encoder() -> Any:
+    """Load the tiktoken encoder once; return None when unavailable."""
+    global _encoder, _encoder_failed
+    if _encoder is not None or _encoder_failed:
+        return _encoder
+    with _encoder_lock:
+        if _encoder is not None or _encoder_failed:
+            return _encoder
+        try:
+            import tiktoken
+
+            _encoder = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as exc:  # pragma: no cover - depends on environment
+            _encoder_failed = True
+            logger.warning(
+                "token_counter_tokenizer_unavailable",
+                encoding=TOKENIZER_ENCODING,
+                error=str(exc),
+            )
+    return _encoder
+
+
+def count_text_tokens(text: str) -> int:
+    """Count tokens for a text fragment (base64-aware)."""
+    if not text:
+        return 0
+    if looks_like_base64(text):
+        # Inline base64 tokenizes roughly one token per character.
+        return len(text)
+    if TOKEN_COUNTER_MODE == "tiktoken":
+        encoder = _get_encoder()
+        if encoder is not None:
+            return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+# ---------------------------------------------------------------------------
+# Per-message counting with cache
+# ---------------------------------------------------------------------------
+
+
+def _part_key(part: Any) -> Hashable:
+    if isinstance(part, str):
+        return ("s", len(part), hash(part))
+    if isinstance(part, dict):
+        part_type = part.get("type")
+        if part_type == "text":
+            text = str(part.get("text", ""))
+            return ("t", len(text), hash(text))
+        if part_type in _MEDIA_PART_TYPES:
+            return ("m",)
+    rendered = str(part)
+    return ("o", len(rendered), hash(rendered))
+
+
+def _message_key(message: Any) -> Hashable:
+    """Fingerprint the parts of a message that contribute to its token count.
+
+    ``str`` caches its own hash, so fingerprinting an unchanged message is
+    cheap even when its content is large.
+    """
+    content = getattr(message, "content", "")
+    if isinstance(content, str):
+        content_key: Hashable = ("s", len(content), hash(content))
+    elif isinstance(content, list):
+        content_key = tuple(_part_key(part) for part in content)
+    else:
+        content_key = _part_key(content) if content else ()
+
+    tool_calls = getattr(message, "tool_calls", None) or ()
+    tool_key = tuple(
+        (
+            (call.get("name"), repr(call.get("args")))
+            if isinstance(call, dict)
+            else repr(call)
+        )
+        for call in tool_calls
+    )
+    return (getattr(message, "type", ""), content_key, tool_key)
+
+
+def _count_uncached(message: Any) -> int:
+    tokens = MESSAGE_OVERHEAD_TOKENS
+    content = getattr(message, "content", "")
+
+    if isinstance(content, str):
+        tokens += count_text_tokens(content)
+    elif isinstance(content, list):
+        for part in content:
+            if isinstance(part, dict):
+                part_type = part.get("type")
+                if part_type == "text":
+                    tokens += count_text_tokens(str(part.get("text", "")))
+                elif part_type in _MEDIA_PART_TYPES:
+                    tokens += IMAGE_TOKEN_ESTIMATE
+                else:
+                    tokens += count_text_tokens(str(part))
+            else:
+                tokens += count_text_tokens(str(part))
+    elif content:
+        tokens += count_text_tokens(str(content))
+
+    for call in getattr(message, "tool_calls", None) or ():
+        if isinstance(call, dict):
+            tokens += count_text_tokens(str(call.get("name", "")))
+            tokens += count_text_tokens(repr(call.get("args", "")))
+        else:
+            tokens += count_text_tokens(repr(call))
+
+    return tokens
+
+
+class _TokenCountCache:
+    """Bounded LRU of message fingerprint -> token count."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, message: Any) -> int:
+        key = _message_key(message)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        tokens = _count_uncached(message)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = tokens
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return tokens
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "mode": TOKEN_COUNTER_MODE,
+            }
+
+
+_cache = _TokenCountCache(TOKEN_CACHE_MAX_ENTRIES)
+
+
+def count_message_tokens(message: Any) -> int:
+    """Return the (cached) token estimate for a single message."""
+    return _cache.count(message)
+
+
+def estimate_tokens(messages: Iterable[Any]) -> int:
+    """Estimate total tokens for a list of messages.
+
+    Compatible with LangChain's ``token_counter`` callable signature so it
+    can be passed straight to ``SummarizationMiddleware``.
+    """
+    return sum(_cache.count(message) for message in messages)
+
+
+def get_token_cache_stats() -> Dict[str, Any]:
+    """Return cache statistics for observability."""
+    return _cache.stats()
+
+
+def clear_token_cache() -> None:
+    """Drop all cached per-message counts (mainly for tests)."""
+    _cache.clear()
+
+
+class TokenLedger:
+    """Running token total for a message list that mostly grows by appending.
+
+    ``sync`` compares content fingerprints of the new list against the
+    previous one and only counts messages after the first divergence, so
+    appending one message to a long thread costs O(1) counts. Fingerprints
+    (not the messages) are kept, so a message edited in place is recounted
+    and the ledger holds no reference to a previous thread's messages.
+    Summarization or context editing replaces the list; untouched messages
+    still hit the per-message cache.
+
+    Usage:
+        ledger = TokenLedger()
+        total = ledger.sync(state["messages"])
+    """
+
+    def __init__(self) -> None:
+        self._keys: List[Hashable] = []
+        self._prefix: List[int] = [0]
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        return self._prefix[-1]
+
+    def sync(self, messages: Sequence[Any]) -> int:
+        """Bring the ledger in line with ``messages`` and return the total."""
+        keys = [_message_key(message) for message in messages]
+        with self._lock:
+            previous = self._keys
+            limit = min(len(previous), len(keys))
+            common = 0
+            while common < limit and previous[common] == keys[common]:
+                common += 1
+
+            prefix = self._prefix[: common + 1]
+            running = prefix[-1]
+            for message in messages[common:]:
+                running += count_message_tokens(message)
+                prefix.append(running)
+
+            self._keys = keys
+            self._prefix = prefix
+            return running
+
+    def reset(self) -> None:
+        with self._lock:
+            self._keys = []
+            self._prefix = [0]
+
+
+__all__ = [
+    "IMAGE_TOKEN_ESTIMATE",
+    "TOKEN_COUNTER_MODE",
+    "TokenLedger",
+    "clear_token_cache",
+    "count_message_tokens",
+    "count_text_tokens",
+    "estimate_tokens",
+    "get_token_cache_stats",
+    "looks_like_base64",
+]
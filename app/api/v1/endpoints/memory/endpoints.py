@@ -20,13 +20,16 @@ import os
 import mimetypes
 import asyncio
 import json
+import gzip
 import re
+import tempfile
+import time
 from datetime import datetime, timezone
 from datetime import timedelta
 from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple
-from uuid import UUID, NAMESPACE_URL, uuid5
+from uuid import UUID, NAMESPACE_URL, uuid4, uuid5
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi import Query
 from fastapi.responses import RedirectResponse, Response
 
@@ -92,10 +95,76 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["Memory"])
-
 EXPORTS_BUCKET = "memory-exports"
 MEMORY_ASSET_SIGNED_TTL_SEC = int(os.getenv("MEMORY_ASSET_SIGNED_TTL_SEC", "900"))
+EXPORT_CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+GRAPH_RELATIONSHIPS_RPC = "list_memory_relationships_for_entities"
+# Bounds staleness for writes this process does not see (other workers, DB triggers).
+GRAPH_SNAPSHOT_TTL_SEC = float(os.getenv("MEMORY_GRAPH_SNAPSHOT_TTL_SEC", "60"))
+GRAPH_SNAPSHOT_MAX_ENTRIES = 32
+GRAPH_RELATIONSHIP_ID_CHUNK = 100
+GRAPH_RELATIONSHIP_PAGE_SIZE = 1000
+
+# ============================================================================
+# Graph Snapshot Cache
+# ============================================================================
+
+_graph_snapshot_version = 0
+# key -> (version, created_monotonic, response)
+_graph_snapshots: Dict[tuple[Any, ...], tuple[int, float, GraphDataResponse]] = {}
+
+
+def _invalidate_graph_snapshots() -> None:
+    """Bump the graph version so cached snapshots are rebuilt on next view."""
+    global _graph_snapshot_version
+    _graph_snapshot_version += 1
+    _graph_snapshots.clear()
+
+
+def _get_graph_snapshot(key: tuple[Any, ...]) -> Optional[GraphDataResponse]:
+    entry = _graph_snapshots.get(key)
+    if entry is None:
+        return None
+    version, created_at, response = entry
+    if (
+        version != _graph_snapshot_version
+        or time.monotonic() - created_at > GRAPH_SNAPSHOT_TTL_SEC
+    ):
+        _graph_snapshots.pop(key, None)
+        return None
+    return response
+
+
+def _store_graph_snapshot(
+    key: tuple[Any, ...], version: int, response: GraphDataResponse
+) -> None:
+    # A write that landed while this snapshot was being built already bumped
+    # the version; caching it would pin pre-write data.
+    if version != _graph_snapshot_version or GRAPH_SNAPSHOT_TTL_SEC <= 0:
+        return
+    if len(_graph_snapshots) >= GRAPH_SNAPSHOT_MAX_ENTRIES:
+        _graph_snapshots.pop(next(iter(_graph_snapshots)))
+    _graph_snapshots[key] = (version, time.monotonic(), response)
+
+
+async def _invalidate_graph_on_write(request: Request):
+    """Router dependency: drop graph snapshots after any mutating request.
+
+    Memory, entity and relationship writes all go through this router, and
+    memory writes can create or detach entities, so every non-read request
+    invalidates (including failed ones, which is merely conservative).
+    """
+    try:
+        yield
+    finally:
+        if request.method not in {"GET", "HEAD", "OPTIONS"}:
+            _invalidate_graph_snapshots()
+
+
+router = APIRouter(tags=["Memory"], dependencies=[Depends(_invalidate_graph_on_write)])
 
 # ============================================================================
 # Auth Dependencies
@@ -537,6 +606,78 @@ async def list_relationships(
         )
 
 
+async def _fetch_relationships_for_entities(
+    supabase: SupabaseClient,
+    entity_ids: list[str],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Fetch relationships whose endpoints are both in ``entity_ids``.
+
+    Uses the scoped RPC (migration 043) so filtering and ranking happen in
+    the database. Without the RPC, falls back to source-entity chunks so the
+    id lists stay within URL limits.
+    """
+    try:
+        rpc_response = await supabase._exec(
+            lambda: supabase.rpc(
+                GRAPH_RELATIONSHIPS_RPC,
+                {"p_entity_ids": entity_ids, "p_limit": limit},
+            ).execute()
+        )
+        return [row for row in rpc_response.data or [] if isinstance(row, dict)]
+    except Exception as rpc_exc:
+        message = str(rpc_exc).lower()
+        rpc_missing = GRAPH_RELATIONSHIPS_RPC in message and (
+            "not found" in message
+            or "does not exist" in message
+            or "could not find the function" in message
+            or "schema cache" in message
+        )
+        if not rpc_missing:
+            raise
+        logger.warning(
+            "graph_relationships_rpc_unavailable_fallback error=%s",
+            str(rpc_exc)[:200],
+        )
+
+    entity_id_set = set(entity_ids)
+
+    async def _fetch_chunk(chunk: list[str]) -> list[dict[str, Any]]:
+        # No per-chunk limit: edges to entities outside the set are filtered
+        # below, so a limit here could drop relevant edges.
+        matched: list[dict[str, Any]] = []
+        offset = 0
+        while True:
+            resp = await supabase._exec(
+                lambda: supabase.client.table("memory_relationships")
+                .select("*")
+                .in_("source_entity_id", chunk)
+                .order("id")
+                .range(offset, offset + GRAPH_RELATIONSHIP_PAGE_SIZE - 1)
+                .execute()
+            )
+            page = list(resp.data or [])
+            matched.extend(
+                row
+                for row in page
+                if str(row.get("target_entity_id")) in entity_id_set
+            )
+            if len(page) < GRAPH_RELATIONSHIP_PAGE_SIZE:
+                return matched
+            offset += GRAPH_RELATIONSHIP_PAGE_SIZE
+
+    chunks = [
+        entity_ids[i : i + GRAPH_RELATIONSHIP_ID_CHUNK]
+        for i in range(0, len(entity_ids), GRAPH_RELATIONSHIP_ID_CHUNK)
+    ]
+    results = await asyncio.gather(*(_fetch_chunk(chunk) for chunk in chunks))
+    relationships = [row for rows in results for row in rows]
+    relationships.sort(
+        key=lambda row: int(row.get("occurrence_count") or 0), reverse=True
+    )
+    return relationships[:limit]
+
+
 @router.get(
     "/graph",
     response_model=GraphDataResponse,
@@ -553,6 +694,16 @@ async def get_graph_data(
     limit_relationships: int = Query(default=2000, ge=1, le=10000),
     entity_types: list[str] | None = Query(default=None),
 ) -> GraphDataResponse:
+    snapshot_key = (
+        int(limit_entities),
+        int(limit_relationships),
+        tuple(sorted(entity_types or [])),
+    )
+    cached = _get_graph_snapshot(snapshot_key)
+    if cached is not None:
+        return cached
+    snapshot_version = _graph_snapshot_version
+
     supabase = service._get_supabase()
 
     try:
@@ -572,20 +723,9 @@ async def get_graph_data(
         if not entity_ids:
             return GraphDataResponse(nodes=[], links=[])
 
-        relationships_resp = await supabase._exec(
-            lambda: supabase.client.table("memory_relationships")
-            .select("*")
-            .order("occurrence_count", desc=True)
-            .limit(int(limit_relationships))
-            .execute()
+        relationships = await _fetch_relationships_for_entities(
+            supabase, sorted(entity_ids), int(limit_relationships)
         )
-        relationships_raw = list(relationships_resp.data or [])
-        relationships = [
-            row
-            for row in relationships_raw
-            if str(row.get("source_entity_id")) in entity_ids
-            and str(row.get("target_entity_id")) in entity_ids
-        ]
 
         memory_ids = {
             str(source_memory_id)
@@ -673,7 +813,9 @@ async def get_graph_data(
                 }
             )
 
-        return GraphDataResponse(nodes=nodes_payload, links=links_payload)
+        response = GraphDataResponse(nodes=nodes_payload, links=links_payload)
+        _store_graph_snapshot(snapshot_key, snapshot_version, response)
+        return response
     except Exception as exc:
         logger.exception("Error building graph data: %s", exc)
         raise HTTPException(
@@ -4193,11 +4335,21 @@ async def submit_feedback(
         )
 
 
+def _export_object_path(
+    export_id: UUID, *, export_format: str, compressed: bool
+) -> str:
+    suffix = ".gz" if compressed else ""
+    return f"{export_id}.{export_format}{suffix}"
+
+
 @router.post(
     "/export",
     response_model=ExportMemoriesResponse,
     summary="Export memories (Admin only)",
-    description="Export memories to a downloadable JSON file. Requires admin privileges.",
+    description=(
+        "Export memories to a downloadable JSON or NDJSON file (optionally gzip). "
+        "Requires admin privileges."
+    ),
     responses={
         200: {"description": "Export initiated successfully"},
         400: {"description": "Invalid export parameters"},
@@ -4212,57 +4364,89 @@ async def export_memories(
     service: MemoryUIService = Depends(get_memory_ui_service),
 ) -> ExportMemoriesResponse:
     """
-    Export memories to a JSON file.
+    Export memories to a JSON or NDJSON file (optionally gzip-compressed).
 
     Admin only endpoint for bulk memory export with optional filtering.
+    Memories are read in keyset-paginated pages with filters applied in the
+    query and written incrementally to a temporary file, which is then
+    streamed to storage, so memory use stays flat regardless of tenant size.
     Returns a download URL for the generated file.
     """
+    export_path: Optional[str] = None
     try:
-        import uuid as uuid_module
-        from datetime import datetime, timezone
+        filters = request.filters
+        export_format = request.format
+        export_id = uuid4()
+        exported_at = datetime.now(timezone.utc).isoformat()
 
-        # Build filter parameters from request
-        source_type = None
-        min_confidence = None
-        created_after = None
+        fd, export_path = tempfile.mkstemp(prefix="memory-export-", suffix=".tmp")
+        os.close(fd)
 
-        if request.filters:
-            min_confidence = request.filters.min_confidence
-            created_after = request.filters.created_after
+        memory_count = 0
+        raw_file = await asyncio.to_thread(open, export_path, "wb")
+        try:
+            sink: Any = (
+                gzip.GzipFile(fileobj=raw_file, mode="wb")
+                if request.compress
+                else raw_file
+            )
 
-        # Fetch memories with filters
-        memories = await service.list_memories(
-            source_type=source_type,
-            limit=10000,  # Max export limit
-            offset=0,
-        )
+            def _write_page(page: List[Dict[str, Any]], leading_comma: bool) -> None:
+                # Serialisation, compression and disk I/O all run off the
+                # event loop so large exports do not stall other requests.
+                lines = [
+                    json.dumps(memory, ensure_ascii=False, default=str)
+                    for memory in page
+                ]
+                if export_format == "json":
+                    chunk = ", ".join(lines)
+                    if leading_comma:
+                        chunk = ", " + chunk
+                else:
+                    chunk = "".join(line + "\n" for line in lines)
+                sink.write(chunk.encode("utf-8"))
+
+            if export_format == "json":
+                header = json.dumps(
+                    {
+                        "export_id": str(export_id),
+                        "exported_at": exported_at,
+                        "exported_by": admin_user.sub,
+                    },
+                    ensure_ascii=False,
+                )
+                await asyncio.to_thread(
+                    sink.write, header[:-1].encode("utf-8") + b', "memories": ['
+                )
 
-        # Apply additional filters
-        if min_confidence is not None:
-            memories = [
-                m for m in memories if m.get("confidence_score", 0) >= min_confidence
-            ]
-        if created_after is not None:
-            memories = [
-                m
-                for m in memories
-                if m.get("created_at")
-                and datetime.fromisoformat(m["created_at"].replace("Z", "+00:00"))
-                >= created_after
-            ]
+            async for page in service.iter_memories_for_export(
+                min_confidence=filters.min_confidence if filters else None,
+                created_after=filters.created_after if filters else None,
+            ):
+                if not page:
+                    continue
+                await asyncio.to_thread(_write_page, page, memory_count > 0)
+                memory_count += len(page)
 
-        # Generate export data
-        export_id_str = str(uuid_module.uuid4())
-        export_data = {
-            "export_id": export_id_str,
-            "exported_at": datetime.now(timezone.utc).isoformat(),
-            "exported_by": admin_user.sub,
-            "total_memories": len(memories),
-            "memories": memories,
-        }
+            if export_format == "json":
+                await asyncio.to_thread(
+                    sink.write,
+                    f'], "total_memories": {memory_count}}}'.encode("utf-8"),
+                )
+            if sink is not raw_file:
+                await asyncio.to_thread(sink.close)
+        finally:
+            await asyncio.to_thread(raw_file.close)
 
-        export_id = UUID(export_id_str)
+        object_path = _export_object_path(
+            export_id, export_format=export_format, compressed=request.compress
+        )
         download_url = f"/api/v1/memory/exports/{export_id}/download"
+        if export_format != "json" or request.compress:
+            download_url += (
+                f"?format={export_format}&compressed="
+                f"{'true' if request.compress else 'false'}"
+            )
 
         # Upload to Supabase Storage (admin-only bucket)
         supabase = service._get_supabase()
@@ -4279,19 +4463,23 @@ async def export_memories(
                 )
             )
 
-        object_path = f"{export_id}.json"
-        payload_bytes = json.dumps(export_data, ensure_ascii=False).encode("utf-8")
-
-        await supabase._exec(
-            lambda: supabase.client.storage.from_(EXPORTS_BUCKET).upload(
-                object_path,
-                payload_bytes,
-                {
-                    "content-type": "application/json",
-                },
-            )
+        content_type = (
+            "application/gzip"
+            if request.compress
+            else EXPORT_CONTENT_TYPES[export_format]
         )
 
+        def _upload_export() -> Any:
+            # Stream the spooled file; never hold the whole export in memory.
+            with open(export_path, "rb") as handle:
+                return supabase.client.storage.from_(EXPORTS_BUCKET).upload(
+                    object_path,
+                    handle,
+                    {"content-type": content_type},
+                )
+
+        await supabase._exec(_upload_export)
+
         # Use stats RPC for counts (filters are applied only to memory list for now)
         stats = await service.get_stats()
         if isinstance(stats, list) and stats:
@@ -4300,7 +4488,7 @@ async def export_memories(
         return ExportMemoriesResponse(
             export_id=export_id,
             download_url=download_url,
-            memory_count=len(memories),
+            memory_count=memory_count,
             entity_count=(
                 stats.get("total_entities", 0) if isinstance(stats, dict) else 0
             ),
@@ -4317,6 +4505,12 @@ async def export_memories(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to export memories",
         )
+    finally:
+        if export_path:
+            try:
+                os.unlink(export_path)
+            except OSError:
+                pass
 
 
 @router.post(
@@ -4691,9 +4885,13 @@ async def download_export(
     export_id: UUID,
     admin_user: Annotated[TokenPayload, Depends(require_admin)],
     service: MemoryUIService = Depends(get_memory_ui_service),
+    format: Literal["json", "ndjson"] = Query(default="json"),
+    compressed: bool = Query(default=False),
 ) -> RedirectResponse:
     supabase = service._get_supabase()
-    object_path = f"{export_id}.json"
+    object_path = _export_object_path(
+        export_id, export_format=format, compressed=compressed
+    )
 
     try:
         signed = await supabase._exec(
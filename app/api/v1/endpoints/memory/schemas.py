@@ -530,9 +530,11 @@ class ExportMemoriesRequest(BaseModel):
     Creates an async export job that generates a downloadable file.
     """
 
-    format: Literal["json"] = Field(
-        default="json", description="Export format. Currently only JSON is supported."
+    format: Literal["json", "ndjson"] = Field(
+        default="json",
+        description="Export format: a single JSON document or one memory per line (NDJSON).",
     )
+    compress: bool = Field(default=False, description="Gzip-compress the export file.")
     filters: Optional[ExportFilters] = Field(
         default=None, description="Optional filters to apply to the export."
     )
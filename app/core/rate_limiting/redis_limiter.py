@@ -13,6 +13,36 @@ import redis.asyncio as redis
 from app.core.logging_config import get_logger
 from .schemas import RateLimitResult, RateLimitMetadata
 
+WINDOW_SECONDS = {"rpm": 60, "rpd": 86400}
+
+# Atomic sliding-window check. The script touches only the counter key, so it
+# stays within one hash slot on Redis Cluster; the identifier is added to the
+# index set (for usage stats) by a separate command in the same pipeline.
+_CHECK_WINDOW_LUA = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local cutoff = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local window_seconds = tonumber(ARGV[4])
+local token_id = ARGV[5]
+
+-- Remove expired entries
+redis.call('ZREMRANGEBYSCORE', key, 0, cutoff)
+
+-- Count current requests
+local current_count = redis.call('ZCARD', key)
+
+if current_count < limit then
+    -- Add current request
+    redis.call('ZADD', key, now, token_id)
+    -- Set expiration
+    redis.call('EXPIRE', key, window_seconds + 60)
+    return {1, current_count + 1}  -- allowed=true, used=count+1
+else
+    return {0, current_count}  -- allowed=false, used=count
+end
+"""
+
 
 class RedisRateLimiter:
     """
@@ -32,7 +62,9 @@ class RedisRateLimiter:
         """
         self.redis = redis_client
         self.key_prefix = key_prefix
+        self.index_key = f"{key_prefix}:__index__"
         self.logger = get_logger("redis_rate_limiter")
+        self._index_backfilled = False
 
     async def check_rate_limit(
         self,
@@ -156,47 +188,23 @@ class RedisRateLimiter:
         """
         key = f"{self.key_prefix}:{identifier}:{window_type}"
 
-        # Lua script for atomic rate limit check and increment
-        lua_script = """
-        local key = KEYS[1]
-        local now = tonumber(ARGV[1])
-        local cutoff = tonumber(ARGV[2])
-        local limit = tonumber(ARGV[3])
-        local window_seconds = tonumber(ARGV[4])
-        local token_id = ARGV[5]
-        
-        -- Remove expired entries
-        redis.call('ZREMRANGEBYSCORE', key, 0, cutoff)
-        
-        -- Count current requests
-        local current_count = redis.call('ZCARD', key)
-        
-        if current_count < limit then
-            -- Add current request
-            redis.call('ZADD', key, now, token_id)
-            -- Set expiration
-            redis.call('EXPIRE', key, window_seconds + 60)
-            return {1, current_count + 1}  -- allowed=true, used=count+1
-        else
-            return {0, current_count}  -- allowed=false, used=count
-        end
-        """
-
         try:
             cutoff = now - window_seconds
-            result = await cast(
-                Awaitable[list[Any]],
-                self.redis.eval(
-                    lua_script,
-                    1,
-                    key,
-                    str(now),
-                    str(cutoff),
-                    str(limit),
-                    str(window_seconds),
-                    token_identifier,
-                ),
+            # One round trip; the index key lives in another slot, so it is
+            # written outside the script rather than inside it.
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.eval(
+                _CHECK_WINDOW_LUA,
+                1,
+                key,
+                str(now),
+                str(cutoff),
+                str(limit),
+                str(window_seconds),
+                token_identifier,
             )
+            pipe.sadd(self.index_key, identifier)
+            result = (await cast(Awaitable[list[Any]], pipe.execute()))[0]
 
             allowed = bool(result[0])
             used = int(result[1])
@@ -258,6 +266,7 @@ class RedisRateLimiter:
                     break
 
             # Delete collected keys if any found
+            await self.redis.srem(self.index_key, identifier)
             if keys_to_delete:
                 await self.redis.delete(*keys_to_delete)
                 self.logger.info(
@@ -288,49 +297,97 @@ class RedisRateLimiter:
         """
         Get usage statistics for all identifiers.
 
+        Identifiers come from the index set and every counter is pruned and
+        read in one pipeline, so the cost is two round trips (a third when
+        expired identifiers are pruned from the index) regardless of how many
+        models are tracked. Each command names its own key, which keeps this
+        valid on Redis Cluster.
+
         Returns:
             Dictionary with usage stats for each identifier
         """
-        pattern = f"{self.key_prefix}:*"
         stats: Dict[str, Dict[str, int]] = {}
+        now = time.time()
 
         try:
-            # Use SCAN to safely iterate over keys in production
-            cursor = 0
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.exists(self.index_key)
+            pipe.smembers(self.index_key)
+            index_exists, members = await pipe.execute()
+
+            identifiers = sorted(
+                member.decode() if isinstance(member, bytes) else member
+                for member in members or ()
+            )
+            if identifiers:
+                pipe = self.redis.pipeline(transaction=False)
+                for identifier in identifiers:
+                    for window_type, window_seconds in WINDOW_SECONDS.items():
+                        key = f"{self.key_prefix}:{identifier}:{window_type}"
+                        pipe.zremrangebyscore(key, 0, now - window_seconds)
+                        pipe.zcard(key)
+                results = await pipe.execute()
+
+                # Two commands per window, windows in WINDOW_SECONDS order.
+                per_identifier = 2 * len(WINDOW_SECONDS)
+                expired: list[str] = []
+                for i, identifier in enumerate(identifiers):
+                    counts = results[i * per_identifier : (i + 1) * per_identifier]
+                    usage = {
+                        window_type: int(counts[2 * j + 1])
+                        for j, window_type in enumerate(WINDOW_SECONDS)
+                    }
+                    stats[identifier] = usage
+                    if not any(usage.values()):
+                        # Empty sorted sets are deleted, so the counters expired.
+                        expired.append(identifier)
+                if expired:
+                    await self.redis.srem(self.index_key, *expired)
+
+            if not index_exists and not self._index_backfilled:
+                # Counters written before the index existed; adopt them once.
+                self._index_backfilled = True
+                stats = await self._backfill_index()
 
-            while True:
-                cursor, keys = await self.redis.scan(
-                    cursor=cursor, match=pattern, count=100
-                )
+        except Exception as e:
+            self.logger.error(f"Failed to get usage stats: {e}")
 
-                for key_bytes in keys:
-                    key = (
-                        key_bytes.decode()
-                        if isinstance(key_bytes, bytes)
-                        else key_bytes
-                    )
-                    parts = key.split(":")
-                    if len(parts) >= 3:
-                        identifier = parts[1]
-                        window_type = parts[2]
-                        if window_type not in {"rpm", "rpd"}:
-                            continue
-
-                        try:
-                            count = await self.redis.zcard(key)
-                        except Exception:
-                            continue
-
-                        if identifier not in stats:
-                            stats[identifier] = {}
-                        stats[identifier][window_type] = count
+        return stats
 
-                if cursor == 0:
-                    break
+    async def _backfill_index(self) -> Dict[str, Dict[str, int]]:
+        """Scan once for pre-index counters, add them to the index and count."""
+        pattern = f"{self.key_prefix}:*"
+        prefix = f"{self.key_prefix}:"
+        keys: list[str] = []
+        cursor = 0
 
-        except Exception as e:
-            self.logger.error(f"Failed to get usage stats: {e}")
+        while True:
+            cursor, batch = await self.redis.scan(
+                cursor=cursor, match=pattern, count=100
+            )
+            for key_bytes in batch:
+                key = key_bytes.decode() if isinstance(key_bytes, bytes) else key_bytes
+                identifier, _, window_type = key[len(prefix) :].rpartition(":")
+                if identifier and window_type in WINDOW_SECONDS:
+                    keys.append(key)
+            if cursor == 0:
+                break
+
+        if not keys:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.zcard(key)
+        counts = await pipe.execute()
+
+        stats: Dict[str, Dict[str, int]] = {}
+        for key, count in zip(keys, counts):
+            identifier, _, window_type = key[len(prefix) :].rpartition(":")
+            stats.setdefault(identifier, {})[window_type] = int(count)
 
+        await self.redis.sadd(self.index_key, *stats.keys())
+        self.logger.info(f"Indexed {len(stats)} rate limit identifiers for usage stats")
         return stats
 
     async def health_check(self) -> bool:
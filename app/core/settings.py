@@ -246,6 +246,9 @@ class Settings(BaseSettings):
     checkpointer_max_overflow: int = Field(
         default=10, alias="CHECKPOINTER_MAX_OVERFLOW"
     )
+    checkpointer_retention_enabled: bool = Field(
+        default=True, alias="CHECKPOINTER_RETENTION_ENABLED"
+    )
     graph_viz_export_enabled: bool = Field(
         default=False, alias="ENABLE_GRAPH_VIZ_EXPORT"
     )
@@ -452,11 +455,35 @@ class Settings(BaseSettings):
     )
     memory_ui_agent_id: str = Field(default="sparrow", alias="MEMORY_UI_AGENT_ID")
     memory_ui_tenant_id: str = Field(default="mailbot", alias="MEMORY_UI_TENANT_ID")
+    # Per-source deadlines and short-lived result cache for turn-time retrieval
+    mem0_retrieval_timeout_sec: float = Field(
+        default=3.0, alias="MEM0_RETRIEVAL_TIMEOUT_SEC"
+    )
+    memory_ui_retrieval_timeout_sec: float = Field(
+        default=3.0, alias="MEMORY_UI_RETRIEVAL_TIMEOUT_SEC"
+    )
+    memory_retrieval_cache_ttl_sec: float = Field(
+        default=30.0, alias="MEMORY_RETRIEVAL_CACHE_TTL_SEC"
+    )
+    # Per-leg deadlines and short-lived fused-result cache for hybrid KB search
+    kb_vector_search_timeout_sec: float = Field(
+        default=5.0, alias="KB_VECTOR_SEARCH_TIMEOUT_SEC"
+    )
+    kb_text_search_timeout_sec: float = Field(
+        default=3.0, alias="KB_TEXT_SEARCH_TIMEOUT_SEC"
+    )
+    kb_search_cache_ttl_sec: float = Field(
+        default=60.0, alias="KB_SEARCH_CACHE_TTL_SEC"
+    )
 
     # FeedMe AI Configuration
     feedme_ai_pdf_enabled: bool = Field(default=True, alias="FEEDME_AI_PDF_ENABLED")
     feedme_ai_max_pages: int = Field(default=10, alias="FEEDME_AI_MAX_PAGES")
     feedme_ai_pages_per_call: int = Field(default=3, alias="FEEDME_AI_PAGES_PER_CALL")
+    feedme_ai_max_concurrent_calls: int = Field(
+        default=2, alias="FEEDME_AI_MAX_CONCURRENT_CALLS"
+    )
+    feedme_ai_render_prefetch: int = Field(default=2, alias="FEEDME_AI_RENDER_PREFETCH")
 
     # Application-level usage budgets
     primary_agent_daily_budget: int = Field(
@@ -5,10 +5,11 @@ import time
 import base64
 import hashlib
 import logging
+import queue
 import threading
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Set, Tuple, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Set, Tuple, Optional, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
@@ -154,8 +155,16 @@ EMBED_MIN_INTERVAL_SEC = _env_float(
     "GEMINI_MIN_INTERVAL_SEC", 4.0
 )  # Gemini often limited to ~15 RPM on default quota
 PAGE_CAP = 320  # ample for >200 articles + indexes
-
-PREWIPE = _env_bool("PREWIPE", True)
+EMBED_BATCH_SIZE = _env_int("KB_EMBED_BATCH_SIZE", 16)
+UPSERT_BATCH_SIZE = _env_int("KB_UPSERT_BATCH_SIZE", 25)
+BATCH_MAX_WAIT_SEC = _env_float("KB_BATCH_MAX_WAIT_SEC", 2.0)
+STAGE_QUEUE_SIZE = _env_int("KB_STAGE_QUEUE_SIZE", 64)
+
+# Incremental by default: unchanged articles (same Zendesk updated_at, or same
+# content hash after scraping) are skipped; PREWIPE=true forces a full rebuild.
+PREWIPE = _env_bool("PREWIPE", False)
+FORCE_REINGEST = _env_bool("FORCE_REINGEST", False)
+PRUNE_MISSING = _env_bool("KB_PRUNE_MISSING", True)
 INGEST_LIMIT = _env_int("INGEST_LIMIT", 0)  # 0 = no limit
 INGEST_OFFSET = _env_int("INGEST_OFFSET", 0)
 
@@ -517,6 +526,135 @@ def discover_article_urls_via_bfs(
     return uniq
 
 
+def content_hash(plain_text: str) -> str:
+    """Hash of the embedded text; includes the model so a model change re-embeds."""
+    from app.db.embedding_config import MODEL_NAME
+
+    return hashlib.sha256(f"{MODEL_NAME}\n{plain_text}".encode("utf-8")).hexdigest()
+
+
+def load_existing_index(supabase: Client) -> Dict[str, Dict[str, Any]]:
+    """Map normalized URL -> stored content hash / Zendesk updated_at."""
+    index: Dict[str, Dict[str, Any]] = {}
+    page_size = 1000
+    start = 0
+    while True:
+        resp = (
+            supabase.table("mailbird_knowledge")
+            .select(
+                "url,content_hash:metadata->>content_hash,"
+                "updated_at:metadata->article->zendesk->>updated_at"
+            )
+            .like("url", "https://support.getmailbird.com/hc/en-us/%")
+            .order("url")
+            .range(start, start + page_size - 1)
+            .execute()
+        )
+        rows = resp.data or []
+        for row in rows:
+            if row.get("url"):
+                index[normalize_url(row["url"])] = row
+        if len(rows) < page_size:
+            break
+        start += page_size
+    return index
+
+
+def touch_zendesk_updated_at(supabase: Client, url: str, updated_at: str) -> None:
+    """Record a new Zendesk ``updated_at`` on an article whose content is unchanged.
+
+    Metadata-only (no re-embed), so the next run's ``updated_at`` pre-check
+    skips the article instead of scraping it again.
+    """
+    table = supabase.table("mailbird_knowledge")
+    resp = table.select("metadata").eq("url", url).limit(1).execute()
+    rows = resp.data or []
+    if not rows:
+        return
+    metadata = dict(rows[0].get("metadata") or {})
+    article = dict(metadata.get("article") or {})
+    zendesk = dict(article.get("zendesk") or {})
+    zendesk["updated_at"] = updated_at
+    article["zendesk"] = zendesk
+    metadata["article"] = article
+    table.update({"metadata": metadata}).eq("url", url).execute()
+
+
+def prune_missing_rows(
+    supabase: Client, existing: Dict[str, Dict[str, Any]], keep: Set[str]
+) -> int:
+    """Delete stored articles that are no longer published."""
+    stale = [row["url"] for key, row in existing.items() if key not in keep]
+    for i in range(0, len(stale), 100):
+        supabase.table("mailbird_knowledge").delete().in_(
+            "url", stale[i : i + 100]
+        ).execute()
+    return len(stale)
+
+
+_STAGE_DONE = object()
+
+
+_STAGE_POLL_SEC = 0.5
+
+
+def iter_batches(
+    source: "queue.Queue[Any]",
+    batch_size: int,
+    max_wait: float,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[List[Any]]:
+    """Yield batches from a stage queue until the upstream stage is done.
+
+    A batch is emitted when full, or when ``max_wait`` passes without filling
+    it, so a slow upstream stage never stalls downstream work indefinitely.
+    Once ``stop`` is set, whatever is already queued is drained and iteration
+    ends even if the upstream stage never signals completion.
+    """
+    batch: List[Any] = []
+    deadline: Optional[float] = None
+    while True:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if stop is not None:
+            timeout = (
+                _STAGE_POLL_SEC if timeout is None else min(timeout, _STAGE_POLL_SEC)
+            )
+        try:
+            item = source.get(timeout=timeout)
+        except queue.Empty:
+            if stop is not None and stop.is_set():
+                if batch:
+                    yield batch
+                return
+            if deadline is not None and time.monotonic() < deadline:
+                continue
+            if batch:
+                yield batch
+            batch, deadline = [], None
+            continue
+        if item is _STAGE_DONE:
+            if batch:
+                yield batch
+            return
+        batch.append(item)
+        if deadline is None:
+            deadline = time.monotonic() + max_wait
+        if len(batch) >= batch_size:
+            yield batch
+            batch, deadline = [], None
+
+
+def stage_put(target: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Put onto a bounded stage queue; gives up (False) once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=_STAGE_POLL_SEC)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
 def make_rate_limiter(min_interval_sec: float) -> Callable[[], None]:
     if min_interval_sec <= 0:
 
@@ -547,7 +685,7 @@ def ingest():
     fc = Firecrawl(api_key=firecrawl_key)
     emb_model = get_embedding_model()
 
-    # Pre-wipe scoped rows (optional)
+    # Pre-wipe scoped rows (optional full rebuild)
     if PREWIPE:
         try:
             or_filters = "url.like.https://support.getmailbird.com/hc/en-us/%,metadata->>source.eq.mailbird_support"
@@ -621,86 +759,215 @@ def ingest():
         f"BFS_added={bfs_added}, Combined={len(zendesk_map)})"
     )
 
+    existing: Dict[str, Dict[str, Any]] = {}
+    if not PREWIPE:
+        try:
+            existing = load_existing_index(supabase)
+            logger.info(f"Loaded {len(existing)} existing rows for change detection")
+        except Exception as e:
+            logger.warning(f"Could not load existing rows; re-ingesting all: {e}")
+
     results: List[Tuple[str, bool, Optional[str]]] = []
+    unchanged: List[str] = []
+    results_lock = threading.Lock()
+
+    def record(u: str, ok: bool, err: Optional[str] = None) -> None:
+        with results_lock:
+            results.append((u, ok, err))
+        if ok:
+            logger.info(f"ingested: {u}")
+        else:
+            logger.error(f"failed: {u} err={err}")
 
     rate_limit_tokens = ("rate limit", "429", "quota", "resource_exhausted")
     max_attempts = 4
 
-    def worker(u: str) -> Tuple[str, bool, Optional[str]]:
-        last_error: Optional[str] = None
+    def with_rate_limit_retry(label: str, fn: Callable[[], Any]) -> Any:
         for attempt in range(1, max_attempts + 1):
             try:
-                firecrawl_wait()
-                data = fc.scrape(
-                    url=u,
-                    formats=["markdown", "html", "screenshot"],
-                    only_main_content=True,
+                return fn()
+            except Exception as e:
+                lower_msg = str(e).lower()
+                if attempt == max_attempts or not any(
+                    token in lower_msg for token in rate_limit_tokens
+                ):
+                    raise
+                wait_seconds = min(120, 15 * attempt)
+                logger.warning(
+                    f"Rate limit on {label} (attempt {attempt}/{max_attempts}); sleeping {wait_seconds}s"
                 )
-                try:
-                    doc_dict = data.model_dump()  # type: ignore[attr-defined]
-                except Exception:
-                    doc_dict = data if isinstance(data, dict) else {}
+                time.sleep(wait_seconds)
+
+    # Stage graph: scrape+parse (CONCURRENCY workers) -> embed (batched)
+    # -> store (multi-row upserts). Bounded queues give backpressure; if a
+    # stage dies, `stop` releases every producer and consumer blocked on it.
+    embed_q: "queue.Queue[Any]" = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    store_q: "queue.Queue[Any]" = queue.Queue(maxsize=STAGE_QUEUE_SIZE)
+    stop = threading.Event()
+    stage_errors: List[BaseException] = []
+
+    def scrape(u: str) -> Any:
+        firecrawl_wait()
+        return fc.scrape(
+            url=u,
+            formats=["markdown", "html", "screenshot"],
+            only_main_content=True,
+        )
+
+    def embed(texts: List[str]) -> List[List[float]]:
+        embed_wait()
+        return emb_model.embed_documents(texts)
 
-                screenshot_url = extract_screenshot_url(doc_dict or {}, supabase, u)
+    def scrape_stage(u: str) -> None:
+        if stop.is_set():
+            return
+        key = normalize_url(u)
+        zendesk_meta = zendesk_map.get(key, {})
+        stored = existing.get(key) or {}
+        if (
+            not FORCE_REINGEST
+            and stored.get("content_hash")
+            and zendesk_meta.get("updated_at")
+            and stored.get("updated_at") == zendesk_meta.get("updated_at")
+        ):
+            unchanged.append(u)
+            return
 
-                zendesk_meta = zendesk_map.get(normalize_url(u), {})
+        try:
+            data = with_rate_limit_retry(u, lambda: scrape(u))
+            try:
+                doc_dict = data.model_dump()  # type: ignore[attr-defined]
+            except Exception:
+                doc_dict = data if isinstance(data, dict) else {}
+
+            article_json, plain_text = to_canonical_json(
+                u, doc_dict or {}, None, zendesk_meta
+            )
+            digest = content_hash(plain_text)
+            if not FORCE_REINGEST and stored.get("content_hash") == digest:
+                updated_at = zendesk_meta.get("updated_at")
+                if updated_at and stored.get("updated_at") != updated_at:
+                    try:
+                        touch_zendesk_updated_at(
+                            supabase, stored.get("url") or u, updated_at
+                        )
+                    except Exception as e:
+                        logger.warning(f"updated_at refresh failed for {u}: {e}")
+                unchanged.append(u)
+                return
+
+            screenshot_url = extract_screenshot_url(doc_dict or {}, supabase, u)
+            if screenshot_url:
+                article_json["screenshot_urls"] = [screenshot_url]
+        except Exception as e:
+            record(u, False, str(e))
+            return
 
-                article_json, plain_text = to_canonical_json(
-                    u,
-                    doc_dict or {},
-                    screenshot_url,
-                    zendesk_meta,
-                )
+        if not stage_put(embed_q, (u, article_json, plain_text, digest), stop):
+            record(u, False, "ingest pipeline stopped")
 
-                # Truncate for embedding and compute 3072‑dim vector
-                text_for_embedding = plain_text[:15000]
-                embed_wait()
-                embedding = emb_model.embed_query(text_for_embedding)
+    def embed_stage() -> None:
+        try:
+            from app.db.embedding_config import assert_dim
+
+            for batch in iter_batches(
+                embed_q, EMBED_BATCH_SIZE, BATCH_MAX_WAIT_SEC, stop
+            ):
+                if stop.is_set():
+                    break
+                # Truncate for embedding and compute 3072‑dim vectors in one call
+                texts = [plain_text[:15000] for _, _, plain_text, _ in batch]
                 try:
-                    from app.db.embedding_config import assert_dim
+                    embeddings = with_rate_limit_retry(
+                        f"embed batch of {len(batch)}", lambda: embed(texts)
+                    )
+                    for embedding in embeddings:
+                        assert_dim(embedding, "mailbird_kb_ingest.embedding")
+                except Exception as e:
+                    for u, *_ in batch:
+                        record(u, False, str(e))
+                    continue
 
-                    assert_dim(embedding, "mailbird_kb_ingest.embedding")
+                scraped_at = datetime.now(timezone.utc).isoformat()
+                for (u, article_json, plain_text, digest), embedding in zip(
+                    batch, embeddings
+                ):
+                    stage_put(
+                        store_q,
+                        {
+                            "url": u,
+                            "content": plain_text,  # plain text only for search; no HTML/Markdown persisted
+                            "markdown": None,
+                            "scraped_at": scraped_at,
+                            "embedding": embedding,
+                            "metadata": {
+                                "source": "mailbird_support",
+                                "content_hash": digest,
+                                "article": article_json,
+                            },
+                        },
+                        stop,
+                    )
+        except BaseException as e:
+            stage_errors.append(e)
+            stop.set()
+            raise
+        finally:
+            stage_put(store_q, _STAGE_DONE, stop)
+
+    def store_stage() -> None:
+        try:
+            table = supabase.table("mailbird_knowledge")
+            for rows in iter_batches(
+                store_q, UPSERT_BATCH_SIZE, BATCH_MAX_WAIT_SEC, stop
+            ):
+                try:
+                    table.upsert(rows, on_conflict="url").execute()
+                    for row in rows:
+                        record(row["url"], True)
                 except Exception as e:
-                    logger.error(str(e))
-                    raise
+                    # Isolate the offending row(s) instead of failing the batch
+                    logger.warning(f"batch upsert failed ({e}); retrying row by row")
+                    for row in rows:
+                        try:
+                            table.upsert(row, on_conflict="url").execute()
+                            record(row["url"], True)
+                        except Exception as row_err:
+                            record(row["url"], False, str(row_err))
+        except BaseException as e:
+            stage_errors.append(e)
+            stop.set()
+            raise
+
+    embed_thread = threading.Thread(target=embed_stage, name="kb-embed")
+    store_thread = threading.Thread(target=store_stage, name="kb-store")
+    embed_thread.start()
+    store_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            list(pool.map(scrape_stage, urls))
+    finally:
+        stage_put(embed_q, _STAGE_DONE, stop)
+        embed_thread.join()
+        store_thread.join()
+    if stage_errors:
+        raise RuntimeError("KB ingest pipeline stage failed") from stage_errors[0]
 
-                row = {
-                    "url": u,
-                    "content": plain_text,  # plain text only for search; no HTML/Markdown persisted
-                    "markdown": None,
-                    "scraped_at": datetime.now(timezone.utc).isoformat(),
-                    "embedding": embedding,
-                    "metadata": {"source": "mailbird_support", "article": article_json},
-                }
+    logger.info(
+        f"Ingest complete: {sum(1 for _, ok, _ in results if ok)} written, "
+        f"{len(unchanged)} unchanged, {sum(1 for _, ok, _ in results if not ok)} failed"
+    )
 
-                supabase.table("mailbird_knowledge").upsert(
-                    row, on_conflict="url"
-                ).execute()
-                return (u, True, None)
-            except Exception as e:
-                msg = str(e)
-                last_error = msg
-                lower_msg = msg.lower()
-                if any(token in lower_msg for token in rate_limit_tokens):
-                    wait_seconds = min(120, 15 * attempt)
-                    logger.warning(
-                        f"Rate limit on {u} (attempt {attempt}/{max_attempts}); sleeping {wait_seconds}s"
-                    )
-                    time.sleep(wait_seconds)
-                    continue
-                return (u, False, msg)
-        return (u, False, f"rate-limited after {max_attempts} attempts: {last_error}")
-
-    # Thread pool concurrency with shared RPM gates
-    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
-        futures = [pool.submit(worker, u) for u in urls]
-        for f in as_completed(futures):
-            u, ok, err = f.result()
-            if ok:
-                logger.info(f"ingested: {u}")
-            else:
-                logger.error(f"failed: {u} err={err}")
-            results.append((u, ok, err))
+    pruned = 0
+    sliced = bool(INGEST_OFFSET or INGEST_LIMIT)
+    if PRUNE_MISSING and existing and zendesk_api_count and not sliced:
+        try:
+            keep = {normalize_url(u) for u in urls} | set(zendesk_map)
+            pruned = prune_missing_rows(supabase, existing, keep)
+            if pruned:
+                logger.info(f"Pruned {pruned} articles no longer published")
+        except Exception as e:
+            logger.warning(f"prune of unpublished articles failed: {e}")
 
     # Write manifest
     manifest = {
@@ -713,6 +980,8 @@ def ingest():
         "ingest_offset": INGEST_OFFSET,
         "ingest_limit": INGEST_LIMIT,
         "ingested_ok": sum(1 for _, ok, _ in results if ok),
+        "unchanged": len(unchanged),
+        "pruned": pruned,
         "ingested_failed": [
             {"url": u, "error": err} for (u, ok, err) in results if not ok
         ],
@@ -0,0 +1,35 @@
+-- Relationship fetch scoped to a set of entities for the Memory UI graph.
+-- Replaces a global top-N relationship scan filtered in the app layer, which
+-- silently dropped relevant edges ranked outside the global top N.
+
+create index if not exists idx_memory_relationships_source_occurrence
+    on public.memory_relationships (source_entity_id, occurrence_count desc);
+
+create index if not exists idx_memory_relationships_target_entity
+    on public.memory_relationships (target_entity_id);
+
+create or replace function public.list_memory_relationships_for_entities(
+    p_entity_ids uuid[],
+    p_limit integer default 2000
+)
+returns setof public.memory_relationships
+language sql
+stable
+security definer
+set search_path = public
+as $$
+select r.*
+from public.memory_relationships r
+where p_entity_ids is not null
+  and r.source_entity_id = any(p_entity_ids)
+  and r.target_entity_id = any(p_entity_ids)
+order by r.occurrence_count desc nulls last
+limit greatest(1, least(coalesce(p_limit, 2000), 10000));
+$$;
+
+revoke all on function public.list_memory_relationships_for_entities(
+    uuid[], integer
+) from public;
+grant execute on function public.list_memory_relationships_for_entities(
+    uuid[], integer
+) to service_role;
@@ -0,0 +1,101 @@
+-- Server-side grep/glob for the agent_files store (SupabaseStoreBackend).
+-- Replaces listing every file under a path and reading each one (N+1) with a
+-- single query whose cost scales with matches rather than file count.
+--
+-- Requires the pg_trgm extension. On Supabase, enable it for the project
+-- (Database > Extensions) if the migration role cannot create it.
+--
+-- p_pattern is a Postgres ARE, not a Python regex: the backend rewrites
+-- \b/\B to \y/\Y and greps client-side for patterns that do not translate
+-- (inline flags, named groups, lookaround). Matching is newline-sensitive, as
+-- in a line-oriented grep: ^ and $ anchor at line boundaries.
+
+create extension if not exists pg_trgm;
+
+-- Trigram index lets the planner prefilter regex (~*) matches on content.
+create index if not exists idx_agent_files_content_trgm
+    on public.agent_files using gin (content gin_trgm_ops);
+
+-- Prefix / LIKE lookups on path.
+create index if not exists idx_agent_files_path_pattern
+    on public.agent_files (path text_pattern_ops);
+
+create or replace function public.grep_agent_files(
+    p_pattern text,
+    p_path_prefix text default '/',
+    p_context_lines integer default 2,
+    p_max_matches integer default 5000
+)
+returns table (
+    path text,
+    line_number integer,
+    line text,
+    context_before text[],
+    context_after text[]
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+with files as (
+    select
+        f.path::text as path,
+        string_to_array(f.content, E'\n') as lines
+    from public.agent_files f
+    where f.path like (
+            replace(replace(replace(coalesce(p_path_prefix, '/'), '\', '\\'),
+                '%', '\%'), '_', '\_') || '%'
+        )
+      -- (?n): newline-sensitive, so ^ and $ anchor at each line of the file.
+      and f.content ~* ('(?n)' || p_pattern)
+)
+select
+    files.path,
+    l.n::integer as line_number,
+    l.line,
+    files.lines[greatest(1, l.n - greatest(p_context_lines, 0)) : l.n - 1],
+    files.lines[l.n + 1 : l.n + greatest(p_context_lines, 0)]
+from files
+cross join lateral unnest(files.lines) with ordinality as l(line, n)
+where l.line ~* ('(?n)' || p_pattern)
+order by files.path, l.n
+limit greatest(1, least(coalesce(p_max_matches, 5000), 50000));
+$$;
+
+create or replace function public.glob_agent_files(
+    p_like text,
+    p_limit integer default 5000
+)
+returns table (
+    path text,
+    size integer,
+    metadata jsonb,
+    created_at timestamptz,
+    updated_at timestamptz
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+select
+    f.path::text,
+    coalesce(char_length(f.content), 0)::integer as size,
+    f.metadata,
+    f.created_at,
+    f.updated_at
+from public.agent_files f
+where f.path like p_like
+order by f.path
+limit greatest(1, least(coalesce(p_limit, 5000), 50000));
+$$;
+
+revoke all on function public.grep_agent_files(text, text, integer, integer)
+    from public;
+grant execute on function public.grep_agent_files(text, text, integer, integer)
+    to service_role;
+
+revoke all on function public.glob_agent_files(text, integer) from public;
+grant execute on function public.glob_agent_files(text, integer)
+    to service_role;
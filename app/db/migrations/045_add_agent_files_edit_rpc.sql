@@ -0,0 +1,95 @@
+-- Atomic, patch-based edits for the agent_files store (SupabaseStoreBackend).
+-- Edits used to download the full file, replace in the app and upload the
+-- whole content back, so concurrent edits silently overwrote each other.
+-- Only the old/new strings now travel; the replacement runs under a row
+-- lock and can be guarded by an optimistic version check.
+
+alter table public.agent_files
+    add column if not exists version bigint not null default 1;
+
+create or replace function public.agent_files_bump_version()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.version := coalesce(old.version, 0) + 1;
+    return new;
+end;
+$$;
+
+drop trigger if exists trg_agent_files_bump_version on public.agent_files;
+create trigger trg_agent_files_bump_version
+    before update on public.agent_files
+    for each row
+    when (old.content is distinct from new.content)
+    execute function public.agent_files_bump_version();
+
+-- status: 'ok' | 'not_found' | 'no_match' | 'conflict'
+create or replace function public.edit_agent_file(
+    p_path text,
+    p_old text,
+    p_new text,
+    p_replace_all boolean default false,
+    p_expected_version bigint default null
+)
+returns table (
+    status text,
+    replacements integer,
+    version bigint
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_content text;
+    v_version bigint;
+    v_position integer;
+    v_count integer;
+begin
+    select f.content, f.version
+      into v_content, v_version
+      from public.agent_files f
+     where f.path = p_path
+     for update;
+
+    if not found then
+        return query select 'not_found'::text, 0, null::bigint;
+        return;
+    end if;
+
+    if p_expected_version is not null and p_expected_version <> v_version then
+        return query select 'conflict'::text, 0, v_version;
+        return;
+    end if;
+
+    v_position := strpos(coalesce(v_content, ''), p_old);
+    if p_old = '' or v_position = 0 then
+        return query select 'no_match'::text, 0, v_version;
+        return;
+    end if;
+
+    if p_replace_all then
+        v_count := (char_length(v_content)
+            - char_length(replace(v_content, p_old, ''))) / char_length(p_old);
+        v_content := replace(v_content, p_old, p_new);
+    else
+        v_count := 1;
+        v_content := overlay(v_content placing p_new
+            from v_position for char_length(p_old));
+    end if;
+
+    update public.agent_files f
+       set content = v_content,
+           updated_at = now()
+     where f.path = p_path
+    returning f.version into v_version;
+
+    return query select 'ok'::text, v_count, v_version;
+end;
+$$;
+
+revoke all on function public.edit_agent_file(text, text, text, boolean, bigint)
+    from public;
+grant execute on function public.edit_agent_file(text, text, text, boolean, bigint)
+    to service_role;
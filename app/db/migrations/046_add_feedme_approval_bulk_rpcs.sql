@@ -0,0 +1,171 @@
+-- Set-based approval transitions and metrics for the FeedMe approval workflow
+-- (ApprovalWorkflowEngine). Bulk approval used to read, validate and write
+-- every example one at a time, and the metrics endpoint pulled every row in
+-- the period to count and average it in the app.
+--
+-- Transition rules stay in the app's ApprovalStateMachine: callers pass the
+-- source states that may move to p_to_state, and rows in any other state are
+-- reported back instead of being updated.
+
+create index if not exists idx_feedme_temp_examples_created_at
+    on public.feedme_temp_examples (created_at desc);
+
+-- status: 'ok' | 'not_found' | 'invalid_transition'
+create or replace function public.bulk_transition_feedme_temp_examples(
+    p_ids bigint[],
+    p_from_states text[],
+    p_to_state text,
+    p_history_action text,
+    p_reviewer_id text,
+    p_review_notes text default null,
+    p_rejection_reason text default null,
+    p_revision_instructions text default null
+)
+returns table (
+    id bigint,
+    status text,
+    previous_status text,
+    new_status text
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+#variable_conflict use_column
+begin
+    return query
+    with requested as (
+        select distinct r.id
+        from unnest(p_ids) as r(id)
+    ),
+    locked as (
+        select t.id, coalesce(t.approval_status, 'pending')::text as approval_status
+        from public.feedme_temp_examples t
+        where t.id = any(p_ids)
+        for update
+    ),
+    updated as (
+        update public.feedme_temp_examples t
+           set approval_status = p_to_state,
+               reviewer_id = p_reviewer_id,
+               assigned_reviewer = p_reviewer_id,
+               reviewed_at = now(),
+               review_notes = p_review_notes,
+               rejection_reason = p_rejection_reason,
+               revision_instructions = p_revision_instructions,
+               reviewer_confidence_score = null,
+               reviewer_usefulness_score = null,
+               auto_approved = false,
+               auto_approval_reason = null,
+               updated_at = now()
+          from locked l
+         where t.id = l.id
+           and l.approval_status = any(p_from_states)
+        returning t.id, l.approval_status as previous_status
+    ),
+    history as (
+        insert into public.feedme_review_history (
+            temp_example_id,
+            reviewer_id,
+            action,
+            review_notes,
+            previous_status,
+            new_status,
+            changes_made
+        )
+        select
+            u.id,
+            p_reviewer_id,
+            p_history_action,
+            p_review_notes,
+            u.previous_status,
+            p_to_state,
+            jsonb_build_object(
+                'approval_status', p_to_state,
+                'review_notes', p_review_notes
+            )
+        from updated u
+    )
+    select
+        r.id,
+        case
+            when u.id is not null then 'ok'
+            when l.id is null then 'not_found'
+            else 'invalid_transition'
+        end,
+        l.approval_status,
+        case when u.id is not null then p_to_state else l.approval_status end
+    from requested r
+    left join locked l on l.id = r.id
+    left join updated u on u.id = r.id
+    order by r.id;
+end;
+$$;
+
+create or replace function public.get_feedme_workflow_metrics(
+    p_start timestamptz,
+    p_end timestamptz
+)
+returns table (
+    total bigint,
+    total_pending bigint,
+    total_approved bigint,
+    total_rejected bigint,
+    total_revision_requested bigint,
+    total_auto_approved bigint,
+    avg_review_time_hours double precision,
+    median_review_time_hours double precision,
+    avg_extraction_confidence double precision,
+    reviewer_efficiency jsonb
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+with scoped as (
+    select
+        t.approval_status,
+        t.auto_approved,
+        t.extraction_confidence,
+        extract(epoch from (t.reviewed_at - t.created_at)) / 3600.0 as review_hours,
+        coalesce(t.reviewer_id, t.assigned_reviewer) as reviewer
+    from public.feedme_temp_examples t
+    where t.created_at >= p_start
+      and t.created_at <= p_end
+),
+per_reviewer as (
+    select s.reviewer, count(*) as reviewed
+    from scoped s
+    where s.reviewer is not null
+      and s.approval_status in ('approved', 'rejected', 'revision_requested')
+    group by s.reviewer
+)
+select
+    count(*),
+    count(*) filter (where s.approval_status = 'pending'),
+    count(*) filter (where s.approval_status = 'approved'),
+    count(*) filter (where s.approval_status = 'rejected'),
+    count(*) filter (where s.approval_status = 'revision_requested'),
+    count(*) filter (where s.auto_approved is true),
+    avg(s.review_hours)::double precision,
+    percentile_cont(0.5) within group (order by s.review_hours)::double precision,
+    avg(s.extraction_confidence)::double precision,
+    coalesce(
+        (select jsonb_object_agg(p.reviewer, p.reviewed) from per_reviewer p),
+        '{}'::jsonb
+    )
+from scoped s;
+$$;
+
+revoke all on function public.bulk_transition_feedme_temp_examples(
+    bigint[], text[], text, text, text, text, text, text
+) from public;
+grant execute on function public.bulk_transition_feedme_temp_examples(
+    bigint[], text[], text, text, text, text, text, text
+) to service_role;
+
+revoke all on function public.get_feedme_workflow_metrics(timestamptz, timestamptz)
+    from public;
+grant execute on function public.get_feedme_workflow_metrics(timestamptz, timestamptz)
+    to service_role;
@@ -0,0 +1,101 @@
+-- Copy-on-write thread forks and chunked retention for LangGraph checkpoints
+-- (ThreadManager). Forks used to copy the parent checkpoint's state blob into
+-- the new thread, and cleanup ran one unbounded DELETE.
+--
+-- A forked checkpoint now stores an empty state and points at the checkpoint
+-- that owns the blob via state_ref_id; readers resolve it with
+-- COALESCE(owner.state, checkpoint.state).
+
+alter table langgraph_checkpoints
+    add column if not exists state_ref_id uuid references langgraph_checkpoints(id);
+
+create index if not exists idx_langgraph_checkpoints_state_ref
+    on langgraph_checkpoints (state_ref_id)
+    where state_ref_id is not null;
+
+-- Retention scans old checkpoints oldest-first in small batches.
+create index if not exists idx_langgraph_checkpoints_created_at
+    on langgraph_checkpoints (created_at);
+
+-- Deleting an old checkpoint must not cascade to the newer checkpoints (and
+-- forks) that name it as their parent.
+alter table langgraph_checkpoints
+    drop constraint if exists langgraph_checkpoints_parent_checkpoint_id_fkey;
+alter table langgraph_checkpoints
+    add constraint langgraph_checkpoints_parent_checkpoint_id_fkey
+    foreign key (parent_checkpoint_id) references langgraph_checkpoints(id)
+    on delete set null;
+
+-- When a checkpoint that owns a shared blob is deleted (e.g. its thread is
+-- removed), hand the blob to the oldest fork and repoint the others to it.
+create or replace function langgraph_checkpoints_release_state()
+returns trigger
+language plpgsql
+set search_path = public, pg_temp
+as $$
+declare
+    v_heir uuid;
+begin
+    select c.id
+      into v_heir
+      from langgraph_checkpoints c
+     where c.state_ref_id = old.id
+     order by c.created_at, c.id
+     limit 1;
+
+    if v_heir is null then
+        return old;
+    end if;
+
+    update langgraph_checkpoints
+       set state = old.state,
+           is_compressed = old.is_compressed,
+           state_ref_id = null
+     where id = v_heir;
+
+    update langgraph_checkpoints
+       set state_ref_id = v_heir
+     where state_ref_id = old.id;
+
+    return old;
+end;
+$$;
+
+drop trigger if exists trigger_langgraph_checkpoints_release_state on langgraph_checkpoints;
+create trigger trigger_langgraph_checkpoints_release_state
+    before delete on langgraph_checkpoints
+    for each row
+    execute function langgraph_checkpoints_release_state();
+
+create or replace function get_latest_checkpoint(
+    p_thread_id uuid,
+    p_channel varchar default 'main'
+)
+returns table (
+    checkpoint_id uuid,
+    version integer,
+    checkpoint_type varchar,
+    state jsonb,
+    metadata jsonb,
+    created_at timestamptz
+)
+language plpgsql
+set search_path = public, pg_temp
+as $$
+begin
+    return query
+    select
+        c.id as checkpoint_id,
+        c.version,
+        c.checkpoint_type,
+        coalesce(owner.state, c.state) as state,
+        c.metadata,
+        c.created_at
+    from langgraph_checkpoints c
+    left join langgraph_checkpoints owner on owner.id = c.state_ref_id
+    where c.thread_id = p_thread_id
+        and c.channel = p_channel
+        and c.is_latest = true
+    limit 1;
+end;
+$$;
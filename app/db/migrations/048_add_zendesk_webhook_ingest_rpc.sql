@@ -0,0 +1,77 @@
+-- Batched ingestion for Zendesk webhooks (app/integrations/zendesk/webhook_ingest.py).
+-- The webhook endpoint used to insert a replay-protection row and then a queue
+-- row for every request, two round trips per webhook. Requests are now
+-- collected into short micro-batches and both inserts run in one call.
+--
+-- p_events: [{"sig_key", "ts", "ticket_id", "brand_id", "subject",
+--             "description", "requester_hashed"}, ...]
+-- status: 'queued' | 'duplicate' | 'replay' (idx is the 0-based array position)
+create or replace function public.ingest_zendesk_webhook_events(p_events jsonb)
+returns table (
+    idx integer,
+    status text
+)
+language plpgsql
+security definer
+set search_path = public
+as $$
+declare
+    v_event jsonb;
+    v_position bigint;
+    v_count integer;
+begin
+    for v_event, v_position in
+        select e.value, e.position
+          from jsonb_array_elements(coalesce(p_events, '[]'::jsonb))
+               with ordinality as e(value, position)
+    loop
+        idx := (v_position - 1)::integer;
+
+        if coalesce(v_event->>'sig_key', '') <> '' then
+            insert into public.zendesk_webhook_events (sig_key, ts)
+            values (
+                v_event->>'sig_key',
+                coalesce(
+                    (v_event->>'ts')::bigint,
+                    extract(epoch from now())::bigint
+                )
+            )
+            on conflict (sig_key) do nothing;
+            get diagnostics v_count = row_count;
+            if v_count = 0 then
+                status := 'replay';
+                return next;
+                continue;
+            end if;
+        end if;
+
+        insert into public.zendesk_pending_tickets (
+            ticket_id,
+            brand_id,
+            subject,
+            description,
+            payload,
+            status,
+            requester_hashed
+        )
+        values (
+            (v_event->>'ticket_id')::bigint,
+            v_event->>'brand_id',
+            v_event->>'subject',
+            v_event->>'description',
+            '{}'::jsonb,
+            'pending',
+            v_event->>'requester_hashed'
+        )
+        on conflict (ticket_id) do nothing;
+        get diagnostics v_count = row_count;
+
+        status := case when v_count = 1 then 'queued' else 'duplicate' end;
+        return next;
+    end loop;
+end;
+$$;
+
+revoke all on function public.ingest_zendesk_webhook_events(jsonb) from public;
+grant execute on function public.ingest_zendesk_webhook_events(jsonb)
+    to service_role;
@@ -0,0 +1,39 @@
+-- Return agent_files.version (migration 045) from glob_agent_files so that
+-- FileInfo carries the version a caller passes to edit(expected_version=...).
+-- The return type changes, so the function is dropped and recreated.
+
+drop function if exists public.glob_agent_files(text, integer);
+
+create function public.glob_agent_files(
+    p_like text,
+    p_limit integer default 5000
+)
+returns table (
+    path text,
+    size integer,
+    metadata jsonb,
+    created_at timestamptz,
+    updated_at timestamptz,
+    version bigint
+)
+language sql
+stable
+security definer
+set search_path = public
+as $$
+select
+    f.path::text,
+    coalesce(char_length(f.content), 0)::integer as size,
+    f.metadata,
+    f.created_at,
+    f.updated_at,
+    f.version
+from public.agent_files f
+where f.path like p_like
+order by f.path
+limit greatest(1, least(coalesce(p_limit, 5000), 50000));
+$$;
+
+revoke all on function public.glob_agent_files(text, integer) from public;
+grant execute on function public.glob_agent_files(text, integer)
+    to service_role;
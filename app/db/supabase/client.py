@@ -68,6 +68,21 @@ class SupabaseConfig:
             self.mock_mode = False
 
 
+def is_missing_rpc(exc: Exception, rpc_name: str) -> bool:
+    """Return True if ``exc`` reports that RPC ``rpc_name`` is not deployed.
+
+    Callers use this to fall back to the pre-RPC query path until the
+    migration that creates the function has been applied.
+    """
+    message = str(exc).lower()
+    return rpc_name in message and (
+        "not found" in message
+        or "does not exist" in message
+        or "could not find the function" in message
+        or "schema cache" in message
+    )
+
+
 class SupabaseClient:
     """
     Supabase client wrapper with typed operations for FeedMe integration
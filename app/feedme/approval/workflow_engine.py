@@ -27,7 +27,7 @@ from .schemas import (
 )
 from .state_machine import ApprovalStateMachine, StateTransitionError
 from ..embeddings.embedding_pipeline import FeedMeEmbeddingPipeline
-from app.db.supabase.client import get_supabase_client
+from app.db.supabase.client import get_supabase_client, is_missing_rpc
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +35,14 @@ logger = logging.getLogger(__name__)
 _PREFERRED_TEMP_EXAMPLES_TABLE = "feedme_temp_examples"
 _FALLBACK_TEMP_EXAMPLES_TABLE = "feedme_examples_temp"
 _REVIEW_HISTORY_TABLE = "feedme_review_history"
+_BULK_TRANSITION_RPC = "bulk_transition_feedme_temp_examples"
+_WORKFLOW_METRICS_RPC = "get_feedme_workflow_metrics"
+
+_HISTORY_ACTIONS = {
+    ApprovalAction.APPROVE: "approved",
+    ApprovalAction.REJECT: "rejected",
+    ApprovalAction.REQUEST_REVISION: "revision_requested",
+}
 
 
 class WorkflowTransition:
@@ -342,56 +350,50 @@ class ApprovalWorkflowEngine:
         query = self.supabase_client.table(table).select("*", count="exact")
 
         approval_status = filters.get("approval_status")
-        if approval_status and not self._use_fallback_temp_examples:
-            query = query.eq("approval_status", approval_status)
-
         assigned_reviewer = filters.get("assigned_reviewer")
-        if assigned_reviewer and not self._use_fallback_temp_examples:
-            query = query.eq("assigned_reviewer", assigned_reviewer)
-
         priority = filters.get("priority")
-        if priority and not self._use_fallback_temp_examples:
-            query = query.eq("priority", priority)
-
         min_confidence = filters.get("min_confidence")
-        if min_confidence is not None and not self._use_fallback_temp_examples:
-            query = query.gte("extraction_confidence", min_confidence)
-
-        offset = max(0, (page - 1) * page_size)
-        query = query.order("created_at", desc=True)
-        if not self._use_fallback_temp_examples:
-            query = query.range(offset, offset + page_size - 1)
-
-        response = await self._exec(lambda: query.execute())
-        items = [self._normalize_temp_example(row) for row in (response.data or [])]
 
         if self._use_fallback_temp_examples:
+            # Workflow fields live in metadata on the fallback table; filter
+            # them there rather than pulling every row into the app.
+            if approval_status:
+                query = self._filter_metadata(
+                    query,
+                    "approval_status",
+                    approval_status,
+                    default=ApprovalState.PENDING.value,
+                )
+            if assigned_reviewer:
+                query = self._filter_metadata(
+                    query, "assigned_reviewer", assigned_reviewer
+                )
+            if priority:
+                query = self._filter_metadata(
+                    query, "priority", priority, default="normal"
+                )
+            if min_confidence is not None:
+                query = query.gte("confidence_score", min_confidence)
+        else:
             if approval_status:
-                items = [
-                    item
-                    for item in items
-                    if item.get("approval_status") == approval_status
-                ]
+                query = query.eq("approval_status", approval_status)
             if assigned_reviewer:
-                items = [
-                    item
-                    for item in items
-                    if item.get("assigned_reviewer") == assigned_reviewer
-                ]
+                query = query.eq("assigned_reviewer", assigned_reviewer)
             if priority:
-                items = [
-                    item for item in items if item.get("priority") == priority
-                ]
+                query = query.eq("priority", priority)
             if min_confidence is not None:
-                items = [
-                    item
-                    for item in items
-                    if (item.get("extraction_confidence") or 0) >= min_confidence
-                ]
+                query = query.gte("extraction_confidence", min_confidence)
 
-        total = len(items)
+        offset = max(0, (page - 1) * page_size)
+        query = query.order("created_at", desc=True).range(
+            offset, offset + page_size - 1
+        )
+
+        response = await self._exec(lambda: query.execute())
+        items = [self._normalize_temp_example(row) for row in (response.data or [])]
+
+        total = response.count if response.count is not None else offset + len(items)
         total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-        items = items[offset : offset + page_size]
 
         return {
             "items": items,
@@ -401,6 +403,16 @@ class ApprovalWorkflowEngine:
             "total_pages": total_pages,
         }
 
+    @staticmethod
+    def _filter_metadata(
+        query: Any, key: str, value: Any, *, default: Optional[str] = None
+    ) -> Any:
+        """Filter on a metadata field; rows without it count as ``default``."""
+        field = f"metadata->>{key}"
+        if default is not None and value == default:
+            return query.or_(f"{field}.eq.{value},{field}.is.null")
+        return query.eq(field, value)
+
     async def update_temp_example(
         self, temp_example_id: int, update_data: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -455,6 +467,64 @@ class ApprovalWorkflowEngine:
             raise ValueError("Temp example not found")
         return reviewer_id
 
+    def _review_update_payload(
+        self,
+        new_state: ApprovalState,
+        *,
+        reviewer_id: str,
+        review_notes: Optional[str],
+        rejection_reason: Any,
+        revision_instructions: Optional[str],
+        reviewer_confidence_score: Optional[float] = None,
+        reviewer_usefulness_score: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        now = self._now().isoformat()
+        return {
+            "approval_status": new_state.value,
+            "reviewer_id": reviewer_id,
+            "assigned_reviewer": reviewer_id,
+            "reviewed_at": now,
+            "review_notes": review_notes,
+            "rejection_reason": rejection_reason,
+            "revision_instructions": revision_instructions,
+            "reviewer_confidence_score": reviewer_confidence_score,
+            "reviewer_usefulness_score": reviewer_usefulness_score,
+            "auto_approved": False,
+            "auto_approval_reason": None,
+            "updated_at": now,
+        }
+
+    @staticmethod
+    def _review_history_payload(
+        temp_example_id: int,
+        *,
+        action: ApprovalAction,
+        reviewer_id: str,
+        review_notes: Optional[str],
+        previous_status: str,
+        new_status: str,
+        confidence_assessment: Optional[float] = None,
+        time_spent_minutes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "temp_example_id": temp_example_id,
+            "reviewer_id": reviewer_id,
+            "action": _HISTORY_ACTIONS.get(action, action.value),
+            "review_notes": review_notes,
+            "confidence_assessment": confidence_assessment,
+            "time_spent_minutes": time_spent_minutes,
+            "previous_status": previous_status,
+            "new_status": new_status,
+            "changes_made": {
+                "approval_status": new_status,
+                "review_notes": review_notes,
+            },
+        }
+
+    @staticmethod
+    def _transition_error(current_state: Any, action: ApprovalAction) -> str:
+        return f"Cannot transition from {current_state} with action {action}"
+
     async def process_approval_decision(
         self, temp_example_id: int, decision: ApprovalDecision
     ) -> Dict[str, Any]:
@@ -469,26 +539,21 @@ class ApprovalWorkflowEngine:
 
         if not self.state_machine.can_transition(current_state, decision.action):
             raise StateTransitionError(
-                f"Cannot transition from {current_state} with action {decision.action}"
+                self._transition_error(current_state, decision.action)
             )
 
         new_state = self.state_machine.transition(current_state, decision.action)
         approval_status = new_state.value
 
-        update_payload: Dict[str, Any] = {
-            "approval_status": approval_status,
-            "reviewer_id": decision.reviewer_id,
-            "assigned_reviewer": decision.reviewer_id,
-            "reviewed_at": self._now().isoformat(),
-            "review_notes": decision.review_notes,
-            "rejection_reason": decision.rejection_reason,
-            "revision_instructions": decision.revision_instructions,
-            "reviewer_confidence_score": decision.reviewer_confidence_score,
-            "reviewer_usefulness_score": decision.reviewer_usefulness_score,
-            "auto_approved": False,
-            "auto_approval_reason": None,
-            "updated_at": self._now().isoformat(),
-        }
+        update_payload = self._review_update_payload(
+            new_state,
+            reviewer_id=decision.reviewer_id,
+            review_notes=decision.review_notes,
+            rejection_reason=decision.rejection_reason,
+            revision_instructions=decision.revision_instructions,
+            reviewer_confidence_score=decision.reviewer_confidence_score,
+            reviewer_usefulness_score=decision.reviewer_usefulness_score,
+        )
 
         table = await self._get_temp_examples_table()
         if self._use_fallback_temp_examples:
@@ -511,25 +576,16 @@ class ApprovalWorkflowEngine:
 
         # Record review history (best-effort)
         try:
-            action_map = {
-                ApprovalAction.APPROVE: "approved",
-                ApprovalAction.REJECT: "rejected",
-                ApprovalAction.REQUEST_REVISION: "revision_requested",
-            }
-            history_payload = {
-                "temp_example_id": temp_example_id,
-                "reviewer_id": decision.reviewer_id,
-                "action": action_map.get(decision.action, decision.action.value),
-                "review_notes": decision.review_notes,
-                "confidence_assessment": decision.confidence_assessment,
-                "time_spent_minutes": decision.time_spent_minutes,
-                "previous_status": current_state.value,
-                "new_status": approval_status,
-                "changes_made": {
-                    "approval_status": approval_status,
-                    "review_notes": decision.review_notes,
-                },
-            }
+            history_payload = self._review_history_payload(
+                temp_example_id,
+                action=decision.action,
+                reviewer_id=decision.reviewer_id,
+                review_notes=decision.review_notes,
+                previous_status=current_state.value,
+                new_status=approval_status,
+                confidence_assessment=decision.confidence_assessment,
+                time_spent_minutes=decision.time_spent_minutes,
+            )
             await self._exec(
                 lambda: self.supabase_client.table(_REVIEW_HISTORY_TABLE)
                 .insert(history_payload)
@@ -543,40 +599,266 @@ class ApprovalWorkflowEngine:
     async def bulk_approve_examples(
         self, request: BulkApprovalRequest
     ) -> BulkApprovalResponse:
-        """Process bulk approval of multiple examples."""
+        """Process bulk approval of multiple examples.
+
+        Transitions are validated against the state machine and applied as a
+        set: a single RPC call validates, updates and records history for all
+        IDs. Without the RPC (or on the fallback table) the rows are read in
+        one query and updated per source state.
+        """
         start_time = time.perf_counter()
-        failures: list[dict[str, Any]] = []
-        successful = 0
+        temp_example_ids = list(request.temp_example_ids)
 
-        for temp_example_id in request.temp_example_ids:
-            try:
-                decision = ApprovalDecision(
-                    temp_example_id=temp_example_id,
-                    action=request.action,
-                    reviewer_id=request.reviewer_id,
-                    review_notes=request.review_notes,
-                    confidence_assessment=None,
-                    time_spent_minutes=None,
-                    rejection_reason=request.rejection_reason,
-                    revision_instructions=request.revision_instructions,
-                    reviewer_confidence_score=None,
-                    reviewer_usefulness_score=None,
-                )
-                await self.process_approval_decision(temp_example_id, decision)
-                successful += 1
-            except Exception as exc:
-                failures.append({"temp_example_id": temp_example_id, "error": str(exc)})
+        table = await self._get_temp_examples_table()
+        outcomes: Optional[Dict[int, Optional[str]]] = None
+        if not self._use_fallback_temp_examples:
+            outcomes = await self._bulk_transition_rpc(temp_example_ids, request)
+        if outcomes is None:
+            outcomes = await self._bulk_transition_client_side(
+                table, temp_example_ids, request
+            )
 
+        failures = [
+            {"temp_example_id": temp_example_id, "error": error}
+            for temp_example_id in temp_example_ids
+            if (error := outcomes.get(temp_example_id)) is not None
+        ]
         elapsed_ms = (time.perf_counter() - start_time) * 1000.0
 
         return BulkApprovalResponse(
-            processed_count=len(request.temp_example_ids),
-            successful_count=successful,
+            processed_count=len(temp_example_ids),
+            successful_count=len(temp_example_ids) - len(failures),
             failed_count=len(failures),
             failures=failures,
             processing_time_ms=elapsed_ms,
         )
 
+    def _transition_sources(
+        self, action: ApprovalAction
+    ) -> Dict[ApprovalState, list[ApprovalState]]:
+        """Group the states ``action`` may leave by the state it leads to."""
+        sources: Dict[ApprovalState, list[ApprovalState]] = {}
+        for state in ApprovalState:
+            if self.state_machine.can_transition(state, action):
+                target = self.state_machine.transition(state, action)
+                sources.setdefault(target, []).append(state)
+        return sources
+
+    async def _bulk_transition_rpc(
+        self, temp_example_ids: list[int], request: BulkApprovalRequest
+    ) -> Optional[Dict[int, Optional[str]]]:
+        """Apply a bulk transition server-side; ``None`` if the RPC is missing.
+
+        Returns a map of id -> error message (``None`` on success).
+        """
+        sources = self._transition_sources(request.action)
+        if not sources:
+            return None
+
+        rejection_reason = getattr(
+            request.rejection_reason, "value", request.rejection_reason
+        )
+        outcomes: Dict[int, Optional[str]] = {}
+        remaining = list(temp_example_ids)
+        last_status: Dict[int, Optional[str]] = {}
+
+        for new_state, from_states in sources.items():
+            if not remaining:
+                break
+            params = {
+                "p_ids": remaining,
+                "p_from_states": [state.value for state in from_states],
+                "p_to_state": new_state.value,
+                "p_history_action": _HISTORY_ACTIONS.get(
+                    request.action, request.action.value
+                ),
+                "p_reviewer_id": request.reviewer_id,
+                "p_review_notes": request.review_notes,
+                "p_rejection_reason": rejection_reason,
+                "p_revision_instructions": request.revision_instructions,
+            }
+            try:
+                response = await self._exec(
+                    lambda params=params: self.supabase_client.rpc(
+                        _BULK_TRANSITION_RPC, params
+                    ).execute()
+                )
+            except Exception as exc:
+                if is_missing_rpc(exc, _BULK_TRANSITION_RPC) and not outcomes:
+                    logger.info(
+                        "%s RPC unavailable; applying bulk transition client-side",
+                        _BULK_TRANSITION_RPC,
+                    )
+                    return None
+                logger.error("Bulk transition failed: %s", exc)
+                for temp_example_id in remaining:
+                    outcomes[temp_example_id] = str(exc)
+                return outcomes
+
+            next_remaining: list[int] = []
+            for row in response.data or []:
+                temp_example_id = row.get("id")
+                status = row.get("status")
+                if status == "ok":
+                    outcomes[temp_example_id] = None
+                elif status == "not_found":
+                    outcomes[temp_example_id] = "Temp example not found"
+                else:
+                    last_status[temp_example_id] = row.get("previous_status")
+                    next_remaining.append(temp_example_id)
+            remaining = next_remaining
+
+        for temp_example_id in temp_example_ids:
+            if temp_example_id in outcomes:
+                continue
+            previous = last_status.get(temp_example_id)
+            try:
+                current_state: Any = ApprovalState(previous)
+            except ValueError:
+                current_state = previous
+            outcomes[temp_example_id] = self._transition_error(
+                current_state, request.action
+            )
+        return outcomes
+
+    async def _bulk_transition_client_side(
+        self, table: str, temp_example_ids: list[int], request: BulkApprovalRequest
+    ) -> Dict[int, Optional[str]]:
+        """Read all rows at once, validate, then update per source state."""
+        outcomes: Dict[int, Optional[str]] = {}
+        columns = (
+            "id, created_at, metadata"
+            if self._use_fallback_temp_examples
+            else "id, approval_status"
+        )
+        try:
+            response = await self._exec(
+                lambda: self.supabase_client.table(table)
+                .select(columns)
+                .in_("id", temp_example_ids)
+                .execute()
+            )
+        except Exception as exc:
+            logger.error("Bulk transition lookup failed: %s", exc)
+            return {temp_example_id: str(exc) for temp_example_id in temp_example_ids}
+
+        raw_rows = {row.get("id"): row for row in (response.data or [])}
+        groups: Dict[tuple[Optional[str], ApprovalState, ApprovalState], list[int]] = {}
+        current_rows: Dict[int, Dict[str, Any]] = {}
+
+        for temp_example_id in temp_example_ids:
+            raw = raw_rows.get(temp_example_id)
+            if raw is None:
+                outcomes[temp_example_id] = "Temp example not found"
+                continue
+            current = self._normalize_temp_example(raw)
+            try:
+                current_state = ApprovalState(current.get("approval_status"))
+            except ValueError as exc:
+                outcomes[temp_example_id] = str(exc)
+                continue
+            if not self.state_machine.can_transition(current_state, request.action):
+                outcomes[temp_example_id] = self._transition_error(
+                    current_state, request.action
+                )
+                continue
+            new_state = self.state_machine.transition(current_state, request.action)
+            key = (raw.get("approval_status"), current_state, new_state)
+            groups.setdefault(key, []).append(temp_example_id)
+            current_rows[temp_example_id] = current
+
+        history: list[Dict[str, Any]] = []
+        for (raw_status, current_state, new_state), group_ids in groups.items():
+            payload = self._review_update_payload(
+                new_state,
+                reviewer_id=request.reviewer_id,
+                review_notes=request.review_notes,
+                rejection_reason=request.rejection_reason,
+                revision_instructions=request.revision_instructions,
+            )
+            try:
+                updated_ids = await self._apply_group_update(
+                    table, payload, raw_status, group_ids, current_rows
+                )
+            except Exception as exc:
+                logger.error("Bulk transition update failed: %s", exc)
+                for temp_example_id in group_ids:
+                    outcomes[temp_example_id] = str(exc)
+                continue
+
+            for temp_example_id in group_ids:
+                if temp_example_id not in updated_ids:
+                    outcomes[temp_example_id] = "Temp example was modified concurrently"
+                    continue
+                outcomes[temp_example_id] = None
+                history.append(
+                    self._review_history_payload(
+                        temp_example_id,
+                        action=request.action,
+                        reviewer_id=request.reviewer_id,
+                        review_notes=request.review_notes,
+                        previous_status=current_state.value,
+                        new_status=new_state.value,
+                    )
+                )
+
+        if history:
+            try:
+                await self._exec(
+                    lambda: self.supabase_client.table(_REVIEW_HISTORY_TABLE)
+                    .insert(history)
+                    .execute()
+                )
+            except Exception as exc:
+                logger.warning("Failed to record review history: %s", exc)
+
+        return outcomes
+
+    async def _apply_group_update(
+        self,
+        table: str,
+        payload: Dict[str, Any],
+        raw_status: Optional[str],
+        group_ids: list[int],
+        current_rows: Dict[int, Dict[str, Any]],
+    ) -> set[int]:
+        """Update rows sharing a source state; return the ids actually updated."""
+        if self._use_fallback_temp_examples:
+            # Workflow fields are merged into each row's metadata here.
+            updated: set[int] = set()
+            for temp_example_id in group_ids:
+                row_payload = dict(payload)
+                row_payload["metadata"] = self._merge_metadata_update(
+                    current_rows[temp_example_id], payload
+                )
+                row_payload = self._project_temp_example_payload(row_payload)
+                response = await self._exec(
+                    lambda row_payload=row_payload, temp_example_id=temp_example_id: (
+                        self.supabase_client.table(table)
+                        .update(row_payload)
+                        .eq("id", temp_example_id)
+                        .execute()
+                    )
+                )
+                if response.data:
+                    updated.add(temp_example_id)
+            return updated
+
+        # Guard on the state that was validated so rows moved by a concurrent
+        # review are reported instead of overwritten.
+        def _update():
+            query = (
+                self.supabase_client.table(table).update(payload).in_("id", group_ids)
+            )
+            if raw_status is None:
+                query = query.is_("approval_status", "null")
+            else:
+                query = query.eq("approval_status", raw_status)
+            return query.execute()
+
+        response = await self._exec(_update)
+        return {row.get("id") for row in (response.data or [])}
+
     async def process_bulk_approval(
         self, request: BulkApprovalRequest
     ) -> BulkApprovalResponse:
@@ -592,6 +874,11 @@ class ApprovalWorkflowEngine:
         period_end = end_date or now
 
         table = await self._get_temp_examples_table()
+        if not self._use_fallback_temp_examples:
+            metrics = await self._get_workflow_metrics_rpc(period_start, period_end)
+            if metrics is not None:
+                return metrics
+
         if self._use_fallback_temp_examples:
             query = (
                 self.supabase_client.table(table)
@@ -615,6 +902,68 @@ class ApprovalWorkflowEngine:
         if self._use_fallback_temp_examples:
             rows = [self._normalize_temp_example(row) for row in rows]
 
+        return self._aggregate_workflow_metrics(rows, period_start, period_end)
+
+    async def _get_workflow_metrics_rpc(
+        self, period_start: datetime, period_end: datetime
+    ) -> Optional[WorkflowMetrics]:
+        """Aggregate workflow metrics in the database; ``None`` if unavailable."""
+        try:
+            response = await self._exec(
+                lambda: self.supabase_client.rpc(
+                    _WORKFLOW_METRICS_RPC,
+                    {
+                        "p_start": period_start.isoformat(),
+                        "p_end": period_end.isoformat(),
+                    },
+                ).execute()
+            )
+        except Exception as exc:
+            if not is_missing_rpc(exc, _WORKFLOW_METRICS_RPC):
+                raise
+            logger.info(
+                "%s RPC unavailable; aggregating metrics client-side",
+                _WORKFLOW_METRICS_RPC,
+            )
+            return None
+
+        data = response.data or []
+        row = (data[0] if isinstance(data, list) and data else data) or {}
+        if not isinstance(row, dict):
+            return None
+
+        total = int(row.get("total") or 0)
+        total_approved = int(row.get("total_approved") or 0)
+        total_rejected = int(row.get("total_rejected") or 0)
+        total_auto_approved = int(row.get("total_auto_approved") or 0)
+
+        return WorkflowMetrics(
+            total_pending=int(row.get("total_pending") or 0),
+            total_approved=total_approved,
+            total_rejected=total_rejected,
+            total_revision_requested=int(row.get("total_revision_requested") or 0),
+            total_auto_approved=total_auto_approved,
+            approval_rate=(total_approved / total) if total else 0.0,
+            rejection_rate=(total_rejected / total) if total else 0.0,
+            auto_approval_rate=(total_auto_approved / total) if total else 0.0,
+            avg_review_time_hours=row.get("avg_review_time_hours"),
+            median_review_time_hours=row.get("median_review_time_hours"),
+            avg_extraction_confidence=row.get("avg_extraction_confidence"),
+            avg_reviewer_confidence=None,
+            reviewer_efficiency={
+                str(reviewer): int(count)
+                for reviewer, count in (row.get("reviewer_efficiency") or {}).items()
+            },
+            period_start=period_start,
+            period_end=period_end,
+        )
+
+    def _aggregate_workflow_metrics(
+        self,
+        rows: list[Dict[str, Any]],
+        period_start: datetime,
+        period_end: datetime,
+    ) -> WorkflowMetrics:
         total_pending = sum(
             1
             for row in rows
@@ -3,9 +3,13 @@ FeedMe Embedding Pipeline
 Optimized embedding generation for Q&A pairs with multi-faceted embeddings
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
@@ -13,18 +17,35 @@ logger = logging.getLogger(__name__)
 
 
 class FeedMeEmbeddingPipeline:
-    """Optimized embedding generation for Q&A pairs"""
+    """Optimized embedding generation for Q&A pairs
+
+    All texts needed for a call (question, answer, combined, semantic) across
+    every pair are gathered, de-duplicated, looked up in a content-hash cache
+    and only the misses are encoded, in ``batch_size`` batches.
+    """
 
     # Configuration constants
     DEFAULT_CONTENT_LENGTH_NORMALIZATION_FACTOR = 100.0
+    DEFAULT_BATCH_SIZE = 64
+    DEFAULT_CACHE_SIZE = 4096
 
     def __init__(
         self,
         model_name: str = "all-MiniLM-L12-v2",
         content_length_normalization_factor: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        cache_size: Optional[int] = None,
     ):
         """Initialize embedding pipeline with specified model"""
         self.model_name = model_name
+        self.batch_size = max(1, batch_size or self.DEFAULT_BATCH_SIZE)
+        self.cache_size = (
+            self.DEFAULT_CACHE_SIZE if cache_size is None else max(0, cache_size)
+        )
+        # content hash -> normalized embedding (LRU)
+        self._embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0, "encoded": 0}
         self.dimension = 384  # Smaller, faster embeddings for production
         self.enable_semantic_optimization = False
         self.enable_quality_scoring = False
@@ -45,7 +66,11 @@ class FeedMeEmbeddingPipeline:
     async def generate_embeddings(
         self, qa_pairs: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Generate multi-faceted embeddings for Q&A pairs"""
+        """Generate multi-faceted embeddings for Q&A pairs
+
+        Pass every pair of a conversation (or of several conversations) in one
+        call so the model sees full batches.
+        """
 
         if not qa_pairs:
             return []
@@ -53,31 +78,32 @@ class FeedMeEmbeddingPipeline:
         start_time = time.time()
 
         try:
+            # Gather every text the pairs need: (pair index, field, text)
+            slots: List[Tuple[int, str, str]] = []
             for i, pair in enumerate(qa_pairs):
-                # Generate question embedding
                 question_text = pair.get("question_text", "")
                 if question_text:
-                    pair["question_embedding"] = self.model.encode(
-                        question_text, normalize_embeddings=True
-                    ).tolist()
+                    slots.append((i, "question_embedding", question_text))
 
-                # Generate answer embedding
                 answer_text = pair.get("answer_text", "")
                 if answer_text:
-                    pair["answer_embedding"] = self.model.encode(
-                        answer_text, normalize_embeddings=True
-                    ).tolist()
+                    slots.append((i, "answer_embedding", answer_text))
 
-                # Generate combined embedding with context
-                combined_text = self._build_combined_text(pair)
-                pair["combined_embedding"] = self.model.encode(
-                    combined_text, normalize_embeddings=True
-                ).tolist()
+                # Combined embedding with context
+                slots.append((i, "combined_embedding", self._build_combined_text(pair)))
 
-                # Add semantic embeddings if enabled
                 if self.enable_semantic_optimization:
-                    pair["semantic_embedding"] = self._generate_semantic_embedding(pair)
+                    slots.append(
+                        (i, "semantic_embedding", self._build_semantic_text(pair))
+                    )
 
+            vectors = await self.encode_texts([text for _, _, text in slots])
+
+            # Scatter vectors back onto their pairs
+            for (i, field, _), vector in zip(slots, vectors):
+                qa_pairs[i][field] = list(vector)
+
+            for i, pair in enumerate(qa_pairs):
                 # Add quality scoring if enabled
                 if self.enable_quality_scoring:
                     pair["embedding_quality_score"] = self._assess_embedding_quality(
@@ -106,13 +132,12 @@ class FeedMeEmbeddingPipeline:
                     pair["metadata"] = pair.get("metadata", {})
                     pair["metadata"]["domain_processed"] = True
 
-                # Add processing time for first item (approximate)
-                if i == 0:
-                    processing_time = time.time() - start_time
-                    pair["processing_time"] = processing_time
+            # Processing time is recorded on the first item (whole batch)
+            qa_pairs[0]["processing_time"] = time.time() - start_time
 
             logger.info(
-                f"Generated embeddings for {len(qa_pairs)} Q&A pairs in {time.time() - start_time:.2f}s"
+                f"Generated embeddings for {len(qa_pairs)} Q&A pairs "
+                f"({len(slots)} texts) in {time.time() - start_time:.2f}s"
             )
             return qa_pairs
 
@@ -120,6 +145,59 @@ class FeedMeEmbeddingPipeline:
             logger.error(f"Error generating embeddings: {e}")
             return qa_pairs  # Return original pairs without embeddings
 
+    async def encode_texts(self, texts: List[str]) -> List[List[float]]:
+        """Encode texts in sized batches, de-duplicated and served from cache"""
+        if not texts:
+            return []
+
+        keys = [self._content_hash(text) for text in texts]
+        resolved: Dict[str, List[float]] = {}
+        pending: Dict[str, str] = {}  # key -> text, first occurrence only
+
+        with self._cache_lock:
+            for key, text in zip(keys, texts):
+                if key in resolved or key in pending:
+                    continue
+                cached = self._embedding_cache.get(key)
+                if cached is not None:
+                    self._embedding_cache.move_to_end(key)
+                    resolved[key] = cached
+                    self.cache_stats["hits"] += 1
+                else:
+                    pending[key] = text
+                    self.cache_stats["misses"] += 1
+
+        if pending:
+            pending_keys = list(pending)
+            encoded = await asyncio.to_thread(
+                self.model.encode,
+                [pending[key] for key in pending_keys],
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+            )
+            with self._cache_lock:
+                for key, vector in zip(pending_keys, encoded):
+                    vector_list = vector.tolist()
+                    resolved[key] = vector_list
+                    self._remember(key, vector_list)
+                self.cache_stats["encoded"] += len(pending_keys)
+
+        return [resolved[key] for key in keys]
+
+    def _content_hash(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{self.model_name}\x00{text}".encode("utf-8")
+        ).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """Insert into the LRU cache; caller holds ``_cache_lock``"""
+        if self.cache_size <= 0:
+            return
+        self._embedding_cache[key] = vector
+        self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.cache_size:
+            self._embedding_cache.popitem(last=False)
+
     def _build_combined_text(self, pair: Dict[str, Any]) -> str:
         """Build combined text for context-aware embedding"""
 
@@ -143,16 +221,11 @@ class FeedMeEmbeddingPipeline:
 
         return "\n".join(combined_parts)
 
-    def _generate_semantic_embedding(self, pair: Dict[str, Any]) -> List[float]:
-        """Generate semantic-optimized embedding"""
+    def _build_semantic_text(self, pair: Dict[str, Any]) -> str:
+        """Build text for the semantic-optimized embedding"""
 
         # Extract semantic content (simplified implementation)
-        semantic_text = f"{pair.get('question_text', '')} {pair.get('answer_text', '')}"
-
-        # Process for semantic optimization
-        semantic_embedding = self.model.encode(semantic_text, normalize_embeddings=True)
-
-        return semantic_embedding.tolist()
+        return f"{pair.get('question_text', '')} {pair.get('answer_text', '')}"
 
     def _assess_embedding_quality(self, pair: Dict[str, Any]) -> float:
         """Assess quality of generated embeddings"""
@@ -8,7 +8,7 @@ Features:
 - Redis caching for performance optimization
 - Resource management and rate limiting
 - Comprehensive monitoring and metrics
-- Memory-efficient streaming processing
+- Memory-efficient streaming processing (page-at-a-time adaptive-DPI rasterization)
 - Production-grade logging and observability
 """
 
@@ -21,7 +21,7 @@ import json
 import time
 import psutil
 import gc
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime
@@ -96,6 +96,12 @@ MAX_RETRIES = int(os.getenv("FEEDME_OCR_MAX_RETRIES", "3"))
 ENABLE_CACHE = os.getenv("FEEDME_ENABLE_OCR_CACHE", "true").lower() == "true"
 MAX_MEMORY_MB = int(os.getenv("FEEDME_OCR_MAX_MEMORY_MB", "2048"))
 RATE_LIMIT_PER_MINUTE = int(os.getenv("FEEDME_OCR_RATE_LIMIT", "60"))
+# Adaptive rasterization: each page is previewed at a low DPI and re-rendered at a
+# resolution chosen from its ink/text density (dense small print needs more pixels).
+OCR_MIN_DPI = int(os.getenv("FEEDME_OCR_MIN_DPI", "150"))
+OCR_MAX_DPI = int(os.getenv("FEEDME_OCR_MAX_DPI", "300"))
+OCR_PREVIEW_DPI = int(os.getenv("FEEDME_OCR_PREVIEW_DPI", "50"))
+PAGE_RENDER_TIMEOUT_SECONDS = int(os.getenv("FEEDME_OCR_PAGE_RENDER_TIMEOUT", "60"))
 
 # Initialize Redis client with production settings
 redis_client = None
@@ -579,27 +585,12 @@ class EasyOCREngine:
                     # Fall back to OCR processing
                     logger.info("Direct extraction insufficient, falling back to OCR")
 
-                    # Convert PDF to images with timeout
-                    images = await asyncio.wait_for(
-                        self._pdf_to_images(pdf_bytes),
-                        timeout=60,  # 60 second timeout for conversion
+                    # Rasterize page-at-a-time and stream straight into the
+                    # concurrent OCR path so memory stays flat with page count
+                    page_results = await self._process_pages_concurrent(
+                        self._iter_pdf_pages(pdf_bytes)
                     )
-
-                    if len(images) > MAX_PDF_PAGES:
-                        logger.warning(
-                            f"PDF has {len(images)} pages, processing first {MAX_PDF_PAGES}"
-                        )
-                        images = images[:MAX_PDF_PAGES]
-                        if not hasattr(self, "_result_warnings"):
-                            self._result_warnings = []
-                        self._result_warnings.append(
-                            f"PDF truncated to {MAX_PDF_PAGES} pages"
-                        )
-
-                    logger.info(f"Converted PDF to {len(images)} images")
-
-                    # Process pages concurrently with progress tracking
-                    page_results = await self._process_pages_concurrent(images)
+                    logger.info(f"OCR processed {len(page_results)} pages")
 
                     # Aggregate results
                     all_text = []
@@ -709,28 +700,52 @@ class EasyOCREngine:
             return None
 
     async def _process_pages_concurrent(
-        self, images: List[np.ndarray]
+        self, pages: AsyncIterator[Tuple[int, "np.ndarray"]]
     ) -> List[Dict[str, Any]]:
-        """Process multiple pages concurrently with progress tracking"""
-        results = []
+        """Process streamed pages concurrently with progress tracking
+
+        A page is only pulled (and therefore rasterized) once a concurrency slot
+        is free, so at most ``MAX_CONCURRENT_PAGES`` page images are alive at once.
+        """
         semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        tasks: List[asyncio.Task] = []
+        completed = 0
 
-        async def process_with_semaphore(image, page_num):
-            async with semaphore:
+        async def process_and_release(image, page_num):
+            nonlocal completed
+            try:
                 return await self._process_image_ocr(image, page_num)
+            finally:
+                semaphore.release()
+                completed += 1
+                if completed % 10 == 0:
+                    logger.info(f"Processed {completed} pages")
 
-        # Create tasks for all pages
-        tasks = [
-            process_with_semaphore(image, page_num)
-            for page_num, image in enumerate(images, 1)
-        ]
+        page_iter = pages.__aiter__()
+        try:
+            while True:
+                await semaphore.acquire()
+                self.memory_manager.cleanup_if_needed()
+                try:
+                    page_num, image = await page_iter.__anext__()
+                except StopAsyncIteration:
+                    semaphore.release()
+                    break
+                except BaseException:
+                    semaphore.release()
+                    raise
+                tasks.append(asyncio.create_task(process_and_release(image, page_num)))
+                # Drop the local reference; the task owns the image until it finishes
+                del image
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            await page_iter.aclose()
 
-        # Process with progress tracking
-        for i, task in enumerate(asyncio.as_completed(tasks)):
-            result = await task
-            results.append(result)
-            if (i + 1) % 10 == 0:
-                logger.info(f"Processed {i + 1}/{len(images)} pages")
+        results = list(await asyncio.gather(*tasks))
 
         # Sort results by page number
         results.sort(key=lambda x: x["page_number"])
@@ -742,40 +757,119 @@ class EasyOCREngine:
         # For now, return the first configured language
         return self.languages[0].value if self.languages else "en"
 
-    async def _pdf_to_images(self, pdf_bytes: bytes) -> List[np.ndarray]:
-        """Convert PDF bytes to list of images"""
+    async def process_pdf_pages(
+        self, pdf_bytes: bytes, page_numbers: List[int]
+    ) -> List[Dict[str, Any]]:
+        """OCR only the given 1-based pages (e.g. pages without a text layer)"""
+        with self._monitor_resources(f"OCR of {len(page_numbers)} PDF pages"):
+            return await self._process_pages_concurrent(
+                self._iter_pdf_pages(pdf_bytes, page_numbers=page_numbers)
+            )
+
+    async def _iter_pdf_pages(
+        self, pdf_bytes: bytes, page_numbers: Optional[List[int]] = None
+    ) -> AsyncIterator[Tuple[int, "np.ndarray"]]:
+        """Yield (page_number, BGR image) one page at a time at an adaptive DPI"""
+        # Write the PDF once; pdf2image would otherwise re-spool it for every page
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
+            temp_pdf.write(pdf_bytes)
+            temp_pdf_path = temp_pdf.name
+
         try:
-            # Create temporary file for PDF
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
-                temp_pdf.write(pdf_bytes)
-                temp_pdf_path = temp_pdf.name
+            info = await asyncio.to_thread(pdf2image.pdfinfo_from_path, temp_pdf_path)
+            total_pages = int(info.get("Pages", 0))
+            if total_pages > MAX_PDF_PAGES:
+                logger.warning(
+                    f"PDF has {total_pages} pages, processing first {MAX_PDF_PAGES}"
+                )
+                if not hasattr(self, "_result_warnings"):
+                    self._result_warnings = []
+                self._result_warnings.append(f"PDF truncated to {MAX_PDF_PAGES} pages")
+                total_pages = MAX_PDF_PAGES
 
-            try:
-                # Convert PDF to images
-                pil_images = pdf2image.convert_from_path(
-                    temp_pdf_path,
-                    dpi=300,  # High DPI for better OCR accuracy
-                    fmt="RGB",
+            if page_numbers is None:
+                selected_pages = range(1, total_pages + 1)
+            else:
+                selected_pages = sorted(
+                    {p for p in page_numbers if 1 <= p <= total_pages}
                 )
 
-                # Convert PIL images to numpy arrays for EasyOCR
-                images = []
-                for pil_img in pil_images:
-                    # Convert to numpy array
-                    img_array = np.array(pil_img)
-                    # Convert RGB to BGR for OpenCV compatibility
-                    img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-                    images.append(img_bgr)
+            for page_num in selected_pages:
+                try:
+                    image = await asyncio.wait_for(
+                        asyncio.to_thread(self._render_page, temp_pdf_path, page_num),
+                        timeout=PAGE_RENDER_TIMEOUT_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    logger.error(f"Rasterization timeout for page {page_num}")
+                    continue
+                if image is None:
+                    continue
+                yield page_num, image
+                del image
+        except Exception as e:
+            logger.error(f"PDF to image conversion failed: {e}")
+            raise
+        finally:
+            # Clean up temporary file
+            os.unlink(temp_pdf_path)
+
+    def _render_page(self, pdf_path: str, page_num: int) -> Optional["np.ndarray"]:
+        """Rasterize a single page at the DPI chosen from its text density"""
+        dpi = self._choose_page_dpi(pdf_path, page_num)
+        try:
+            pil_images = pdf2image.convert_from_path(
+                pdf_path, dpi=dpi, fmt="RGB", first_page=page_num, last_page=page_num
+            )
+        except Exception as e:
+            logger.error(f"Failed to rasterize page {page_num}: {e}")
+            return None
+        if not pil_images:
+            return None
 
-                return images
+        pil_img = pil_images[0]
+        try:
+            # Convert RGB to BGR for OpenCV compatibility
+            return cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
+        finally:
+            pil_img.close()
 
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_pdf_path)
+    def _choose_page_dpi(self, pdf_path: str, page_num: int) -> int:
+        """Pick a render DPI from a low-resolution preview of the page
 
+        Dense pages (small print, tables, logs) get the maximum DPI; sparse pages
+        with little ink are rendered lower since extra pixels add cost, not accuracy.
+        """
+        if self.quality in (ProcessingQuality.HIGH, ProcessingQuality.ULTRA):
+            return OCR_MAX_DPI
+        try:
+            preview = pdf2image.convert_from_path(
+                pdf_path,
+                dpi=OCR_PREVIEW_DPI,
+                grayscale=True,
+                first_page=page_num,
+                last_page=page_num,
+            )
         except Exception as e:
-            logger.error(f"PDF to image conversion failed: {e}")
-            raise
+            logger.debug(f"DPI preview failed for page {page_num}: {e}")
+            return OCR_MAX_DPI
+        if not preview:
+            return OCR_MAX_DPI
+
+        try:
+            ink_ratio = float((np.asarray(preview[0]) < 128).mean())
+        finally:
+            preview[0].close()
+
+        if ink_ratio >= 0.08:
+            dpi = OCR_MAX_DPI
+        elif ink_ratio >= 0.02:
+            dpi = (OCR_MIN_DPI + OCR_MAX_DPI) // 2
+        else:
+            dpi = OCR_MIN_DPI
+        if self.quality == ProcessingQuality.FAST:
+            dpi = min(dpi, (OCR_MIN_DPI + OCR_MAX_DPI) // 2)
+        return dpi
 
     async def _process_image_ocr(
         self, image: np.ndarray, page_num: int
@@ -9,9 +9,17 @@ Integrates with EasyOCR for comprehensive text extraction.
 
 import asyncio
 import logging
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import pdfplumber
@@ -20,6 +28,65 @@ import io
 
 logger = logging.getLogger(__name__)
 
+# Page-range sharding for CPU-bound pdfplumber extraction
+PDF_PARSE_WORKERS = int(
+    os.getenv("FEEDME_PDF_PARSE_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PDF_PARSE_PAGES_PER_SHARD = int(os.getenv("FEEDME_PDF_PARSE_PAGES_PER_SHARD", "25"))
+# Overall deadline for the parallel extraction before falling back to serial
+PDF_PARSE_TIMEOUT_SEC = float(os.getenv("FEEDME_PDF_PARSE_TIMEOUT_SEC", "120"))
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_workers = 0
+_parse_pool_lock = threading.Lock()
+
+
+def _parse_pool_context():
+    # The pool is created from worker threads of a multithreaded server; a
+    # forked child could inherit locks held by other threads (logging, HTTP
+    # clients) and deadlock, so workers start from a clean interpreter.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _get_parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared page-extraction process pool, resizing it if needed"""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is None or _parse_pool_workers != max_workers:
+            if _parse_pool is not None:
+                _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_parse_pool_context()
+            )
+            _parse_pool_workers = max_workers
+        return _parse_pool
+
+
+def _reset_parse_pool(terminate: bool = False) -> None:
+    """Drop the shared pool; ``terminate`` also kills workers that are stuck"""
+    global _parse_pool, _parse_pool_workers
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            processes = list((getattr(_parse_pool, "_processes", None) or {}).values())
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            if terminate:
+                for process in processes:
+                    process.terminate()
+        _parse_pool = None
+        _parse_pool_workers = 0
+
+
+def _extract_page_range_worker(
+    pdf_path: str, first_page: int, last_page: int
+) -> List["PageContent"]:
+    """Process-pool entry point: extract pages [first_page, last_page] (1-based)"""
+    parser = EnhancedPDFParser(enable_ocr=False)
+    with pdfplumber.open(pdf_path) as pdf:
+        return parser._extract_page_range(pdf, first_page, last_page)
+
+
 # Import the new OCR engine
 try:
     from app.feedme.ocr import OCRResult, create_ocr_engine
@@ -117,7 +184,7 @@ class PDFParseResult:
     error_message: Optional[str] = None
     warnings: List[str] = None
     extraction_method: Optional[str] = (
-        None  # Added: Track extraction method (direct, ocr_fallback)
+        None  # Added: Track extraction method (direct, direct_with_ocr_pages, ocr_fallback)
     )
     quality_metrics: Optional[Dict[str, float]] = (
         None  # Added: Quality metrics from OCR
@@ -172,9 +239,15 @@ class EnhancedPDFParser(PDFParser):
         enable_ocr: bool = True,
         ocr_quality: str = "balanced",
         ocr_languages: List[str] = None,
+        parse_workers: Optional[int] = None,
+        pages_per_shard: Optional[int] = None,
     ):
         super().__init__(max_pages, timeout_seconds)
 
+        # Parallel direct extraction (page-range shards across a process pool)
+        self.parse_workers = max(1, parse_workers or PDF_PARSE_WORKERS)
+        self.pages_per_shard = max(1, pages_per_shard or PDF_PARSE_PAGES_PER_SHARD)
+
         # OCR configuration
         self.enable_ocr = enable_ocr and OCR_AVAILABLE
         self.ocr_engine = None
@@ -577,6 +650,21 @@ class EnhancedPDFParser(PDFParser):
                 timeout=self.timeout_seconds,
             )
 
+            # Pages with no text layer are OCR'd individually; the rest keep
+            # their direct text
+            missing_pages = [
+                p.page_number for p in direct_result.pages if not p.char_count
+            ]
+            if (
+                missing_pages
+                and len(missing_pages) < len(direct_result.pages)
+                and self.enable_ocr
+                and self.ocr_engine
+            ):
+                direct_result = await self._fill_pages_with_ocr(
+                    file_content, direct_result, missing_pages
+                )
+
             # Check if direct extraction was successful
             is_extraction_successful = self._assess_extraction_quality(direct_result)
 
@@ -617,7 +705,7 @@ class EnhancedPDFParser(PDFParser):
             # Step 3: Return direct result with warnings if OCR is not available or failed
             processing_time_ms = (asyncio.get_event_loop().time() - start_time) * 1000
             direct_result.processing_time_ms = processing_time_ms
-            direct_result.warnings.extend(warnings)
+            direct_result.warnings = (direct_result.warnings or []) + warnings
 
             if not is_extraction_successful:
                 direct_result.warnings.append(
@@ -642,46 +730,117 @@ class EnhancedPDFParser(PDFParser):
     def _parse_pdf_sync(self, file_content: bytes) -> PDFParseResult:
         """Synchronous PDF parsing implementation"""
         warnings = []
-        pages = []
 
         # Extract metadata using pypdf
         metadata = self._extract_metadata(file_content)
 
         # Extract text using pdfplumber for better accuracy
         try:
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                # Limit pages to prevent memory issues
-                num_pages = min(len(pdf.pages), self.max_pages)
-                if len(pdf.pages) > self.max_pages:
-                    warnings.append(
-                        f"PDF has {len(pdf.pages)} pages, processing first {self.max_pages}"
-                    )
-
-                metadata.pages = len(pdf.pages)
-
-                # Extract text from each page
-                for i, page in enumerate(pdf.pages[:num_pages], 1):
-                    page_content = self._extract_page_content(page, i)
-                    pages.append(page_content)
-
-                # Combine all text
-                total_text = "\n\n".join(p.text for p in pages if p.text)
-                total_chars = sum(p.char_count for p in pages)
-
-                return PDFParseResult(
-                    success=True,
-                    pages=pages,
-                    metadata=metadata,
-                    total_text=total_text,
-                    total_chars=total_chars,
-                    processing_time_ms=0,  # Will be set by async wrapper
-                    warnings=warnings if warnings else None,
-                    extraction_method="direct",  # Mark as direct extraction
+            if not metadata.pages:
+                with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+                    metadata.pages = len(pdf.pages)
+
+            # Limit pages to prevent memory issues
+            num_pages = min(metadata.pages, self.max_pages)
+            if metadata.pages > self.max_pages:
+                warnings.append(
+                    f"PDF has {metadata.pages} pages, processing first {self.max_pages}"
                 )
 
+            shards = self._plan_page_shards(num_pages)
+            pages = None
+            if len(shards) > 1 and self._can_use_process_pool():
+                pages = self._extract_pages_parallel(file_content, shards)
+            if pages is None:
+                with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+                    pages = self._extract_page_range(pdf, 1, num_pages)
+
+            # Combine all text
+            total_text = "\n\n".join(p.text for p in pages if p.text)
+            total_chars = sum(p.char_count for p in pages)
+
+            return PDFParseResult(
+                success=True,
+                pages=pages,
+                metadata=metadata,
+                total_text=total_text,
+                total_chars=total_chars,
+                processing_time_ms=0,  # Will be set by async wrapper
+                warnings=warnings if warnings else None,
+                extraction_method="direct",  # Mark as direct extraction
+            )
+
         except Exception as e:
             raise Exception(f"Failed to extract text: {str(e)}")
 
+    def _extract_page_range(
+        self, pdf, first_page: int, last_page: int
+    ) -> List[PageContent]:
+        """Extract pages [first_page, last_page] (1-based) from an open document"""
+        return [
+            self._extract_page_content(page, i)
+            for i, page in enumerate(pdf.pages[first_page - 1 : last_page], first_page)
+        ]
+
+    def _plan_page_shards(self, num_pages: int) -> List[Tuple[int, int]]:
+        """Split pages into contiguous 1-based ranges for the process pool"""
+        if self.parse_workers <= 1 or num_pages <= self.pages_per_shard:
+            return [(1, num_pages)] if num_pages else []
+        return [
+            (start, min(start + self.pages_per_shard - 1, num_pages))
+            for start in range(1, num_pages + 1, self.pages_per_shard)
+        ]
+
+    @staticmethod
+    def _can_use_process_pool() -> bool:
+        # Daemonic processes (e.g. Celery prefork children) cannot spawn children
+        return not multiprocessing.current_process().daemon
+
+    def _extract_pages_parallel(
+        self, file_content: bytes, shards: List[Tuple[int, int]]
+    ) -> Optional[List[PageContent]]:
+        """
+        Extract page shards across the process pool.
+
+        Shards are reassembled in page order regardless of completion order.
+        Returns None if the pool is unavailable so the caller parses serially.
+        """
+        # Workers open the document from disk rather than receiving the bytes
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
+            temp_pdf.write(file_content)
+            temp_pdf_path = temp_pdf.name
+
+        try:
+            pool = _get_parse_pool(self.parse_workers)
+            futures = [
+                pool.submit(_extract_page_range_worker, temp_pdf_path, first, last)
+                for first, last in shards
+            ]
+            deadline = time.monotonic() + PDF_PARSE_TIMEOUT_SEC
+            pages: List[PageContent] = []
+            for future in futures:
+                pages.extend(
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                )
+            logger.info(
+                f"Parsed {len(pages)} pages in {len(shards)} shards "
+                f"across {self.parse_workers} workers"
+            )
+            return pages
+        except FuturesTimeoutError:
+            logger.warning(
+                f"Parallel PDF parsing exceeded {PDF_PARSE_TIMEOUT_SEC}s, "
+                "parsing serially"
+            )
+            _reset_parse_pool(terminate=True)
+            return None
+        except (BrokenProcessPool, OSError, RuntimeError) as e:
+            logger.warning(f"Parallel PDF parsing unavailable, parsing serially: {e}")
+            _reset_parse_pool()
+            return None
+        finally:
+            os.unlink(temp_pdf_path)
+
     def _extract_metadata(self, file_content: bytes) -> PDFMetadata:
         """Extract metadata from PDF using pypdf"""
         metadata = PDFMetadata()
@@ -943,6 +1102,68 @@ class EnhancedPDFParser(PDFParser):
                 success=False,
             )
 
+    async def _fill_pages_with_ocr(
+        self,
+        pdf_bytes: bytes,
+        direct_result: PDFParseResult,
+        page_numbers: List[int],
+    ) -> PDFParseResult:
+        """
+        OCR only the pages that have no text layer and merge them into the result
+
+        Args:
+            pdf_bytes: PDF file content
+            direct_result: Result from direct PDF parsing
+            page_numbers: 1-based page numbers without extractable text
+
+        Returns:
+            PDFParseResult with OCR text substituted for the missing pages
+        """
+        try:
+            page_results = await self.ocr_engine.process_pdf_pages(
+                pdf_bytes, page_numbers
+            )
+        except Exception as e:
+            logger.warning(f"Per-page OCR failed: {e}")
+            return direct_result
+
+        ocr_text = {
+            r["page_number"]: r.get("text", "")
+            for r in page_results
+            if r.get("text", "").strip()
+        }
+        if not ocr_text:
+            return direct_result
+
+        pages = [
+            (
+                PageContent(
+                    page_number=page.page_number,
+                    text=ocr_text[page.page_number],
+                    char_count=len(ocr_text[page.page_number]),
+                )
+                if page.page_number in ocr_text
+                else page
+            )
+            for page in direct_result.pages
+        ]
+        warnings = list(direct_result.warnings or [])
+        warnings.append(
+            f"{len(ocr_text)} page(s) without a text layer extracted via OCR"
+        )
+
+        total_text = "\n\n".join(p.text for p in pages if p.text)
+        return PDFParseResult(
+            success=True,
+            pages=pages,
+            metadata=direct_result.metadata,
+            total_text=total_text,
+            total_chars=sum(p.char_count for p in pages),
+            processing_time_ms=direct_result.processing_time_ms,
+            warnings=warnings,
+            extraction_method="direct_with_ocr_pages",
+        )
+
     def _combine_ocr_with_metadata(
         self, ocr_result: OCRResult, direct_result: PDFParseResult
     ) -> PDFParseResult:
@@ -972,7 +1193,7 @@ class EnhancedPDFParser(PDFParser):
         enhanced_metadata.encrypted = False  # OCR was successful, so PDF is accessible
 
         # Add OCR-specific warnings
-        warnings = direct_result.warnings.copy()
+        warnings = list(direct_result.warnings or [])
         warnings.append(
             f"Text extracted via OCR (confidence: {ocr_result.confidence_score:.2f})"
         )
@@ -12,8 +12,11 @@ Budget controls:
 - Bucket-based rate limiting via models.yaml
 
 Memory optimization:
-- Pages are streamed in batches instead of loading all at once
+- Pages are rendered per chunk by a producer feeding a bounded queue, so
+  rendering overlaps in-flight model calls and peak memory is capped by
+  concurrency + prefetch rather than page count
 - Explicit cleanup of image buffers after processing
+- Partial Markdown is surfaced via an optional progress callback
 
 Note: This module is best-effort and aims to stay within free-tier quotas.
 """
@@ -25,7 +28,7 @@ import base64
 import gc
 import io
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pdf2image import convert_from_bytes
 from PIL import Image
@@ -59,6 +62,10 @@ FALLBACK_FEEDME_MODEL_ID = "gemini-2.5-flash-preview-09-2025"
 _genai_client = None
 _genai_client_api_key: Optional[str] = None
 
+# (partial_markdown, progress) callback invoked as chunks complete in page order.
+# It runs in a worker thread, so it may block (e.g. write to the database).
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
 
 def _to_jpeg_bytes(img: Image.Image, width: int = 1024, quality: int = 80) -> bytes:
     """Convert PIL Image to JPEG bytes with explicit resource cleanup."""
@@ -204,21 +211,96 @@ def _generate_content(model_name: str, parts: List[Any]) -> str:
         return text or ""
 
 
+def _count_pdf_pages(pdf_bytes: bytes) -> int:
+    """Return the page count without rasterizing the document."""
+    # Try pypdf first for efficiency, fallback to pdf2image
+    try:
+        from pypdf import PdfReader
+
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        total_pages = len(reader.pages)
+        del reader  # Release reader
+        return total_pages
+    except Exception:
+        # Fallback: load first page to validate PDF and estimate
+        try:
+            test_images = convert_from_bytes(
+                pdf_bytes, dpi=72, first_page=1, last_page=1
+            )
+            for img in test_images:
+                img.close()
+            del test_images
+            return 1  # We'll discover more as we go
+        except Exception as e:
+            logger.error(f"Failed to read PDF: {e}")
+            raise ValueError(f"Invalid PDF: {e}")
+
+
+def _render_page_range(
+    pdf_bytes: bytes, first_page: int, last_page: int
+) -> List[Dict[str, Any]]:
+    """Render a contiguous page range to JPEG image parts (runs in a worker thread)."""
+    try:
+        batch_images = convert_from_bytes(
+            pdf_bytes, dpi=144, first_page=first_page, last_page=last_page
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load pages {first_page}-{last_page}: {e}")
+        return []
+
+    jpeg_parts: List[Dict[str, Any]] = []
+    for i, img in enumerate(batch_images):
+        try:
+            jpeg_parts.append(_mk_image_part(_to_jpeg_bytes(img)))
+        except Exception as e:
+            logger.warning(f"Failed to convert page {first_page + i} to JPEG: {e}")
+        finally:
+            # Explicitly close image to release memory immediately
+            img.close()
+    del batch_images
+    return jpeg_parts
+
+
+async def _agenerate_content(model_name: str, parts: List[Any]) -> str:
+    """Run the blocking SDK call off the event loop so chunks can overlap."""
+    return await asyncio.to_thread(_generate_content, model_name, parts)
+
+
 def process_pdf_to_markdown(
     pdf_bytes: bytes,
     *,
     max_pages: Optional[int] = None,
     pages_per_call: Optional[int] = None,
     api_key: Optional[str] = None,
+    max_concurrent_calls: Optional[int] = None,
+    render_prefetch: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
 ) -> Tuple[str, Dict[str, Any]]:
     """
     Render PDF → images → Gemini calls → Markdown.
 
+    Pages are rendered one chunk at a time by a producer and handed to a bounded
+    queue; up to ``max_concurrent_calls`` model calls run while the next chunks
+    render, so at most ``max_concurrent_calls + render_prefetch`` chunks of
+    images are alive at once regardless of document length.
+
+    ``on_progress`` (optional) is called with the Markdown of the contiguous
+    prefix of completed chunks and a progress dict every time a chunk finishes.
+    Calls run one at a time, in order, in a worker thread.
+
+    If the rate limit is hit, only the contiguous prefix of completed chunks
+    is kept, so the Markdown never skips page ranges; ``pages_processed``
+    reports the pages actually extracted.
+
     Returns (markdown, info) where info contains pages_processed, total_pages,
     truncated, calls_used, and any warnings.
     """
     max_pages = max_pages or settings.feedme_ai_max_pages
     pages_per_call = pages_per_call or settings.feedme_ai_pages_per_call
+    max_concurrent_calls = max(
+        1, max_concurrent_calls or settings.feedme_ai_max_concurrent_calls
+    )
+    render_prefetch = max(1, render_prefetch or settings.feedme_ai_render_prefetch)
     if not api_key:
         if not settings.gemini_api_key:
             raise ValueError("No Gemini API key available")
@@ -227,92 +309,81 @@ def process_pdf_to_markdown(
     model_name = _ensure_model(api_key)
     model_candidates = _resolve_model_candidates(model_name)
     logger.info(
-        "FeedMe PDF extraction using Gemini models %s (sdk=%s, max_pages=%s, pages_per_call=%s)",
+        "FeedMe PDF extraction using Gemini models %s (sdk=%s, max_pages=%s, pages_per_call=%s, concurrency=%s)",
         model_candidates,
         GENAI_SDK,
         max_pages,
         pages_per_call,
+        max_concurrent_calls,
     )
-    limiter = get_rate_limiter()
-    rate_limit_loop = asyncio.new_event_loop()
-
-    # Get page count without loading all images into memory
-    # Try pypdf first for efficiency, fallback to pdf2image
-    try:
-        from pypdf import PdfReader
-
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        total_pages = len(reader.pages)
-        del reader  # Release reader
-    except Exception:
-        # Fallback: load first page to validate PDF and estimate
-        try:
-            test_images = convert_from_bytes(
-                pdf_bytes, dpi=72, first_page=1, last_page=1
-            )
-            total_pages = 1  # We'll discover more as we go
-            for img in test_images:
-                img.close()
-            del test_images
-        except Exception as e:
-            logger.error(f"Failed to read PDF: {e}")
-            raise ValueError(f"Invalid PDF: {e}")
 
+    total_pages = _count_pdf_pages(pdf_bytes)
     use_pages = min(total_pages, max_pages)
     truncated = total_pages > use_pages
 
-    # Stream pages in batches to reduce peak memory usage
-    # Instead of loading all pages at once, load only pages_per_call at a time
-    jpeg_parts: List[Dict[str, Any]] = []
-    for batch_start in range(1, use_pages + 1, pages_per_call):
-        batch_end = min(batch_start + pages_per_call - 1, use_pages)
-
-        # Load only the pages needed for this batch
-        try:
-            batch_images = convert_from_bytes(
-                pdf_bytes, dpi=144, first_page=batch_start, last_page=batch_end
+    rate_limit_loop = asyncio.new_event_loop()
+    try:
+        return rate_limit_loop.run_until_complete(
+            _run_extraction_pipeline(
+                pdf_bytes,
+                use_pages=use_pages,
+                total_pages=total_pages,
+                truncated=truncated,
+                pages_per_call=pages_per_call,
+                model_candidates=model_candidates,
+                max_concurrent_calls=max_concurrent_calls,
+                render_prefetch=render_prefetch,
+                on_progress=on_progress,
             )
-        except Exception as e:
-            logger.warning(f"Failed to load pages {batch_start}-{batch_end}: {e}")
-            continue
-
-        for i, img in enumerate(batch_images):
-            try:
-                jpeg = _to_jpeg_bytes(img)
-                jpeg_parts.append(_mk_image_part(jpeg))
-            except Exception as e:
-                logger.warning(f"Failed to convert page {batch_start + i} to JPEG: {e}")
-            finally:
-                # Explicitly close image to release memory immediately
-                img.close()
-
-        # Clear batch and trigger garbage collection
-        del batch_images
+        )
+    finally:
+        rate_limit_loop.close()
         gc.collect()
 
-    # Group jpeg_parts into chunks for API calls
-    chunks: List[List[Dict[str, Any]]] = []
-    for i in range(0, len(jpeg_parts), pages_per_call):
-        chunks.append(jpeg_parts[i : i + pages_per_call])
 
+async def _run_extraction_pipeline(
+    pdf_bytes: bytes,
+    *,
+    use_pages: int,
+    total_pages: int,
+    truncated: bool,
+    pages_per_call: int,
+    model_candidates: List[str],
+    max_concurrent_calls: int,
+    render_prefetch: int,
+    on_progress: Optional[ProgressCallback],
+) -> Tuple[str, Dict[str, Any]]:
+    limiter = get_rate_limiter()
     prompt = _default_prompt()
-    md_segments: List[str] = []
-    calls_used = 0
     model_usage: dict[str, int] = {candidate: 0 for candidate in model_candidates}
     limiter_fail_open = False
 
-    def run_with_limit_or_fail_open(model_candidate: str, model_parts: List[Any]) -> str:
+    page_ranges: List[Tuple[int, int]] = [
+        (start, min(start + pages_per_call - 1, use_pages))
+        for start in range(1, use_pages + 1, pages_per_call)
+    ]
+    total_chunks = len(page_ranges)
+    md_segments: List[Optional[str]] = [None] * total_chunks
+    calls_used = 0
+    emitted_prefix = 0
+    progress_lock = asyncio.Lock()
+    rate_limited = asyncio.Event()
+    # Bounded hand-off between the renderer and the model workers caps how many
+    # rendered chunks can be waiting in memory at any time.
+    queue: asyncio.Queue = asyncio.Queue(maxsize=render_prefetch)
+
+    async def run_with_limit_or_fail_open(
+        model_candidate: str, model_parts: List[Any]
+    ) -> str:
         nonlocal limiter_fail_open
         if limiter_fail_open:
-            return _generate_content(model_candidate, model_parts)
+            return await _agenerate_content(model_candidate, model_parts)
         try:
-            return rate_limit_loop.run_until_complete(
-                limiter.execute_with_protection(
-                    "internal.feedme",
-                    _generate_content,
-                    model_candidate,
-                    model_parts,
-                )
+            return await limiter.execute_with_protection(
+                "internal.feedme",
+                _agenerate_content,
+                model_candidate,
+                model_parts,
             )
         except RateLimitExceededException:
             raise
@@ -330,60 +401,132 @@ def process_pdf_to_markdown(
                     "FeedMe extraction rate limiter unavailable; failing open for remaining calls: %s",
                     exc,
                 )
-                return _generate_content(model_candidate, model_parts)
+                return await _agenerate_content(model_candidate, model_parts)
             raise
 
-    for idx, chunk in enumerate(chunks):
+    def completed_prefix() -> int:
+        prefix = 0
+        while prefix < total_chunks and md_segments[prefix] is not None:
+            prefix += 1
+        return prefix
+
+    async def emit_progress() -> None:
+        nonlocal emitted_prefix
+        if on_progress is None:
+            return
+        # The lock keeps reports ordered; the callback runs off the loop since
+        # it typically blocks on the database.
+        async with progress_lock:
+            prefix = completed_prefix()
+            if prefix <= emitted_prefix:
+                return
+            emitted_prefix = prefix
+            partial = "\n\n".join(
+                s.strip() for s in md_segments[:prefix] if s and s.strip()
+            )
+            try:
+                await asyncio.to_thread(
+                    on_progress,
+                    partial,
+                    {
+                        "chunks_completed": prefix,
+                        "total_chunks": total_chunks,
+                        "pages_completed": page_ranges[prefix - 1][1],
+                        "pages_total": use_pages,
+                    },
+                )
+            except Exception as exc:  # pragma: no cover - progress is best-effort
+                logger.debug("FeedMe extraction progress callback failed: %s", exc)
+
+    async def produce() -> None:
         try:
-            parts = [prompt] + chunk
-            text = ""
-            last_error: Exception | None = None
-            for model_candidate in model_candidates:
-                try:
-                    text = run_with_limit_or_fail_open(model_candidate, parts)
-                    model_usage[model_candidate] = (
-                        model_usage.get(model_candidate, 0) + 1
-                    )
+            for idx, (first_page, last_page) in enumerate(page_ranges):
+                if rate_limited.is_set():
                     break
-                except RateLimitExceededException:
-                    raise
-                except Exception as model_error:
-                    last_error = model_error
-                    logger.warning(
-                        "FeedMe extraction model failed (model=%s chunk=%s/%s): %s",
-                        model_candidate,
-                        idx + 1,
-                        len(chunks),
-                        model_error,
-                    )
-            if not text and last_error is not None:
-                raise last_error
-            md_segments.append(text or "")
-            calls_used += 1
-        except RateLimitExceededException as exc:
-            logger.warning("Gemini feedme rate limit reached: %s", exc)
-            break
-        except Exception as e:
-            logger.error(
-                "Gemini extraction failed on chunk %s/%s after fallback attempts: %s",
-                idx + 1,
-                len(chunks),
-                e,
-            )
-            md_segments.append("\n> [Extraction failed for this chunk]\n")
+                parts = await asyncio.to_thread(
+                    _render_page_range, pdf_bytes, first_page, last_page
+                )
+                await queue.put((idx, parts))
+        finally:
+            for _ in range(max_concurrent_calls):
+                await queue.put(None)
+
+    async def consume() -> None:
+        nonlocal calls_used
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            idx, chunk = item
+            if rate_limited.is_set():
+                continue
+            if not chunk:
+                # Rendering failed for every page in this range; skip the call.
+                md_segments[idx] = ""
+                await emit_progress()
+                continue
+            try:
+                parts = [prompt] + chunk
+                text = ""
+                last_error: Exception | None = None
+                for model_candidate in model_candidates:
+                    try:
+                        text = await run_with_limit_or_fail_open(model_candidate, parts)
+                        model_usage[model_candidate] = (
+                            model_usage.get(model_candidate, 0) + 1
+                        )
+                        break
+                    except RateLimitExceededException:
+                        raise
+                    except Exception as model_error:
+                        last_error = model_error
+                        logger.warning(
+                            "FeedMe extraction model failed (model=%s chunk=%s/%s): %s",
+                            model_candidate,
+                            idx + 1,
+                            total_chunks,
+                            model_error,
+                        )
+                if not text and last_error is not None:
+                    raise last_error
+                md_segments[idx] = text or ""
+                calls_used += 1
+            except RateLimitExceededException as exc:
+                logger.warning("Gemini feedme rate limit reached: %s", exc)
+                rate_limited.set()
+                continue
+            except Exception as e:
+                logger.error(
+                    "Gemini extraction failed on chunk %s/%s after fallback attempts: %s",
+                    idx + 1,
+                    total_chunks,
+                    e,
+                )
+                md_segments[idx] = "\n> [Extraction failed for this chunk]\n"
+            finally:
+                # Drop image payloads as soon as the call completes.
+                del chunk
+            await emit_progress()
+
+    await asyncio.gather(produce(), *(consume() for _ in range(max_concurrent_calls)))
 
-    # Concatenate segments
-    concatenated = "\n\n".join(s.strip() for s in md_segments if s and s.strip())
+    # Chunks skipped after a rate limit are None. Chunks already in flight may
+    # still have finished after a gap; keep only the contiguous prefix so the
+    # document does not silently skip page ranges.
+    prefix = completed_prefix()
+    completed_segments = md_segments[:prefix]
+    pages_extracted = page_ranges[prefix - 1][1] if prefix else 0
+    concatenated = "\n\n".join(s.strip() for s in completed_segments if s and s.strip())
 
     # Optional: final micro-merge if more than 1 segment and non-empty
-    if len(md_segments) > 1 and concatenated:
+    if len(completed_segments) > 1 and concatenated:
         try:
             merge_prompt = _final_merge_prompt()
             final_text = ""
             last_error: Exception | None = None
             for model_candidate in model_candidates:
                 try:
-                    final_text = run_with_limit_or_fail_open(
+                    final_text = await run_with_limit_or_fail_open(
                         model_candidate,
                         [merge_prompt, concatenated],
                     )
@@ -410,16 +553,25 @@ def process_pdf_to_markdown(
             logger.warning(f"Gemini final merge failed, using concatenated: {e}")
 
     info: Dict[str, Any] = {
-        "pages_processed": use_pages,
+        "pages_processed": pages_extracted,
         "total_pages": total_pages,
         "truncated": truncated,
-        "calls_used": calls_used + (1 if len(md_segments) > 1 else 0),
+        "calls_used": calls_used + (1 if len(completed_segments) > 1 else 0),
         "models_attempted": model_candidates,
         "model_usage": model_usage,
-        "warnings": ["Extraction truncated to page budget" if truncated else None],
+        "chunks_completed": len(completed_segments),
+        "total_chunks": total_chunks,
+        "warnings": [
+            "Extraction truncated to page budget" if truncated else None,
+            (
+                f"Extraction stopped early due to rate limiting after page "
+                f"{pages_extracted} of {use_pages}"
+                if pages_extracted < use_pages
+                else None
+            ),
+        ],
     }
     # strip None warnings
     info["warnings"] = [w for w in info["warnings"] if w]
-    rate_limit_loop.close()
 
     return concatenated or "", info
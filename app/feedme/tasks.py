@@ -466,11 +466,31 @@ def process_transcript(
                         message="Running AI extraction",
                     )
 
+                    def _report_extraction_progress(
+                        _partial_markdown: str, progress_info: Dict[str, Any]
+                    ) -> None:
+                        total_chunks = progress_info.get("total_chunks") or 1
+                        done = progress_info.get("chunks_completed", 0)
+                        update_conversation_status(
+                            conversation_id,
+                            ProcessingStatus.PROCESSING,
+                            stage=ProcessingStage.AI_EXTRACTION,
+                            # AI extraction spans the 40-80% progress window.
+                            progress=40 + int(40 * done / total_chunks),
+                            message=(
+                                f"Extracted {progress_info.get('pages_completed', 0)}"
+                                f"/{progress_info.get('pages_total', 0)} pages"
+                            ),
+                        )
+
                     markdown_text, extraction_info = process_pdf_to_markdown(
                         pdf_bytes,
                         max_pages=current_settings().feedme_ai_max_pages,
                         pages_per_call=current_settings().feedme_ai_pages_per_call,
                         api_key=user_api_key or current_settings().gemini_api_key,
+                        max_concurrent_calls=current_settings().feedme_ai_max_concurrent_calls,
+                        render_prefetch=current_settings().feedme_ai_render_prefetch,
+                        on_progress=_report_extraction_progress,
                     )
 
                     if markdown_text:
@@ -8,12 +8,20 @@ for FeedMe processing and approval workflows.
 import asyncio
 import logging
 import json
-from datetime import datetime, timedelta
-from typing import Awaitable, Dict, List, Optional, Any, TypeVar, cast
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Awaitable, Dict, List, Optional, Any, Tuple, TypeVar, cast
 
 from fastapi import WebSocket, WebSocketDisconnect
+import redis as redis_sync
 import redis.asyncio as redis
 
+from app.core.settings import settings
+from app.feedme.schemas import ProcessingStatus
+
 from .schemas import (
     ConnectionInfo,
     ProcessingUpdate,
@@ -30,6 +38,44 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+ROOM_CHANNEL_PREFIX = "feedme:ws:room:"
+PUBSUB_ENABLED = os.getenv("FEEDME_WS_PUBSUB_ENABLED", "true").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# Offline-user message queues go to Redis only when explicitly enabled; the
+# Redis URL alone turns on cross-worker pub/sub.
+PERSIST_ENABLED = os.getenv("FEEDME_WS_PERSIST_ENABLED", "false").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+PROGRESS_COALESCE_SECONDS = (
+    int(os.getenv("FEEDME_WS_PROGRESS_COALESCE_MS", "250")) / 1000.0
+)
+# Coalescing slots idle this long are forgotten (errored/abandoned jobs never
+# send the final status that would otherwise clear them).
+PROGRESS_SLOT_TTL_SECONDS = 600.0
+PUBLISH_RETRY_BACKOFF_SECONDS = 30.0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def encode_message(message: Dict[str, Any]) -> str:
+    """Serialize a message once for delivery to every socket (and Redis)."""
+    return json.dumps(
+        message, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    )
+
 
 class WebSocketRoom:
     """
@@ -101,9 +147,18 @@ class FeedMeRealtimeManager:
 
     Handles connection management, room-based broadcasting, and message queuing.
     Features Redis-backed persistence with graceful fallback to in-memory storage.
+
+    With Redis enabled, broadcasts are also published on a per-room channel
+    and every worker delivers them to its own sockets, so updates reach users
+    regardless of which worker (or Celery process) produced them.
     """
 
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        pubsub_enabled: bool = True,
+        persist_enabled: bool = True,
+    ):
         # Room management
         self.rooms: Dict[str, WebSocketRoom] = {}
         self.connection_to_room: Dict[WebSocket, str] = {}
@@ -122,12 +177,36 @@ class FeedMeRealtimeManager:
             try:
                 self.redis_client = redis.from_url(redis_url)
                 self.redis_enabled = True
-                logger.info("Redis enabled for WebSocket persistence")
+                logger.info("Redis enabled for WebSocket manager")
             except Exception as e:
                 logger.warning(
                     f"Failed to connect to Redis: {e}. Using in-memory storage only."
                 )
 
+        # Offline message queues persisted to Redis
+        self.persist_enabled = self.redis_enabled and persist_enabled
+
+        # Cross-worker fan-out over Redis pub/sub
+        self.instance_id = uuid.uuid4().hex
+        self.pubsub_enabled = self.redis_enabled and pubsub_enabled
+        self._redis_url = redis_url
+        self._publisher: Optional[redis_sync.Redis] = None
+        self._publish_disabled_until = 0.0
+        self._pubsub: Optional[Any] = None
+        self._pubsub_client: Optional[redis.Redis] = None
+        self._pubsub_lock = asyncio.Lock()
+        self._subscribed_rooms: set[str] = set()
+        self.pubsub_task: Optional[asyncio.Task] = None
+
+        # Progress coalescing: (room_id, key) -> pending payload / last send
+        self.progress_coalesce_seconds = PROGRESS_COALESCE_SECONDS
+        self._pending_progress: Dict[
+            Tuple[str, str], Tuple[str, Optional[str], List[str]]
+        ] = {}
+        self._progress_last_sent: Dict[Tuple[str, str], float] = {}
+        self._progress_flush_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._progress_pruned_at = time.monotonic()
+
         # Background task management
         self.heartbeat_interval = 30  # seconds
         self.cleanup_interval = 300  # 5 minutes
@@ -185,6 +264,7 @@ class FeedMeRealtimeManager:
             # Create room if it doesn't exist
             if room_id not in self.rooms:
                 self.rooms[room_id] = WebSocketRoom(room_id)
+                await self._subscribe_room(room_id)
 
             room = self.rooms[room_id]
 
@@ -247,6 +327,7 @@ class FeedMeRealtimeManager:
             # Clean up empty room
             if room.is_empty():
                 del self.rooms[room_id]
+                await self._unsubscribe_room(room_id)
                 logger.info(f"Cleaned up empty room: {room_id}")
 
             # Log disconnection event
@@ -275,6 +356,9 @@ class FeedMeRealtimeManager:
         """
         Broadcast message to all connections in a room.
 
+        The message is serialized once, published to the room channel for
+        other workers, and delivered to this worker's sockets.
+
         Args:
             room_id: Room to broadcast to
             message: Message to send
@@ -282,15 +366,71 @@ class FeedMeRealtimeManager:
             exclude_users: Users to exclude from broadcast
 
         Returns:
-            List of failed connections
+            List of failed (local) connections
         """
+        return await self._broadcast_encoded(
+            room_id, encode_message(message), required_permission, exclude_users or []
+        )
+
+    async def _broadcast_encoded(
+        self,
+        room_id: str,
+        payload: str,
+        required_permission: Optional[str],
+        exclude_users: List[str],
+        coalesce_key: Optional[str] = None,
+        coalesce: bool = False,
+    ) -> List[WebSocket]:
+        published = await self._publish(
+            room_id, payload, required_permission, exclude_users, coalesce_key, coalesce
+        )
+
+        if room_id not in self.rooms:
+            if not published:
+                logger.warning(
+                    f"Attempted to broadcast to non-existent room: {room_id}"
+                )
+            return []
+
+        return await self._dispatch_local(
+            room_id, payload, required_permission, exclude_users, coalesce_key, coalesce
+        )
+
+    async def _dispatch_local(
+        self,
+        room_id: str,
+        payload: str,
+        required_permission: Optional[str],
+        exclude_users: List[str],
+        coalesce_key: Optional[str],
+        coalesce: bool,
+    ) -> List[WebSocket]:
+        if coalesce_key is not None:
+            if coalesce:
+                await self._coalesce_progress(
+                    room_id, coalesce_key, payload, required_permission, exclude_users
+                )
+                return []
+            # A final status supersedes any buffered progress for the same key
+            self._drop_pending_progress(room_id, coalesce_key)
+
+        return await self._deliver_local(
+            room_id, payload, required_permission, exclude_users
+        )
+
+    async def _deliver_local(
+        self,
+        room_id: str,
+        payload: str,
+        required_permission: Optional[str] = None,
+        exclude_users: Optional[List[str]] = None,
+    ) -> List[WebSocket]:
+        """Send an already-encoded message to this worker's sockets in a room."""
         room = self.rooms.get(room_id)
         if not room:
-            logger.warning(f"Attempted to broadcast to non-existent room: {room_id}")
             return []
 
         exclude_users = exclude_users or []
-        failed_connections = []
 
         # Get target connections based on permissions and exclusions
         target_connections = []
@@ -308,18 +448,29 @@ class FeedMeRealtimeManager:
 
             target_connections.append(websocket)
 
-        # Send message to all target connections
-        send_tasks = []
-        for websocket in target_connections:
-            task = asyncio.create_task(self._send_message_safe(websocket, message))
-            send_tasks.append((websocket, task))
+        if not target_connections:
+            return []
 
-        # Wait for all sends to complete
-        for websocket, task in send_tasks:
+        if len(target_connections) == 1:
+            results: List[Any] = []
             try:
-                await task
+                await self._send_text_safe(target_connections[0], payload)
+                results.append(None)
             except Exception as e:
-                logger.error(f"Failed to send message to connection: {e}")
+                results.append(e)
+        else:
+            results = await asyncio.gather(
+                *(
+                    self._send_text_safe(websocket, payload)
+                    for websocket in target_connections
+                ),
+                return_exceptions=True,
+            )
+
+        failed_connections = []
+        for websocket, result in zip(target_connections, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to send message to connection: {result}")
                 failed_connections.append(websocket)
 
         # Update room statistics
@@ -334,6 +485,66 @@ class FeedMeRealtimeManager:
 
         return failed_connections
 
+    async def _coalesce_progress(
+        self,
+        room_id: str,
+        key: str,
+        payload: str,
+        required_permission: Optional[str],
+        exclude_users: List[str],
+    ) -> None:
+        """Deliver at most one progress update per window; latest one wins."""
+        slot = (room_id, key)
+        now = time.monotonic()
+        if now - self._progress_pruned_at >= PROGRESS_SLOT_TTL_SECONDS:
+            self._prune_progress_slots(now)
+        last_sent = self._progress_last_sent.get(slot, 0.0)
+        window = self.progress_coalesce_seconds
+
+        if slot not in self._progress_flush_tasks and now - last_sent >= window:
+            self._progress_last_sent[slot] = now
+            await self._deliver_local(
+                room_id, payload, required_permission, exclude_users
+            )
+            return
+
+        self._pending_progress[slot] = (payload, required_permission, exclude_users)
+        if slot not in self._progress_flush_tasks:
+            delay = max(0.0, last_sent + window - now)
+            self._progress_flush_tasks[slot] = asyncio.create_task(
+                self._flush_progress_after(slot, delay)
+            )
+
+    def _prune_progress_slots(self, now: float) -> None:
+        """Forget idle coalescing slots of jobs that never sent a final status."""
+        self._progress_pruned_at = now
+        cutoff = now - PROGRESS_SLOT_TTL_SECONDS
+        for slot, last_sent in list(self._progress_last_sent.items()):
+            if last_sent < cutoff and slot not in self._progress_flush_tasks:
+                del self._progress_last_sent[slot]
+
+    async def _flush_progress_after(self, slot: Tuple[str, str], delay: float) -> None:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        self._progress_flush_tasks.pop(slot, None)
+        pending = self._pending_progress.pop(slot, None)
+        if pending is None:
+            return
+        self._progress_last_sent[slot] = time.monotonic()
+        payload, required_permission, exclude_users = pending
+        await self._deliver_local(slot[0], payload, required_permission, exclude_users)
+
+    def _drop_pending_progress(self, room_id: str, key: str) -> None:
+        """Discard buffered progress superseded by a final status update."""
+        slot = (room_id, key)
+        self._pending_progress.pop(slot, None)
+        self._progress_last_sent.pop(slot, None)
+        task = self._progress_flush_tasks.pop(slot, None)
+        if task:
+            task.cancel()
+
     async def broadcast_processing_update(self, update: ProcessingUpdate):
         """
         Broadcast processing status update to relevant rooms.
@@ -341,17 +552,28 @@ class FeedMeRealtimeManager:
         Args:
             update: Processing update to broadcast
         """
-        # Create message
+        # Create message (serialized once for every room and worker)
         message = {"type": MessageType.PROCESSING_UPDATE, **update.model_dump()}
+        payload = encode_message(message)
 
-        # Broadcast to conversation-specific room
-        conversation_room = f"conversation_{update.conversation_id}"
-        await self.broadcast_to_room(conversation_room, message)
+        # Rapid in-flight progress is coalesced per conversation; status
+        # changes that end processing are delivered immediately.
+        coalesce_key = f"conversation_{update.conversation_id}"
+        coalesce = update.status == ProcessingStatus.PROCESSING
 
-        # Also broadcast to global processing room
-        await self.broadcast_to_room(
-            "processing_updates", message, required_permission="processing:read"
-        )
+        rooms = [
+            (f"conversation_{update.conversation_id}", None),
+            ("processing_updates", "processing:read"),
+        ]
+        for room_id, permission in rooms:
+            await self._broadcast_encoded(
+                room_id,
+                payload,
+                permission,
+                [],
+                coalesce_key=coalesce_key,
+                coalesce=coalesce,
+            )
 
     async def broadcast_approval_update(self, update: ApprovalUpdate):
         """
@@ -379,14 +601,15 @@ class FeedMeRealtimeManager:
         Args:
             room_id: Specific room to ping, or None for all rooms
         """
-        heartbeat_message = HeartbeatMessage().model_dump(mode="json")
+        # Heartbeats are per-worker: only this worker's sockets need them.
+        payload = encode_message(HeartbeatMessage().model_dump(mode="json"))
 
         if room_id:
-            await self.broadcast_to_room(room_id, heartbeat_message)
+            await self._deliver_local(room_id, payload)
         else:
             # Send to all rooms
             for room_id in list(self.rooms.keys()):
-                await self.broadcast_to_room(room_id, heartbeat_message)
+                await self._deliver_local(room_id, payload)
 
     async def queue_message_for_user(
         self, user_id: str, message: Dict[str, Any], ttl_seconds: int = 3600
@@ -407,7 +630,7 @@ class FeedMeRealtimeManager:
         )
 
         # Try to persist to Redis first
-        if self.redis_enabled and self.redis_client:
+        if self.persist_enabled and self.redis_client:
             try:
                 redis_key = f"feedme:websocket:queue:{user_id}"
                 message_data = {
@@ -539,7 +762,7 @@ class FeedMeRealtimeManager:
         delivered_messages = []
 
         # Try to get messages from Redis first
-        if self.redis_enabled and self.redis_client:
+        if self.persist_enabled and self.redis_client:
             try:
                 redis_key = f"feedme:websocket:queue:{user_id}"
                 redis_messages = await self._await_redis(
@@ -593,6 +816,150 @@ class FeedMeRealtimeManager:
                     f"Delivered and removed {len(successfully_delivered)} messages from memory for user {user_id}"
                 )
 
+    async def _send_text_safe(self, websocket: WebSocket, payload: str):
+        """Send a pre-encoded message with error handling"""
+        try:
+            await websocket.send_text(payload)
+        except WebSocketDisconnect:
+            # Connection was closed, handle cleanup
+            await self.disconnect(websocket)
+            raise
+        except Exception as e:
+            # Other send errors
+            logger.error(f"Failed to send WebSocket message: {e}")
+            raise
+
+    def _get_publisher(self) -> Optional[redis_sync.Redis]:
+        # A sync client (used via to_thread) works from any event loop,
+        # including the short-lived loops Celery tasks create per update.
+        if self._publisher is None and self._redis_url:
+            self._publisher = redis_sync.Redis.from_url(self._redis_url)
+        return self._publisher
+
+    async def _publish(
+        self,
+        room_id: str,
+        payload: str,
+        required_permission: Optional[str],
+        exclude_users: List[str],
+        coalesce_key: Optional[str] = None,
+        coalesce: bool = False,
+    ) -> bool:
+        """Publish an encoded message to the room channel for other workers."""
+        if not self.pubsub_enabled or time.monotonic() < self._publish_disabled_until:
+            return False
+
+        envelope = json.dumps(
+            {
+                "origin": self.instance_id,
+                "room_id": room_id,
+                "required_permission": required_permission,
+                "exclude_users": exclude_users,
+                "coalesce_key": coalesce_key,
+                "coalesce": coalesce,
+                "payload": payload,
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        try:
+            publisher = self._get_publisher()
+            if publisher is None:
+                return False
+            await asyncio.to_thread(
+                publisher.publish, f"{ROOM_CHANNEL_PREFIX}{room_id}", envelope
+            )
+            return True
+        except Exception as e:
+            self._publish_disabled_until = (
+                time.monotonic() + PUBLISH_RETRY_BACKOFF_SECONDS
+            )
+            logger.warning(
+                f"Redis publish failed ({e}); delivering locally only for "
+                f"{PUBLISH_RETRY_BACKOFF_SECONDS:.0f}s"
+            )
+            return False
+
+    async def _subscribe_room(self, room_id: str):
+        """Subscribe this worker to a room channel (first local connection)."""
+        if not self.pubsub_enabled:
+            return
+        try:
+            async with self._pubsub_lock:
+                if self._pubsub is None:
+                    self._pubsub_client = redis.from_url(cast(str, self._redis_url))
+                    self._pubsub = self._pubsub_client.pubsub()
+                if room_id not in self._subscribed_rooms:
+                    await self._pubsub.subscribe(f"{ROOM_CHANNEL_PREFIX}{room_id}")
+                    self._subscribed_rooms.add(room_id)
+            if self.pubsub_task is None:
+                self.pubsub_task = asyncio.create_task(self._pubsub_loop())
+        except Exception as e:
+            logger.warning(f"Failed to subscribe to room channel {room_id}: {e}")
+
+    async def _unsubscribe_room(self, room_id: str):
+        """Unsubscribe from a room channel once no local sockets remain."""
+        if self._pubsub is None or room_id not in self._subscribed_rooms:
+            return
+        try:
+            async with self._pubsub_lock:
+                await self._pubsub.unsubscribe(f"{ROOM_CHANNEL_PREFIX}{room_id}")
+                self._subscribed_rooms.discard(room_id)
+        except Exception as e:
+            logger.warning(f"Failed to unsubscribe from room channel {room_id}: {e}")
+
+    async def _pubsub_loop(self):
+        """Deliver messages published by other workers to local sockets."""
+        try:
+            while True:
+                pubsub = self._pubsub
+                if pubsub is None or not self._subscribed_rooms:
+                    await asyncio.sleep(0.5)
+                    continue
+                try:
+                    raw = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error reading room channel: {e}")
+                    await asyncio.sleep(1.0)
+                    continue
+                if raw:
+                    await self._handle_pubsub_message(raw)
+        except asyncio.CancelledError:
+            logger.info("Room channel listener cancelled")
+        finally:
+            self.pubsub_task = None
+
+    async def _handle_pubsub_message(self, raw: Dict[str, Any]):
+        try:
+            data = raw.get("data")
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            envelope = json.loads(data)
+            if envelope.get("origin") == self.instance_id:
+                return
+
+            room_id = envelope["room_id"]
+            payload = envelope["payload"]
+            required_permission = envelope.get("required_permission")
+            exclude_users = envelope.get("exclude_users") or []
+            if room_id not in self.rooms:
+                return
+
+            await self._dispatch_local(
+                room_id,
+                payload,
+                required_permission,
+                exclude_users,
+                envelope.get("coalesce_key"),
+                bool(envelope.get("coalesce")),
+            )
+        except Exception as e:
+            logger.error(f"Failed to handle room channel message: {e}")
+
     async def _send_message_safe(self, websocket: WebSocket, message: Dict[str, Any]):
         """Send message with error handling"""
         try:
@@ -692,6 +1059,34 @@ class FeedMeRealtimeManager:
         """Stop all background tasks"""
         await self.stop_heartbeat()
         await self.stop_cleanup_task()
+        await self.stop_pubsub()
+
+    async def stop_pubsub(self):
+        """Stop the room channel listener and release Redis connections"""
+        if self.pubsub_task:
+            self.pubsub_task.cancel()
+            try:
+                await self.pubsub_task
+            except asyncio.CancelledError:
+                pass
+            self.pubsub_task = None
+        for task in list(self._progress_flush_tasks.values()):
+            task.cancel()
+        self._progress_flush_tasks.clear()
+        self._pending_progress.clear()
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+            self._subscribed_rooms.clear()
+        if self._pubsub_client is not None:
+            try:
+                await self._pubsub_client.aclose()
+            except Exception:
+                pass
+            self._pubsub_client = None
 
     async def stop_heartbeat(self):
         """Stop heartbeat task"""
@@ -735,9 +1130,14 @@ class FeedMeRealtimeManager:
                 await self.disconnect(websocket)
 
             # Remove empty rooms
-            if room.is_empty():
+            if room.is_empty() and room_id in self.rooms:
                 del self.rooms[room_id]
+                await self._unsubscribe_room(room_id)
 
 
 # Global instance
-realtime_manager = FeedMeRealtimeManager()
+realtime_manager = FeedMeRealtimeManager(
+    redis_url=settings.redis_url or None,
+    pubsub_enabled=PUBSUB_ENABLED,
+    persist_enabled=PERSIST_ENABLED,
+)
@@ -3,18 +3,30 @@ Lightweight Zendesk attachment fetcher for tickets.
 
 Fetches the latest allowed attachments for a ticket and returns a summary plus
 local paths for downstream processing (e.g., log analysis).
+
+Downloads run on a small bounded thread pool over one pooled HTTP session and
+stream to disk in chunks, so a ticket with several large log bundles costs
+roughly the slowest download rather than the sum of all of them. Downloaded
+files are kept in a content-addressed cache and hard-linked into each run's
+temp folder, so attachments re-seen on ticket retries are not fetched again.
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
 import tempfile
 import shutil
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .client import ZendeskRateLimitError, zendesk_throttle
 
@@ -27,6 +39,20 @@ ZENDESK_SUBDOMAIN = os.environ.get("ZENDESK_SUBDOMAIN") or "mailbird"
 ZENDESK_EMAIL = os.environ.get("ZENDESK_EMAIL")
 ZENDESK_API_TOKEN = os.environ.get("ZENDESK_API_TOKEN")
 
+DOWNLOAD_CONCURRENCY = max(
+    1, int(os.environ.get("ZENDESK_ATTACHMENT_CONCURRENCY") or "4")
+)
+DOWNLOAD_CHUNK_BYTES = max(
+    4096, int(os.environ.get("ZENDESK_ATTACHMENT_CHUNK_BYTES") or str(64 * 1024))
+)
+CACHE_DIR = os.environ.get("ZENDESK_ATTACHMENT_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), "zendesk-attachment-cache"
+)
+CACHE_MAX_BYTES = int(
+    os.environ.get("ZENDESK_ATTACHMENT_CACHE_MAX_BYTES") or str(256 * 1024 * 1024)
+)
+CACHE_TTL_SECONDS = float(os.environ.get("ZENDESK_ATTACHMENT_CACHE_TTL_SEC") or "21600")
+
 
 @dataclass
 class AttachmentInfo:
@@ -46,6 +72,236 @@ def _auth() -> tuple[str, str]:
     return (f"{ZENDESK_EMAIL}/token", ZENDESK_API_TOKEN)
 
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Shared session so comment and download requests reuse connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=max(DOWNLOAD_CONCURRENCY, 4)
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class AttachmentTooLargeError(Exception):
+    """Raised when a download exceeds the per-file size limit."""
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class _AttachmentCache:
+    """Content-addressed store for downloaded attachments.
+
+    Blobs are stored once per SHA-256 digest under ``CACHE_DIR``; an index maps
+    each attachment (id, url, size) to its digest. Entries expire after
+    ``CACHE_TTL_SECONDS`` and the least recently used ones are dropped once
+    the stored bytes exceed ``CACHE_MAX_BYTES``.
+
+    The index lives in memory only, so blobs left in ``CACHE_DIR`` by a
+    previous process cannot be mapped back to attachments; they are removed
+    before the first store so ``CACHE_MAX_BYTES`` accounts for everything on
+    disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._index: "OrderedDict[Tuple[Any, ...], Tuple[str, float]]" = OrderedDict()
+        self._blob_sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stale_cleared = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest)
+
+    @staticmethod
+    def _is_cache_file(name: str) -> bool:
+        digest = name.split(".", 1)[0]
+        return len(digest) == 64 and all(c in "0123456789abcdef" for c in digest)
+
+    def _clear_stale(self) -> None:
+        """Remove blobs (and partial copies) orphaned by an earlier process."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        removed = 0
+        for name in names:
+            if not self._is_cache_file(name):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            logger.info("attachment_cache_cleared_stale: %d files", removed)
+
+    def materialize(self, key: Tuple[Any, ...], dest: str) -> bool:
+        """Place the cached file for ``key`` at ``dest``; False on a miss."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and time.monotonic() - entry[1] > self.ttl_seconds:
+                self._drop_key(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False
+            self._index.move_to_end(key)
+            path = self._blob_path(entry[0])
+        try:
+            _link_or_copy(path, dest)
+        except OSError:
+            with self._lock:
+                self._drop_key(key)
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key: Tuple[Any, ...], digest: str, src: str, size: int) -> None:
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            # Under the lock so no concurrent store lands mid-clear; runs once.
+            if not self._stale_cleared:
+                self._stale_cleared = True
+                self._clear_stale()
+        path = self._blob_path(digest)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if not os.path.exists(path):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                _link_or_copy(src, tmp_path)
+                os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.debug("attachment_cache_store_failed: %s", exc)
+            return
+        with self._lock:
+            if key in self._index:
+                self._drop_key(key)
+            self._index[key] = (digest, time.monotonic())
+            if digest not in self._blob_sizes:
+                self._blob_sizes[digest] = size
+                self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._index:
+                self._drop_key(next(iter(self._index)))
+
+    def _drop_key(self, key: Tuple[Any, ...]) -> None:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        digest = entry[0]
+        if any(other[0] == digest for other in self._index.values()):
+            return
+        size = self._blob_sizes.pop(digest, 0)
+        self._total_bytes -= size
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "blobs": len(self._blob_sizes),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_attachment_cache = _AttachmentCache(CACHE_DIR, CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
+
+
+def get_attachment_cache_stats() -> Dict[str, Any]:
+    """Return attachment cache statistics for observability."""
+    return _attachment_cache.stats()
+
+
+def _local_name(name: str, att_id: Any, used: set[str]) -> str:
+    base = os.path.basename(name.replace("\\", "/")) or f"attachment-{att_id}"
+    if base in used:
+        base = f"{att_id}-{base}"
+    used.add(base)
+    return base
+
+
+def _download_attachment(
+    content_url: str, dest: str, max_bytes: int, cache_key: Tuple[Any, ...]
+) -> str:
+    """Stream one attachment to ``dest`` (or reuse the cached copy)."""
+    if _attachment_cache.materialize(cache_key, dest):
+        return dest
+
+    zendesk_throttle()
+    part_path = f"{dest}.part"
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with _get_session().get(
+            content_url, auth=_auth(), timeout=30, stream=True
+        ) as r:
+            if r.status_code == 429:
+                raise ZendeskRateLimitError.from_response(
+                    r, operation="download_attachment"
+                )
+            r.raise_for_status()
+            declared = r.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                raise AttachmentTooLargeError(
+                    f"Content-Length {declared} exceeds {max_bytes} bytes"
+                )
+            with open(part_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                    if not chunk:
+                        continue
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise AttachmentTooLargeError(
+                            f"download exceeds {max_bytes} bytes"
+                        )
+                    digest.update(chunk)
+                    f.write(chunk)
+        os.replace(part_path, dest)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+    _attachment_cache.store(cache_key, digest.hexdigest(), dest, written)
+    return dest
+
+
 def fetch_ticket_attachments(
     ticket_id: int | str,
     allowed_extensions: Iterable[str] = (
@@ -68,7 +324,7 @@ def fetch_ticket_attachments(
     exts = {ext.lower() for ext in allowed_extensions}
     url = f"https://{ZENDESK_SUBDOMAIN}.zendesk.com/api/v2/tickets/{ticket_id}/comments.json?sort_order=asc&include=attachments"
     zendesk_throttle()
-    resp = requests.get(url, auth=_auth(), timeout=20)
+    resp = _get_session().get(url, auth=_auth(), timeout=20)
     if resp.status_code == 429:
         raise ZendeskRateLimitError.from_response(
             resp, operation="fetch_ticket_attachments"
@@ -86,6 +342,8 @@ def fetch_ticket_attachments(
 
     try:
         tmpdir = tempfile.mkdtemp(prefix=f"zendesk-{ticket_id}-")
+        used_names: set[str] = set()
+        downloads: List[Tuple[AttachmentInfo, str, Tuple[Any, ...]]] = []
 
         for comment in comments:
             for att in comment.get("attachments") or []:
@@ -98,42 +356,54 @@ def fetch_ticket_attachments(
                     # Skip overly large attachments to avoid surprises
                     continue
                 content_url = att.get("content_url")
-                local_path = None
-                if content_url:
-                    try:
-                        zendesk_throttle()
-                        r = requests.get(content_url, auth=_auth(), timeout=30)
-                        if r.status_code == 429:
-                            raise ZendeskRateLimitError.from_response(
-                                r, operation="download_attachment"
-                            )
-                        r.raise_for_status()
-                        local_path = os.path.join(tmpdir, name)
-                        with open(local_path, "wb") as f:
-                            f.write(r.content)
-                    except ZendeskRateLimitError:
-                        raise
-                    except Exception as exc:
-                        logger.warning(
-                            "failed_to_download_attachment",
-                            extra={
-                                "ticket_id": ticket_id,
-                                "name": name,
-                                "error": str(exc),
-                            },
-                        )
-                        local_path = None
                 att_id = att.get("id") or 0
-                results.append(
-                    AttachmentInfo(
-                        id=att_id,
-                        file_name=name,
-                        content_url=content_url,
-                        local_path=local_path,
-                        size=size,
-                        content_type=att.get("content_type"),
-                    )
+                info = AttachmentInfo(
+                    id=att_id,
+                    file_name=name,
+                    content_url=content_url,
+                    local_path=None,
+                    size=size,
+                    content_type=att.get("content_type"),
                 )
+                results.append(info)
+                if content_url:
+                    dest = os.path.join(tmpdir, _local_name(name, att_id, used_names))
+                    downloads.append((info, dest, (att_id, content_url, size)))
+
+        if downloads:
+            workers = min(DOWNLOAD_CONCURRENCY, len(downloads))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="zendesk-attachment"
+            ) as pool:
+                futures = [
+                    (
+                        info,
+                        pool.submit(
+                            _download_attachment, info.content_url, dest, max_bytes, key
+                        ),
+                    )
+                    for info, dest, key in downloads
+                ]
+                try:
+                    for info, future in futures:
+                        try:
+                            info.local_path = future.result()
+                        except ZendeskRateLimitError:
+                            raise
+                        except Exception as exc:
+                            logger.warning(
+                                "failed_to_download_attachment",
+                                extra={
+                                    "ticket_id": ticket_id,
+                                    "file_name": info.file_name,
+                                    "error": str(exc),
+                                },
+                            )
+                            info.local_path = None
+                except BaseException:
+                    for _, future in futures:
+                        future.cancel()
+                    raise
     except Exception:
         if tmpdir and os.path.exists(tmpdir):
             shutil.rmtree(tmpdir, ignore_errors=True)
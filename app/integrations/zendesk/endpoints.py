@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import hmac
 import json
 import logging
+import os
+import time
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple
 
@@ -16,6 +19,7 @@ from app.db.supabase.client import get_supabase_client
 from .exclusions import compute_ticket_exclusion
 from .redaction import sanitize_zendesk_ticket_text
 from .security import verify_webhook_signature
+from .webhook_ingest import WebhookEvent, ingest_batcher, replay_guard
 
 router = APIRouter(prefix="/integrations/zendesk", tags=["Zendesk"])
 
@@ -23,6 +27,13 @@ logger = logging.getLogger(__name__)
 
 COUNT_EXACT: CountMethod = CountMethod.exact
 
+# Webhook bursts should not turn into one feature-flag read per request.
+FEATURE_FLAG_CACHE_TTL_SEC = max(
+    0.0, float(os.environ.get("ZENDESK_FEATURE_FLAG_CACHE_TTL_SEC") or "15")
+)
+_feature_flag_cache: Optional[Tuple[float, Optional[Dict[str, Any]]]] = None
+_feature_flag_lock = asyncio.Lock()
+
 # Default model for Zendesk - centralized to ensure consistency
 
 
@@ -186,24 +197,52 @@ async def _upsert_month_usage(delta_calls: int = 0) -> Dict[str, Any]:
     return row
 
 
-async def _get_feature_enabled() -> bool:
-    # Prefer Supabase flag when present
-    try:
-        supa = get_supabase_client()
-        resp = await supa._exec(
-            lambda: (
-                supa.client.table("feature_flags")
-                .select("value")
-                .eq("key", "zendesk_enabled")
-                .maybe_single()
-                .execute()
+def _cache_feature_flag(value: Optional[Dict[str, Any]]) -> None:
+    global _feature_flag_cache
+    _feature_flag_cache = (time.monotonic(), value)
+
+
+def _cached_feature_flag() -> Tuple[bool, Optional[Dict[str, Any]]]:
+    cached = _feature_flag_cache
+    if cached is None or time.monotonic() - cached[0] >= FEATURE_FLAG_CACHE_TTL_SEC:
+        return False, None
+    return True, cached[1]
+
+
+async def _get_feature_flag_value() -> Optional[Dict[str, Any]]:
+    """Return the zendesk_enabled flag value, served from a short-TTL cache."""
+    hit, value = _cached_feature_flag()
+    if hit:
+        return value
+    async with _feature_flag_lock:
+        hit, value = _cached_feature_flag()
+        if hit:
+            return value
+        try:
+            supa = get_supabase_client()
+            resp = await supa._exec(
+                lambda: (
+                    supa.client.table("feature_flags")
+                    .select("value")
+                    .eq("key", "zendesk_enabled")
+                    .maybe_single()
+                    .execute()
+                )
             )
-        )
+        except Exception as e:
+            logger.debug("feature flag fetch failed: %s", e)
+            return None
         data = getattr(resp, "data", None)
-        if data and isinstance(data.get("value"), dict):
-            return bool(data["value"].get("enabled", False))
-    except Exception as e:
-        logger.debug("feature flag fetch failed: %s", e)
+        value = data["value"] if data and isinstance(data.get("value"), dict) else None
+        _cache_feature_flag(value)
+        return value
+
+
+async def _get_feature_enabled() -> bool:
+    # Prefer Supabase flag when present
+    value = await _get_feature_flag_value()
+    if value is not None:
+        return bool(value.get("enabled", False))
     # Fallback to env flag
     return bool(getattr(settings, "zendesk_enabled", False))
 
@@ -219,24 +258,9 @@ async def _get_feature_state_snapshot() -> Dict[str, Any]:
         coordinator_cfg = resolve_coordinator_config(config, "google")
     provider = coordinator_cfg.provider or "google"
     model = coordinator_cfg.model_id
-    try:
-        supa = get_supabase_client()
-        resp = await supa._exec(
-            lambda: (
-                supa.client.table("feature_flags")
-                .select("value")
-                .eq("key", "zendesk_enabled")
-                .maybe_single()
-                .execute()
-            )
-        )
-        data = getattr(resp, "data", None)
-        if data and isinstance(data.get("value"), dict):
-            val = data["value"]
-            if "dry_run" in val:
-                dry_run = bool(val.get("dry_run", dry_run))
-    except Exception:
-        pass
+    val = await _get_feature_flag_value()
+    if val is not None and "dry_run" in val:
+        dry_run = bool(val.get("dry_run", dry_run))
     return {
         "enabled": enabled,
         "dry_run": dry_run,
@@ -429,6 +453,8 @@ async def set_feature(
         logger.error("feature flag upsert failed: %s", e)
         raise HTTPException(status_code=500, detail="feature flag write failed")
 
+    # Push the new value so this process stops serving the cached one.
+    _cache_feature_flag(value)
     return {"ok": True, "value": value}
 
 
@@ -482,41 +508,31 @@ async def webhook(request: Request) -> Dict[str, Any]:
             status_code=status.HTTP_403_FORBIDDEN, detail="invalid_signature"
         )
 
-    # Replay protection: idempotency guard keyed by (timestamp, signature-tail)
-    try:
-        if ts and sig:
-            # Use only a short tail of the signature to avoid storing full secrets
-            sig_tail = str(sig)[-12:]
-            sig_key = f"{ts}:{sig_tail}"
-            supa = get_supabase_client()
-            # Parse timestamp for storage (epoch seconds)
-            ts_epoch = None
-            try:
-                ts_epoch = int(ts)
-            except Exception:
-                try:
-                    ts_str = str(ts).replace("Z", "+00:00")
-                    dt = datetime.fromisoformat(ts_str)
-                    if dt.tzinfo is None:
-                        dt = dt.replace(tzinfo=timezone.utc)
-                    ts_epoch = int(dt.timestamp())
-                except Exception:
-                    ts_epoch = None
-            await supa._exec(
-                lambda: (
-                    supa.client.table("zendesk_webhook_events")
-                    .insert({"sig_key": sig_key, "ts": ts_epoch})
-                    .execute()
-                )
-            )
-    except Exception as e:
-        msg = str(e)
-        if "duplicate key" in msg or "already exists" in msg:
+    # Replay protection: idempotency guard keyed by (timestamp, signature-tail).
+    # Recent keys are rejected from memory; the durable row is written together
+    # with the queue row below.
+    sig_key: Optional[str] = None
+    ts_epoch: Optional[int] = None
+    if ts and sig:
+        # Use only a short tail of the signature to avoid storing full secrets
+        sig_tail = str(sig)[-12:]
+        sig_key = f"{ts}:{sig_tail}"
+        if replay_guard.seen(sig_key):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT, detail="replay_detected"
             )
-        logger.error("replay state insert failed: %s", e)
-        raise HTTPException(status_code=500, detail="replay_state_insert_failed")
+        # Parse timestamp for storage (epoch seconds)
+        try:
+            ts_epoch = int(ts)
+        except Exception:
+            try:
+                ts_str = str(ts).replace("Z", "+00:00")
+                dt = datetime.fromisoformat(ts_str)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                ts_epoch = int(dt.timestamp())
+            except Exception:
+                ts_epoch = None
 
     try:
         payload = json.loads(body_bytes.decode("utf-8"))
@@ -637,33 +653,28 @@ async def webhook(request: Request) -> Dict[str, Any]:
             else redacted_description
         )
 
-    # Insert into supabase queue; ignore duplicates by unique constraint
+    # Record the replay key and queue the ticket in one micro-batched write;
+    # duplicates are ignored by the unique constraint.
     try:
-        supa = get_supabase_client()
-        await supa._exec(
-            lambda: (
-                supa.client.table("zendesk_pending_tickets")
-                .insert(
-                    {
-                        "ticket_id": ticket_id_int,
-                        "brand_id": str(brand_id) if brand_id is not None else None,
-                        "subject": subject,
-                        "description": description,
-                        "payload": {},
-                        "status": "pending",
-                        "requester_hashed": requester_hashed,
-                    }
-                )
-                .execute()
+        outcome = await ingest_batcher.submit(
+            WebhookEvent(
+                ticket_id=ticket_id_int,
+                sig_key=sig_key,
+                ts=ts_epoch,
+                brand_id=str(brand_id) if brand_id is not None else None,
+                subject=subject,
+                description=description,
+                requester_hashed=requester_hashed,
             )
         )
-        queued = True
     except Exception as e:
-        msg = str(e)
-        if "duplicate key" in msg or "already exists" in msg:
-            queued = False
-        else:
-            logger.error("Failed to queue ticket %s: %s", ticket_id_int, e)
-            raise HTTPException(status_code=500, detail="queue_insert_failed")
-
-    return {"ok": True, "queued": queued}
+        logger.error("Failed to queue ticket %s: %s", ticket_id_int, e)
+        raise HTTPException(status_code=500, detail="queue_insert_failed")
+
+    if sig_key:
+        replay_guard.add(sig_key)
+    if outcome == "replay":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="replay_detected"
+        )
+    return {"ok": True, "queued": outcome == "queued"}
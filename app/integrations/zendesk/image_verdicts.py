@@ -0,0 +1,232 @@
+"""
+Perceptual-hash verdict cache for spam guard image classification.
+
+Spam waves reuse the same (or re-encoded, resized) images across many
+tickets. Each classified image is fingerprinted with a 64-bit difference hash
+(dHash) and its model verdict is kept in an in-memory index backed by a small
+SQLite file. Lookups find the nearest stored hash within a Hamming-distance
+threshold, so known images are decided locally and only novel ones reach the
+vision model.
+
+The index splits each hash into 8 one-byte bands: two hashes within distance
+7 share at least one band exactly, so a lookup only compares the handful of
+hashes bucketed under the query's bands.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+VERDICT_DB_PATH = os.environ.get("ZENDESK_SPAM_IMAGE_VERDICT_DB") or os.path.join(
+    tempfile.gettempdir(), "zendesk-spam-image-verdicts.sqlite3"
+)
+MAX_HASH_DISTANCE = min(
+    7, max(0, int(os.environ.get("ZENDESK_SPAM_IMAGE_HASH_MAX_DISTANCE") or "5"))
+)
+MAX_ENTRIES = int(os.environ.get("ZENDESK_SPAM_IMAGE_VERDICT_MAX_ENTRIES") or "50000")
+
+_HASH_SIZE = 8
+_BANDS = 8
+_CACHEABLE_LABELS = frozenset({"explicit_adult", "suggestive", "benign"})
+
+
+def image_dhash(image_path: str) -> int | None:
+    """Return the 64-bit difference hash of an image, or None if unreadable."""
+    try:
+        with Image.open(image_path) as img:
+            # Let JPEG decoding downscale early; the hash only needs 9x8 pixels.
+            img.draft("L", (_HASH_SIZE * 8, _HASH_SIZE * 8))
+            small = img.convert("L").resize(
+                (_HASH_SIZE + 1, _HASH_SIZE), Image.Resampling.LANCZOS
+            )
+            pixels = list(small.getdata())
+    except (UnidentifiedImageError, OSError, ValueError) as exc:
+        logger.debug("spam_guard_image_hash_failed", error=str(exc)[:180])
+        return None
+
+    value = 0
+    width = _HASH_SIZE + 1
+    for row in range(_HASH_SIZE):
+        offset = row * width
+        for col in range(_HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+@dataclass(frozen=True)
+class ImageVerdict:
+    label: str
+    confidence: float
+    distance: int
+
+
+class ImageVerdictIndex:
+    """In-memory Hamming-distance index of image verdicts with SQLite persistence."""
+
+    def __init__(
+        self,
+        db_path: str | None = VERDICT_DB_PATH,
+        *,
+        max_distance: int = MAX_HASH_DISTANCE,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        self.db_path = db_path
+        self.max_distance = max_distance
+        self.max_entries = max(1, max_entries)
+        self._verdicts: dict[int, tuple[str, float]] = {}
+        self._bands: list[dict[int, set[int]]] = [{} for _ in range(_BANDS)]
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    # -- persistence -------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.db_path:
+            return
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS image_verdicts (
+                    hash INTEGER PRIMARY KEY,
+                    label TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.commit()
+            rows = conn.execute(
+                "SELECT hash, label, confidence FROM image_verdicts "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("spam_guard_image_verdict_db_unavailable", error=str(exc))
+            return
+        self._conn = conn
+        for raw_hash, label, confidence in rows:
+            self._insert(_to_unsigned(raw_hash), label, float(confidence))
+        if rows:
+            logger.info("spam_guard_image_verdicts_loaded", count=len(rows))
+
+    def _persist(self, image_hash: int, label: str, confidence: float) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO image_verdicts (hash, label, confidence, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (_to_signed(image_hash), label, confidence, time.time()),
+            )
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.debug("spam_guard_image_verdict_persist_failed", error=str(exc))
+
+    # -- index -------------------------------------------------------------
+
+    @staticmethod
+    def _band_keys(image_hash: int) -> list[int]:
+        return [(image_hash >> (8 * band)) & 0xFF for band in range(_BANDS)]
+
+    def _insert(self, image_hash: int, label: str, confidence: float) -> None:
+        if image_hash not in self._verdicts:
+            while len(self._verdicts) >= self.max_entries:
+                self._remove(next(iter(self._verdicts)))
+            for band, key in enumerate(self._band_keys(image_hash)):
+                self._bands[band].setdefault(key, set()).add(image_hash)
+        self._verdicts[image_hash] = (label, confidence)
+
+    def _remove(self, image_hash: int) -> None:
+        self._verdicts.pop(image_hash, None)
+        for band, key in enumerate(self._band_keys(image_hash)):
+            bucket = self._bands[band].get(key)
+            if bucket is not None:
+                bucket.discard(image_hash)
+                if not bucket:
+                    del self._bands[band][key]
+
+    def lookup(self, image_hash: int) -> Optional[ImageVerdict]:
+        """Return the verdict of the closest known image within ``max_distance``."""
+        with self._lock:
+            self._ensure_loaded()
+            exact = self._verdicts.get(image_hash)
+            if exact is not None:
+                self.hits += 1
+                return ImageVerdict(exact[0], exact[1], 0)
+
+            best: tuple[int, int] | None = None
+            if self.max_distance > 0:
+                seen: set[int] = set()
+                for band, key in enumerate(self._band_keys(image_hash)):
+                    for candidate in self._bands[band].get(key, ()):
+                        if candidate in seen:
+                            continue
+                        seen.add(candidate)
+                        distance = (candidate ^ image_hash).bit_count()
+                        if distance <= self.max_distance and (
+                            best is None or distance < best[0]
+                        ):
+                            best = (distance, candidate)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            label, confidence = self._verdicts[best[1]]
+            return ImageVerdict(label, confidence, best[0])
+
+    def record(self, image_hash: int, label: str, confidence: float) -> None:
+        """Store a model verdict; inconclusive labels are not cached."""
+        if label not in _CACHEABLE_LABELS or confidence <= 0.0:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._insert(image_hash, label, confidence)
+            self._persist(image_hash, label, confidence)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._verdicts),
+                "hits": self.hits,
+                "misses": self.misses,
+                "max_distance": self.max_distance,
+            }
+
+
+image_verdicts = ImageVerdictIndex()
+
+
+def get_image_verdict_stats() -> dict[str, int]:
+    """Return image verdict cache statistics for observability."""
+    return image_verdicts.stats()
@@ -18,6 +18,7 @@ from app.agents.unified.minimax_tools import (
 from app.core.logging_config import get_logger
 from app.core.settings import settings
 from .attachments import AttachmentInfo, cleanup_attachments, fetch_ticket_attachments
+from .image_verdicts import image_dhash, image_verdicts
 
 logger = get_logger(__name__)
 
@@ -292,6 +293,21 @@ async def _classify_explicit_images(
         lower = att.file_name.lower()
         if not lower.endswith((".png", ".jpg", ".jpeg")):
             continue
+        # Spam waves reuse images; decide known ones from the verdict cache.
+        image_hash = image_dhash(att.local_path)
+        if image_hash is not None:
+            cached = image_verdicts.lookup(image_hash)
+            if cached is not None:
+                logger.info(
+                    "spam_guard_image_classification_cached",
+                    ticket_id=ticket_id,
+                    label=cached.label,
+                    confidence=cached.confidence,
+                    hash_distance=cached.distance,
+                )
+                if cached.label == "explicit_adult" and cached.confidence >= 0.9:
+                    return cached.label, cached.confidence
+                continue
         thumb_path = _make_thumbnail_path(att.local_path)
         if not thumb_path:
             continue
@@ -308,6 +324,8 @@ async def _classify_explicit_images(
                 }
             )
             label, confidence = _parse_minimax_classification(result)
+            if image_hash is not None:
+                image_verdicts.record(image_hash, label, confidence)
             logger.info(
                 "spam_guard_image_classification",
                 ticket_id=ticket_id,
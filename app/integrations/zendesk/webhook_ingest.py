@@ -0,0 +1,216 @@
+"""
+Low-round-trip ingestion for Zendesk webhooks.
+
+Replays are first checked against an in-process TTL set so repeated
+deliveries are rejected without touching the database. Accepted webhooks are
+micro-batched: requests arriving within a short window share one RPC that
+records the replay-protection row and queues the ticket, so each webhook is
+acknowledged after at most one (shared) database write. The database remains
+the authority for replays across instances.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.db.supabase.client import get_supabase_client, is_missing_rpc
+
+logger = logging.getLogger(__name__)
+
+INGEST_RPC = "ingest_zendesk_webhook_events"
+
+BATCH_MAX_EVENTS = max(1, int(os.environ.get("ZENDESK_WEBHOOK_BATCH_MAX") or "50"))
+BATCH_WINDOW_SEC = max(
+    0.0, float(os.environ.get("ZENDESK_WEBHOOK_BATCH_WINDOW_MS") or "15") / 1000.0
+)
+# Signatures are only accepted within a 300s window, so keys need not outlive it by much.
+REPLAY_TTL_SEC = max(
+    1.0, float(os.environ.get("ZENDESK_WEBHOOK_REPLAY_TTL_SEC") or "600")
+)
+REPLAY_MAX_KEYS = max(
+    1, int(os.environ.get("ZENDESK_WEBHOOK_REPLAY_MAX_KEYS") or "100000")
+)
+
+
+def _is_duplicate(exc: Exception) -> bool:
+    message = str(exc)
+    return "duplicate key" in message or "already exists" in message
+
+
+class ReplayGuard:
+    """Bounded in-memory set of recently seen webhook signature keys."""
+
+    def __init__(
+        self, ttl_sec: float = REPLAY_TTL_SEC, max_keys: int = REPLAY_MAX_KEYS
+    ) -> None:
+        self.ttl_sec = ttl_sec
+        self.max_keys = max_keys
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+
+    def _prune(self, now: float) -> None:
+        while self._expires:
+            key, expires_at = next(iter(self._expires.items()))
+            if expires_at > now and len(self._expires) <= self.max_keys:
+                break
+            self._expires.pop(key)
+
+    def seen(self, key: str) -> bool:
+        now = time.monotonic()
+        self._prune(now)
+        expires_at = self._expires.get(key)
+        return expires_at is not None and expires_at > now
+
+    def add(self, key: str) -> None:
+        now = time.monotonic()
+        self._expires.pop(key, None)
+        self._expires[key] = now + self.ttl_sec
+        self._prune(now)
+
+
+@dataclass(slots=True)
+class WebhookEvent:
+    ticket_id: int
+    sig_key: Optional[str] = None
+    ts: Optional[int] = None
+    brand_id: Optional[str] = None
+    subject: Optional[str] = None
+    description: Optional[str] = None
+    requester_hashed: Optional[str] = None
+
+
+class WebhookIngestBatcher:
+    """Coalesce concurrent webhook writes into one RPC per batch window."""
+
+    def __init__(
+        self,
+        *,
+        max_events: int = BATCH_MAX_EVENTS,
+        window_sec: float = BATCH_WINDOW_SEC,
+    ) -> None:
+        self.max_events = max_events
+        self.window_sec = window_sec
+        self._pending: List[Tuple[WebhookEvent, asyncio.Future]] = []
+        self._window_task: Optional[asyncio.Task] = None
+        self._writes: Set[asyncio.Task] = set()
+        self._rpc_supported: Optional[bool] = None
+
+    async def submit(self, event: WebhookEvent) -> str:
+        """Queue an event; returns 'queued', 'duplicate' or 'replay'."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((event, future))
+        if len(self._pending) >= self.max_events:
+            self._flush()
+        elif self._window_task is None or self._window_task.done():
+            self._window_task = loop.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_sec)
+        self._window_task = None
+        self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._write_batch(batch))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write_batch(
+        self, batch: List[Tuple[WebhookEvent, asyncio.Future]]
+    ) -> None:
+        try:
+            outcomes = await self._ingest([event for event, _ in batch])
+        except Exception as exc:
+            outcomes = [exc] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _ingest(self, events: List[WebhookEvent]) -> List[Any]:
+        supa = get_supabase_client()
+        if self._rpc_supported is not False:
+            payload = [asdict(event) for event in events]
+            try:
+                resp = await supa._exec(
+                    lambda: supa.client.rpc(INGEST_RPC, {"p_events": payload}).execute()
+                )
+            except Exception as exc:
+                if not is_missing_rpc(exc, INGEST_RPC):
+                    raise
+                self._rpc_supported = False
+                logger.warning(
+                    "%s RPC unavailable; falling back to per-webhook inserts",
+                    INGEST_RPC,
+                )
+            else:
+                self._rpc_supported = True
+                statuses: Dict[int, str] = {
+                    int(row["idx"]): str(row["status"])
+                    for row in (getattr(resp, "data", None) or [])
+                }
+                return [statuses.get(i, "queued") for i in range(len(events))]
+
+        outcomes: List[Any] = []
+        for event in events:
+            try:
+                outcomes.append(await _ingest_one(supa, event))
+            except Exception as exc:
+                outcomes.append(exc)
+        return outcomes
+
+
+async def _ingest_one(supa: Any, event: WebhookEvent) -> str:
+    """Legacy two-insert path used until the ingest RPC is deployed."""
+    if event.sig_key:
+        try:
+            await supa._exec(
+                lambda: (
+                    supa.client.table("zendesk_webhook_events")
+                    .insert({"sig_key": event.sig_key, "ts": event.ts})
+                    .execute()
+                )
+            )
+        except Exception as exc:
+            if _is_duplicate(exc):
+                return "replay"
+            raise
+    try:
+        await supa._exec(
+            lambda: (
+                supa.client.table("zendesk_pending_tickets")
+                .insert(
+                    {
+                        "ticket_id": event.ticket_id,
+                        "brand_id": event.brand_id,
+                        "subject": event.subject,
+                        "description": event.description,
+                        "payload": {},
+                        "status": "pending",
+                        "requester_hashed": event.requester_hashed,
+                    }
+                )
+                .execute()
+            )
+        )
+    except Exception as exc:
+        if _is_duplicate(exc):
+            return "duplicate"
+        raise
+    return "queued"
+
+
+replay_guard = ReplayGuard()
+ingest_batcher = WebhookIngestBatcher()
@@ -1,7 +1,14 @@
 # ruff: noqa: E402
+import time
+
+# Measured from the first line of this module; compared to STARTUP_IMPORT_BUDGET_SECONDS
+_MODULE_IMPORT_STARTED = time.perf_counter()
+
 import logging
+import importlib
+import threading
 from types import ModuleType
-from typing import cast
+from typing import Any, cast
 from datetime import datetime
 import hmac
 from fastapi import FastAPI, HTTPException, Request, Depends, Header
@@ -10,7 +17,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
 import asyncio
-from langchain_core.messages import HumanMessage
 
 # Ensure AG-UI LangGraph custom events propagate even if site-packages are overwritten
 from app.patches.agui_custom_events import apply_patch as _apply_agui_patch
@@ -35,84 +41,153 @@ from app.core.rate_limiting.exceptions import (
     GeminiServiceUnavailableException,
 )
 
-from app.agents import agent_graph
-from app.api.v1.endpoints import (
-    search_tools_endpoints,
-)  # Added for search tools endpoints
-from app.api.v1.endpoints import (
-    logs_endpoints,  # Log analysis (JSON + SSE + sessions)
-    research_endpoints,  # Research (JSON + SSE)
-    agui_endpoints,  # AG-UI streaming endpoint (primary streaming path)
-    models_endpoints,  # Models listing for frontend selector
-    metadata_endpoints,  # Phase 6: Memory stats, quota status, trace metadata
-)
-from app.api.v1.endpoints import agents_endpoints  # Agent metadata discovery
-from app.api.v1.endpoints import tavily_selftest  # Dev-only Tavily diagnostics
-from app.api.v1.endpoints import feedme  # FeedMe transcript ingestion (modular package)
-from app.api.v1.endpoints import (
-    text_approval_endpoints,
-)  # Text approval workflow for FeedMe
-from app.api.v1.endpoints import chat_session_endpoints  # Chat session persistence
-from app.api.v1.endpoints import rate_limit_endpoints  # Rate limiting monitoring
-from app.api.v1.endpoints import feedme_intelligence  # FeedMe AI intelligence endpoints
-from app.api.v1.endpoints import agent_interrupt_endpoints  # HITL interrupt controls
-from app.api.v1.endpoints import memory  # Memory UI endpoints
-
-# from app.api.v1.endpoints import secure_log_analysis  # Secure Log Analysis endpoints - Disabled due to reasoning engine removal
-from app.api.v1.endpoints import (
-    message_feedback_endpoints,  # Message thumbs up/down feedback
-)
-from app.api.v1.websocket import feedme_websocket  # FeedMe WebSocket endpoints
 from app.core.settings import settings
 from app.core.logging_setup import configure_logging
-from app.integrations.zendesk import router as zendesk_router
-from app.integrations.zendesk.admin_endpoints import router as zendesk_admin_router
-from app.integrations.zendesk.scheduler import start_background_scheduler
 
 # Configure logging early to avoid noisy DEBUG defaults in production.
 configure_logging(production=settings.is_production_mode())
 
-# Conditional imports based on security configuration
+# Routers, the agent graph and OpenTelemetry's SDK are imported lazily: routers
+# are loaded by a background warm-up task started at startup (or by the first
+# non-probe request, whichever comes first), so the process can answer liveness
+# probes before the heavy import graph has been walked.
+LAZY_ROUTER_LOADING: bool = os.getenv("LAZY_ROUTER_LOADING", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+STARTUP_IMPORT_BUDGET_SECONDS: float = float(
+    os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "3.0")
+)
+# Paths served without forcing router loading (orchestrator probes)
+_PROBE_PATHS = frozenset({"/", "/health", "/livez", "/readyz"})
+
+# Conditional imports based on security configuration (populated by load_routers)
 auth_endpoints: ModuleType | None = None
 api_key_endpoints: ModuleType | None = None
 
-if settings.should_enable_auth_endpoints():
-    try:
-        from app.api.v1.endpoints import auth as auth_endpoints
-
-        logging.info("Authentication endpoints enabled")
-    except ImportError as e:
-        logging.warning(f"Failed to import auth endpoints: {e}")
-        auth_endpoints = None
-
-if settings.should_enable_api_key_endpoints():
-    try:
-        from app.api.v1.endpoints import api_key_endpoints
-
-        logging.info("API key endpoints enabled")
-    except ImportError as e:
-        logging.warning(f"Failed to import API key endpoints: {e}")
-        api_key_endpoints = None
+# (module, attribute, include_router kwargs) in registration order
+_ROUTER_SPECS: list[tuple[str, str, dict[str, Any]]] = [
+    (
+        "app.api.v1.endpoints.search_tools_endpoints",
+        "router",
+        {"prefix": "/api/v1/tools", "tags": ["Search Tools"]},
+    ),
+    # GET /api/v1/tools/tavily/self-test (dev-only Tavily diagnostics)
+    (
+        "app.api.v1.endpoints.tavily_selftest",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Search Tools"]},
+    ),
+    # Agent Interaction routers (modularized)
+    (
+        "app.api.v1.endpoints.logs_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Agent Interaction"]},
+    ),
+    (
+        "app.api.v1.endpoints.research_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Agent Interaction"]},
+    ),
+    # /api/v1/agui/stream (primary streaming path)
+    (
+        "app.api.v1.endpoints.agui_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["AG-UI"]},
+    ),
+    # /api/v1/models
+    (
+        "app.api.v1.endpoints.models_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Models"]},
+    ),
+    # /api/v1/agents
+    (
+        "app.api.v1.endpoints.agents_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Agents"]},
+    ),
+    # /api/v1/metadata - Phase 6
+    (
+        "app.api.v1.endpoints.metadata_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Metadata"]},
+    ),
+    # /api/v1/feedback/message
+    (
+        "app.api.v1.endpoints.message_feedback_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Message Feedback"]},
+    ),
+    # /api/v1/memory/*
+    (
+        "app.api.v1.endpoints.memory",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Memory UI"]},
+    ),
+    # FeedMe routes (modular package)
+    (
+        "app.api.v1.endpoints.feedme",
+        "router",
+        {"prefix": "/api/v1", "tags": ["FeedMe"]},
+    ),
+    (
+        "app.api.v1.endpoints.text_approval_endpoints",
+        "router",
+        {"tags": ["FeedMe Text Approval"]},
+    ),
+    (
+        "app.api.v1.endpoints.feedme_intelligence",
+        "router",
+        {"prefix": "/api/v1", "tags": ["FeedMe Intelligence"]},
+    ),
+    (
+        "app.api.v1.endpoints.chat_session_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Chat Sessions"]},
+    ),
+    (
+        "app.api.v1.endpoints.rate_limit_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Rate Limiting"]},
+    ),
+    (
+        "app.api.v1.endpoints.agent_interrupt_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Agent Interrupts"]},
+    ),
+    # Secure Log Analysis routes disabled due to reasoning engine removal
+    # Zendesk integration routes
+    ("app.integrations.zendesk", "router", {"prefix": "/api/v1", "tags": ["Zendesk"]}),
+    (
+        "app.integrations.zendesk.admin_endpoints",
+        "router",
+        {"prefix": "/api/v1", "tags": ["Zendesk Admin"]},
+    ),
+]
 
 # OpenTelemetry Setup
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 import hashlib
 
-# Configure the resource for your application
-resource = Resource(attributes={"service.name": "mb-sparrow-agent-server"})
-
 # Determine if OpenTelemetry exporter should be enabled (e.g., in production)
 ENABLE_OTEL: bool = os.getenv("ENABLE_OTEL", "false").lower() in {"1", "true", "yes"}
 
-# Set up a TracerProvider
-trace.set_tracer_provider(TracerProvider(resource=resource))
-
 if ENABLE_OTEL:
+    # The SDK/exporter stack is only imported when telemetry is actually enabled;
+    # otherwise the API's no-op tracer provider is used.
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+
+    # Configure the resource for your application
+    resource = Resource(attributes={"service.name": "mb-sparrow-agent-server"})
+
+    # Set up a TracerProvider
+    trace.set_tracer_provider(TracerProvider(resource=resource))
+
     try:
         # Configure an OTLP exporter
         # Ensure your OTLP collector is running and accessible (e.g., http://localhost:4318/v1/traces)
@@ -153,6 +228,8 @@ configure_langsmith()
 # Enable FastAPI auto-instrumentation for OpenTelemetry when enabled
 if ENABLE_OTEL:
     try:  # pragma: no cover - best-effort, do not fail app startup on instrumentation issues
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
         FastAPIInstrumentor().instrument_app(app)
     except Exception as _otel_exc:
         print(
@@ -188,9 +265,229 @@ async def _debug_log_agui_requests(request: Request, call_next):
 # LangGraph stream endpoint via router: /api/v1/agui/stream
 # GraphQL shim removed - use stream endpoint for all chat interactions
 
+
+# ---------------------------------------------------------------------------
+# Lazy router loading and startup state
+# ---------------------------------------------------------------------------
+
+_startup_state: dict[str, Any] = {
+    "import_seconds": None,
+    "routers": "pending",
+    "routers_load_seconds": None,
+    "routers_error": None,
+    "routers_retry_at": None,
+    "model_health": "pending",
+    "model_health_seconds": None,
+    "ready_at": None,
+}
+_router_import_lock = threading.Lock()
+_router_register_lock = asyncio.Lock()
+_imported_routers: list[tuple[Any, dict[str, Any]]] | None = None
+_routers_registered = False
+# A failed router import is not retried on the request path until the backoff
+# expires; requests meanwhile get 503 and /readyz reports the error.
+ROUTER_RETRY_BACKOFF_SECONDS = 5.0
+ROUTER_RETRY_BACKOFF_MAX_SECONDS = 300.0
+_router_failures = 0
+_router_retry_at = 0.0
+
+
+def _import_routers() -> list[tuple[Any, dict[str, Any]]]:
+    """Import every router module (thread-safe, idempotent).
+
+    This is the slow part of startup; it is safe to run in a worker thread.
+    """
+    global _imported_routers, auth_endpoints, api_key_endpoints
+    with _router_import_lock:
+        if _imported_routers is not None:
+            return _imported_routers
+
+        routers: list[tuple[Any, dict[str, Any]]] = []
+
+        # Conditionally include authentication router
+        if settings.should_enable_auth_endpoints():
+            try:
+                from app.api.v1.endpoints import auth as _auth_endpoints
+
+                auth_endpoints = _auth_endpoints
+                routers.append(
+                    (
+                        auth_endpoints.router,
+                        {"prefix": "/api/v1/auth", "tags": ["Authentication"]},
+                    )
+                )
+                logging.info("Authentication endpoints enabled")
+            except ImportError as e:
+                logging.warning(f"Failed to import auth endpoints: {e}")
+                auth_endpoints = None
+        if auth_endpoints is None:
+            logging.warning(
+                "Authentication router not registered - endpoints disabled or import failed"
+            )
+
+        # Include local auth bypass router for development
+        if os.getenv("ENABLE_LOCAL_AUTH_BYPASS", "false").lower() == "true":
+            try:
+                from app.api.v1.endpoints import local_auth
+
+                routers.append(
+                    (
+                        local_auth.router,
+                        {"prefix": "/api/v1/auth", "tags": ["Local Auth"]},
+                    )
+                )
+                logging.warning(
+                    "⚠️  LOCAL AUTH BYPASS ENABLED - DO NOT USE IN PRODUCTION"
+                )
+            except ImportError as e:
+                logging.error(f"Failed to import local auth endpoints: {e}")
+
+        # Always include core application routers
+        for module_name, attr, kwargs in _ROUTER_SPECS:
+            module = importlib.import_module(module_name)
+            routers.append((getattr(module, attr), kwargs))
+
+        # Conditionally include API Key Management router
+        if settings.should_enable_api_key_endpoints():
+            try:
+                from app.api.v1.endpoints import api_key_endpoints as _api_key_endpoints
+
+                api_key_endpoints = _api_key_endpoints
+                routers.append(
+                    (
+                        api_key_endpoints.router,
+                        {"prefix": "/api/v1", "tags": ["API Key Management"]},
+                    )
+                )
+                logging.info("API key endpoints enabled")
+            except ImportError as e:
+                logging.warning(f"Failed to import API key endpoints: {e}")
+                api_key_endpoints = None
+        if api_key_endpoints is None:
+            logging.warning(
+                "API Key Management router not registered - endpoints disabled or import failed"
+            )
+
+        # Register FeedMe WebSocket routes
+        from app.api.v1.websocket import feedme_websocket
+
+        routers.append(
+            (feedme_websocket.router, {"prefix": "/ws", "tags": ["FeedMe WebSocket"]})
+        )
+
+        _imported_routers = routers
+        return routers
+
+
+def _register_routers(routers: list[tuple[Any, dict[str, Any]]]) -> None:
+    """Attach imported routers to the app (must run on the event loop thread)."""
+    global _routers_registered
+    if _routers_registered:
+        return
+    for router, kwargs in routers:
+        app.include_router(router, **kwargs)
+    # Routes changed; rebuild the OpenAPI schema on next request
+    app.openapi_schema = None
+    _routers_registered = True
+
+
+def load_routers() -> None:
+    """Synchronously import and register all routers (scripts, tests, eager mode)."""
+    if _routers_registered:
+        return
+    started = time.perf_counter()
+    _register_routers(_import_routers())
+    _startup_state["routers"] = "loaded"
+    _startup_state["routers_load_seconds"] = round(time.perf_counter() - started, 3)
+
+
+class RouterLoadError(RuntimeError):
+    """Routers failed to import; raised until the retry backoff expires."""
+
+
+async def ensure_routers_loaded() -> None:
+    """Import routers off the event loop and register them exactly once.
+
+    After a failed import, callers get :class:`RouterLoadError` without
+    re-running the import until an exponential backoff has elapsed.
+    """
+    global _router_failures, _router_retry_at
+    if _routers_registered:
+        return
+    if _router_failures and time.monotonic() < _router_retry_at:
+        raise RouterLoadError(_startup_state["routers_error"])
+    async with _router_register_lock:
+        if _routers_registered:
+            return
+        if _router_failures and time.monotonic() < _router_retry_at:
+            raise RouterLoadError(_startup_state["routers_error"])
+        started = time.perf_counter()
+        _startup_state["routers"] = "loading"
+        try:
+            routers = await asyncio.to_thread(_import_routers)
+        except Exception as exc:
+            _router_failures += 1
+            backoff = min(
+                ROUTER_RETRY_BACKOFF_SECONDS * 2 ** (_router_failures - 1),
+                ROUTER_RETRY_BACKOFF_MAX_SECONDS,
+            )
+            _router_retry_at = time.monotonic() + backoff
+            _startup_state["routers"] = "failed"
+            _startup_state["routers_error"] = f"{type(exc).__name__}: {exc}"
+            _startup_state["routers_retry_at"] = round(time.time() + backoff, 3)
+            logging.error(
+                "Router loading failed; retrying in %.0fs: %s",
+                backoff,
+                exc,
+                exc_info=True,
+            )
+            raise
+        _router_failures = 0
+        _register_routers(routers)
+        _start_post_load_tasks()
+        _startup_state["routers"] = "loaded"
+        _startup_state["routers_error"] = None
+        _startup_state["routers_retry_at"] = None
+        _startup_state["routers_load_seconds"] = round(time.perf_counter() - started, 3)
+        logging.info(
+            "Routers loaded in %.2fs (%d routers)",
+            _startup_state["routers_load_seconds"],
+            len(routers),
+        )
+
+
+class _LazyRouterMiddleware:
+    """ASGI middleware that loads routers before the first non-probe request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not _routers_registered
+            and scope["type"] in {"http", "websocket"}
+            and scope.get("path") not in _PROBE_PATHS
+        ):
+            try:
+                await ensure_routers_loaded()
+            except Exception:
+                # Logged and surfaced via /readyz by ensure_routers_loaded.
+                if scope["type"] == "websocket":
+                    await send({"type": "websocket.close", "code": 1013})
+                else:
+                    response = JSONResponse(
+                        status_code=503,
+                        content={"detail": "Service is starting; routers unavailable"},
+                    )
+                    await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
 # Add SlowAPI middleware for rate limiting
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
+app.add_middleware(_LazyRouterMiddleware)
 
 # Add CORS middleware (explicit origins when credentials are allowed)
 cors_env = os.getenv("CORS_ALLOW_ORIGINS", "").strip()
@@ -225,99 +522,153 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Conditionally include authentication router
-if auth_endpoints and settings.should_enable_auth_endpoints():
-    app.include_router(
-        auth_endpoints.router, prefix="/api/v1/auth", tags=["Authentication"]
-    )
-    logging.info("Authentication router registered")
-else:
-    logging.warning(
-        "Authentication router not registered - endpoints disabled or import failed"
+if not LAZY_ROUTER_LOADING:
+    load_routers()
+
+# Keep references to fire-and-forget startup tasks so they are not GC'd mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro) -> asyncio.Task:
+    task = asyncio.get_event_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _run_model_health_checks() -> None:
+    """Run model health checks (non-fatal; uses real API calls)."""
+    started = time.perf_counter()
+    _startup_state["model_health"] = "running"
+    try:
+        from app.core.config.health_check import run_startup_health_checks
+        from app.agents.unified.model_router import model_router
+
+        results = await run_startup_health_checks()
+        if results:
+            allowed = {
+                model_id for model_id, payload in results.items() if payload.get("ok")
+            }
+            blocked = {
+                model_id
+                for model_id, payload in results.items()
+                if not payload.get("ok")
+            }
+            if allowed:
+                model_router.allowed_models = allowed
+                logging.info(
+                    "Model health checks complete: %s/%s models available",
+                    len(allowed),
+                    len(results),
+                )
+                if blocked:
+                    logging.warning(
+                        "Model health checks failed for: %s",
+                        ", ".join(sorted(blocked)),
+                    )
+            else:
+                logging.warning(
+                    "Model health checks completed but no models passed; router left unrestricted"
+                )
+        else:
+            logging.info(
+                "Model health checks skipped or empty; router left unrestricted"
+            )
+        _startup_state["model_health"] = "complete"
+    except Exception as exc:  # pragma: no cover - best effort startup checks
+        _startup_state["model_health"] = "failed"
+        logging.warning("Model health checks failed: %s", exc)
+    _startup_state["model_health_seconds"] = round(time.perf_counter() - started, 3)
+
+
+async def _warm_up() -> None:
+    """Background startup: load routers, retrying until they load.
+
+    Retries honour the backoff in :func:`ensure_routers_loaded`; a request
+    may load the routers first, in which case this loop just exits.
+    """
+    while True:
+        try:
+            await ensure_routers_loaded()
+            break
+        except Exception:  # pragma: no cover - logged and surfaced through /readyz
+            await asyncio.sleep(max(_router_retry_at - time.monotonic(), 0.0))
+    # Routers registered eagerly at import never pass through the lazy path.
+    _start_post_load_tasks()
+
+
+_post_load_started = False
+
+
+def _start_post_load_tasks() -> None:
+    """Start the subsystems that need routers, once, on the first load."""
+    global _post_load_started
+    if _post_load_started:
+        return
+    _post_load_started = True
+    _spawn_background(_after_routers_loaded())
+
+
+async def _after_routers_loaded() -> None:
+    """Record readiness, start the scheduler and retention, then health checks."""
+    _startup_state["ready_at"] = _seconds_since_process_start()
+    logging.info(
+        "Application ready %.2fs after process start",
+        _startup_state["ready_at"] or 0.0,
     )
 
-# Include local auth bypass router for development
-if os.getenv("ENABLE_LOCAL_AUTH_BYPASS", "false").lower() == "true":
+    # Start Zendesk background scheduler (feature guarded internally)
     try:
-        from app.api.v1.endpoints import local_auth
+        from app.integrations.zendesk.scheduler import start_background_scheduler
+
+        _spawn_background(start_background_scheduler())
+        logging.info("Zendesk scheduler task started")
+    except Exception as e:  # pragma: no cover
+        logging.error("Failed to start Zendesk scheduler: %s", e)
+
+    _start_checkpoint_retention()
+
+    await _run_model_health_checks()
+
+
+_checkpoint_thread_manager = None
+
 
-        app.include_router(
-            local_auth.router, prefix="/api/v1/auth", tags=["Local Auth"]
+def _start_checkpoint_retention() -> None:
+    """Start the periodic LangGraph checkpoint retention job (Postgres only)."""
+    global _checkpoint_thread_manager
+    if not (
+        settings.checkpointer_enabled
+        and settings.checkpointer_db_url
+        and settings.checkpointer_retention_enabled
+    ):
+        return
+    try:
+        from app.agents.harness.persistence import (
+            CheckpointerConfig,
+            SupabaseCheckpointer,
+            ThreadManager,
         )
-        logging.warning("⚠️  LOCAL AUTH BYPASS ENABLED - DO NOT USE IN PRODUCTION")
-    except ImportError as e:
-        logging.error(f"Failed to import local auth endpoints: {e}")
 
-# Always include core application routers
-app.include_router(
-    search_tools_endpoints.router, prefix="/api/v1/tools", tags=["Search Tools"]
-)
-app.include_router(
-    tavily_selftest.router, prefix="/api/v1", tags=["Search Tools"]
-)  # GET /api/v1/tools/tavily/self-test
-# Register Agent Interaction routers (modularized)
-app.include_router(logs_endpoints.router, prefix="/api/v1", tags=["Agent Interaction"])
-app.include_router(
-    research_endpoints.router, prefix="/api/v1", tags=["Agent Interaction"]
-)
-app.include_router(
-    agui_endpoints.router, prefix="/api/v1", tags=["AG-UI"]
-)  # /api/v1/agui/stream
-app.include_router(
-    models_endpoints.router, prefix="/api/v1", tags=["Models"]
-)  # /api/v1/models
-app.include_router(
-    agents_endpoints.router, prefix="/api/v1", tags=["Agents"]
-)  # /api/v1/agents
-app.include_router(
-    metadata_endpoints.router, prefix="/api/v1", tags=["Metadata"]
-)  # /api/v1/metadata - Phase 6
-app.include_router(
-    message_feedback_endpoints.router, prefix="/api/v1", tags=["Message Feedback"]
-)  # /api/v1/feedback/message
-# Register Memory UI routes
-app.include_router(
-    memory.router, prefix="/api/v1", tags=["Memory UI"]
-)  # /api/v1/memory/*
-# Register FeedMe routes (modular package)
-app.include_router(feedme.router, prefix="/api/v1", tags=["FeedMe"])
-# Register FeedMe Text Approval routes
-app.include_router(text_approval_endpoints.router, tags=["FeedMe Text Approval"])
-# Register FeedMe Intelligence routes
-app.include_router(
-    feedme_intelligence.router, prefix="/api/v1", tags=["FeedMe Intelligence"]
-)
-# Register Chat Session routes
-app.include_router(
-    chat_session_endpoints.router, prefix="/api/v1", tags=["Chat Sessions"]
-)
-# Register Rate Limiting routes
-app.include_router(
-    rate_limit_endpoints.router, prefix="/api/v1", tags=["Rate Limiting"]
-)
-# Register Agent Interrupt control routes
-app.include_router(
-    agent_interrupt_endpoints.router, prefix="/api/v1", tags=["Agent Interrupts"]
-)
-# Register Secure Log Analysis routes
-# app.include_router(secure_log_analysis.router, prefix="/api/v1", tags=["Secure Log Analysis"])  # Disabled due to reasoning engine removal
-# Register Zendesk integration routes
-app.include_router(zendesk_router, prefix="/api/v1", tags=["Zendesk"])
-app.include_router(zendesk_admin_router, prefix="/api/v1", tags=["Zendesk Admin"])
-
-# Conditionally include API Key Management router
-if api_key_endpoints and settings.should_enable_api_key_endpoints():
-    app.include_router(
-        api_key_endpoints.router, prefix="/api/v1", tags=["API Key Management"]
-    )
-    logging.info("API Key Management router registered")
-else:
-    logging.warning(
-        "API Key Management router not registered - endpoints disabled or import failed"
-    )
+        checkpointer = SupabaseCheckpointer(
+            CheckpointerConfig(
+                db_url=settings.checkpointer_db_url, pool_size=1, max_overflow=0
+            )
+        )
+        _checkpoint_thread_manager = ThreadManager(checkpointer)
+        _checkpoint_thread_manager.start_retention_job()
+        logging.info("Checkpoint retention job started")
+    except Exception as e:  # pragma: no cover
+        logging.error("Failed to start checkpoint retention job: %s", e)
 
-# Register FeedMe WebSocket routes
-app.include_router(feedme_websocket.router, prefix="/ws", tags=["FeedMe WebSocket"])
+
+def _seconds_since_process_start() -> float | None:
+    try:
+        import psutil
+
+        return round(time.time() - psutil.Process().create_time(), 3)
+    except Exception:
+        return None
 
 
 @app.on_event("startup")
@@ -363,50 +714,9 @@ async def startup_event():
 
     logging.info("==========================================")
 
-    # Run model health checks on startup (non-fatal; uses real API calls).
-    try:
-        from app.core.config.health_check import run_startup_health_checks
-        from app.agents.unified.model_router import model_router
-
-        results = await run_startup_health_checks()
-        if results:
-            allowed = {
-                model_id for model_id, payload in results.items() if payload.get("ok")
-            }
-            blocked = {
-                model_id
-                for model_id, payload in results.items()
-                if not payload.get("ok")
-            }
-            if allowed:
-                model_router.allowed_models = allowed
-                logging.info(
-                    "Model health checks complete: %s/%s models available",
-                    len(allowed),
-                    len(results),
-                )
-                if blocked:
-                    logging.warning(
-                        "Model health checks failed for: %s",
-                        ", ".join(sorted(blocked)),
-                    )
-            else:
-                logging.warning(
-                    "Model health checks completed but no models passed; router left unrestricted"
-                )
-        else:
-            logging.info(
-                "Model health checks skipped or empty; router left unrestricted"
-            )
-    except Exception as exc:  # pragma: no cover - best effort startup checks
-        logging.warning("Model health checks failed: %s", exc)
-
-    # Start Zendesk background scheduler (feature guarded internally)
-    try:
-        asyncio.get_event_loop().create_task(start_background_scheduler())
-        logging.info("Zendesk scheduler task started")
-    except Exception as e:  # pragma: no cover
-        logging.error("Failed to start Zendesk scheduler: %s", e)
+    # Router loading, the Zendesk scheduler and model health checks run in the
+    # background; /readyz reports their progress.
+    _spawn_background(_warm_up())
 
 
 @app.on_event("shutdown")
@@ -423,6 +733,14 @@ async def shutdown_event():
     except Exception as e:
         logging.warning(f"Rate limiter cleanup failed: {e}")
 
+    if _checkpoint_thread_manager is not None:
+        try:
+            await _checkpoint_thread_manager.stop_retention_job()
+            await _checkpoint_thread_manager.pool.close()
+            logging.info("Checkpoint retention job stopped")
+        except Exception as e:
+            logging.warning(f"Checkpoint retention shutdown failed: {e}")
+
     # Clear Supabase client singleton (thread-safe)
     try:
         from app.db.supabase.client import clear_supabase_client
@@ -614,6 +932,37 @@ async def health_check():
         )
 
 
+@app.get("/livez", tags=["General"])
+async def liveness_probe():
+    """Liveness probe: the process is up and serving (never touches routers)."""
+    return {"status": "alive", "service": "mb-sparrow-agent-server"}
+
+
+@app.get("/readyz", tags=["General"])
+async def readiness_probe():
+    """Readiness probe: 200 once routers are loaded; model health is informational.
+
+    A failed router import reports ``"failed"`` with the error and the time of
+    the next retry in ``startup``.
+    """
+    ready = _routers_registered
+    if ready:
+        status = "ready"
+    elif _startup_state["routers"] == "failed":
+        status = "failed"
+    else:
+        status = "starting"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": status,
+            "service": "mb-sparrow-agent-server",
+            "startup": dict(_startup_state),
+            "import_budget_seconds": STARTUP_IMPORT_BUDGET_SECONDS,
+        },
+    )
+
+
 # Rate limiting test endpoint removed - functionality verified
 # The global exception handlers are working properly for all rate-limited endpoints
 
@@ -689,6 +1038,10 @@ async def agent_invoke_endpoint(request: AgentQueryRequest):
     if not request.query:
         raise HTTPException(status_code=400, detail="Query cannot be empty")
 
+    # Imported on first use: the agent graph pulls in the full LangGraph stack
+    from langchain_core.messages import HumanMessage
+    from app.agents import agent_graph
+
     # Initial state for the graph
     # The graph expects messages in a specific format, often List[BaseMessage]
     # For simplicity, we'll wrap the query. Adjust if your graph expects richer messages.
@@ -735,5 +1088,22 @@ async def agent_invoke_endpoint(request: AgentQueryRequest):
         )
 
 
+_startup_state["import_seconds"] = round(
+    time.perf_counter() - _MODULE_IMPORT_STARTED, 3
+)
+if _startup_state["import_seconds"] > STARTUP_IMPORT_BUDGET_SECONDS:
+    logging.warning(
+        "app.main import took %.2fs (budget %.2fs); check for eager heavy imports",
+        _startup_state["import_seconds"],
+        STARTUP_IMPORT_BUDGET_SECONDS,
+    )
+else:
+    logging.info(
+        "app.main imported in %.2fs (budget %.2fs)",
+        _startup_state["import_seconds"],
+        STARTUP_IMPORT_BUDGET_SECONDS,
+    )
+
+
 # To run this app (from the project root directory):
 # uvicorn app.main:app --reload
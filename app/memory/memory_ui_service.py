@@ -12,7 +12,7 @@ import asyncio
 import os
 import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional, Sequence
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Sequence
 
 from postgrest.base_request_builder import CountMethod
 from uuid import UUID
@@ -38,6 +38,7 @@ ZERO_UUID = UUID("00000000-0000-0000-0000-000000000000")
 EMBEDDING_SYNC_TIMEOUT_SECONDS = 12.0
 EMBEDDING_DEFERRED_TIMEOUT_SECONDS = 45.0
 DEFAULT_EDITED_FILTER_SCAN_CAP = 20000
+EXPORT_PAGE_SIZE = 500
 
 
 def _load_edited_filter_scan_cap() -> int:
@@ -695,6 +696,56 @@ class MemoryUIService:
             logger.error("Failed to dismiss duplicate %s: %s", candidate_id, exc)
             raise
 
+    async def iter_memories_for_export(
+        self,
+        *,
+        source_type: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        created_after: Optional[datetime] = None,
+        page_size: int = EXPORT_PAGE_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of memories for export using keyset pagination on id.
+
+        Filters are applied in the query, and only one page is held at a
+        time, so export memory use does not grow with tenant size.
+
+        Args:
+            source_type: Filter by source type.
+            min_confidence: Minimum confidence score (inclusive).
+            created_after: Only memories created at or after this timestamp.
+            page_size: Rows fetched per round trip.
+
+        Yields:
+            Lists of memory records ordered by id.
+        """
+        supabase = self._get_supabase()
+        page_size = max(1, int(page_size))
+        last_id: Optional[str] = None
+
+        while True:
+            query = supabase.client.table("memories").select(
+                self.MEMORY_SELECT_COLUMNS
+            )
+            if source_type:
+                query = query.eq("source_type", source_type)
+            if min_confidence is not None:
+                query = query.gte("confidence_score", float(min_confidence))
+            if created_after is not None:
+                query = query.gte("created_at", created_after.isoformat())
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            query = query.order("id").limit(page_size)
+
+            response = await supabase._exec(lambda: query.execute())
+            rows = [row for row in response.data or [] if isinstance(row, dict)]
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            last_id = str(rows[-1].get("id"))
+
     async def get_stats(self) -> Dict[str, Any]:
         """
         Get memory statistics using the get_memory_stats database function.
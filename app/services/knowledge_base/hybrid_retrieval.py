@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, List, Optional
+import json
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 
 from loguru import logger
 from postgrest.exceptions import APIError
@@ -13,6 +15,8 @@ from app.db.supabase.client import SupabaseClient, get_supabase_client
 from app.db.embedding import utils as embedding_utils
 from app.security.pii_redactor import redact_pii_from_dict
 
+_RESULT_CACHE_MAXSIZE = 256
+
 
 class HybridRetrieval:
     """Combines vector similarity and lightweight text search for KB articles."""
@@ -31,6 +35,8 @@ class HybridRetrieval:
         default_chars = getattr(settings, "primary_agent_max_kb_chars", 600)
         raw_chars = snippet_chars if snippet_chars is not None else default_chars
         self.snippet_chars = max(160, int(raw_chars or 600))
+        # cache key -> (stored_at, fused + redacted rows)
+        self._result_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
 
     async def search_knowledge_base(
         self,
@@ -44,11 +50,91 @@ class HybridRetrieval:
             return []
 
         k = max(1, min(int(top_k or 5), 10))
-        embedding = await self._embed_query(query_text)
-        vector_rows = await self._vector_search(embedding, k, min_score)
-        text_rows = await self._text_search(query_text, k, filters)
+        cache_key = self._cache_key(query_text, k, min_score, filters)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Text search needs no embedding, so it runs alongside embed + vector
+        # search. Each leg has its own deadline: a slow leg only costs its
+        # timeout and the other leg's results are still used.
+        (vector_rows, vector_ok), (text_rows, text_ok) = await asyncio.gather(
+            self._run_leg(
+                "vector",
+                self._embed_and_vector_search(query_text, k, min_score),
+                getattr(settings, "kb_vector_search_timeout_sec", 5.0),
+            ),
+            self._run_leg(
+                "full_text",
+                self._text_search(query_text, k, filters),
+                getattr(settings, "kb_text_search_timeout_sec", 3.0),
+            ),
+        )
         fused = self._reciprocal_rank_fusion(vector_rows, text_rows, k)
-        return [redact_pii_from_dict(row) for row in fused]
+        results = [redact_pii_from_dict(row) for row in fused]
+        # Legs raise on failure (vs. returning [] for no hits), so degraded
+        # results are not cached and the next call retries both legs.
+        if vector_ok and text_ok:
+            self._cache_set(cache_key, results)
+        return results
+
+    async def _run_leg(
+        self, leg: str, call: Awaitable[List[Dict[str, Any]]], timeout: float
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        try:
+            if timeout and timeout > 0:
+                return await asyncio.wait_for(call, timeout=timeout), True
+            return await call, True
+        except asyncio.TimeoutError:
+            logger.warning(
+                "KB {} search timed out after {:.1f}s; continuing without it",
+                leg,
+                timeout,
+            )
+        except Exception as exc:
+            logger.warning("KB {} search failed; continuing without it: {}", leg, exc)
+        return [], False
+
+    async def _embed_and_vector_search(
+        self, query_text: str, top_k: int, min_score: float
+    ) -> List[Dict[str, Any]]:
+        if getattr(self.supabase, "mock_mode", False):
+            logger.warning("Supabase mock mode active; skipping vector KB search")
+            return []
+        embedding = await self._embed_query(query_text)
+        return await self._vector_search(embedding, top_k, min_score)
+
+    @staticmethod
+    def _cache_key(
+        query_text: str,
+        top_k: int,
+        min_score: float,
+        filters: Optional[Dict[str, Any]],
+    ) -> str:
+        normalized = " ".join(query_text.lower().split())
+        filter_key = json.dumps(filters or {}, sort_keys=True, default=str)
+        return f"{top_k}:{float(min_score):.4f}:{filter_key}:{normalized}"
+
+    def _cache_get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        ttl = getattr(settings, "kb_search_cache_ttl_sec", 60.0)
+        entry = self._result_cache.get(key)
+        if not entry or ttl <= 0:
+            return None
+        stored_at, rows = entry
+        if time.monotonic() - stored_at > ttl:
+            self._result_cache.pop(key, None)
+            return None
+        return [dict(row) for row in rows]
+
+    def _cache_set(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        if getattr(settings, "kb_search_cache_ttl_sec", 60.0) <= 0:
+            return
+        if key not in self._result_cache and len(self._result_cache) >= (
+            _RESULT_CACHE_MAXSIZE
+        ):
+            # Dicts keep insertion order; drop the oldest entry.
+            self._result_cache.pop(next(iter(self._result_cache)))
+        self._result_cache[key] = (time.monotonic(), [dict(row) for row in rows])
 
     async def _embed_query(self, query: str) -> List[float]:
         loop = asyncio.get_running_loop()
@@ -60,15 +146,12 @@ class HybridRetrieval:
         if getattr(self.supabase, "mock_mode", False):
             logger.warning("Supabase mock mode active; skipping vector KB search")
             return []
-        try:
-            rows = await self.supabase.search_kb_articles(
-                query_embedding=embedding,
-                limit=top_k,
-                similarity_threshold=min_score,
-            )
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.error("Vector KB search failed: %s", exc)
-            return []
+        # Errors propagate so _run_leg can tell a failed leg from "no hits".
+        rows = await self.supabase.search_kb_articles(
+            query_embedding=embedding,
+            limit=top_k,
+            similarity_threshold=min_score,
+        )
 
         normalized: List[Dict[str, Any]] = []
         for row in rows or []:
@@ -84,9 +167,17 @@ class HybridRetrieval:
         if getattr(self.supabase, "mock_mode", False):
             return []
 
-        rows = await self._full_text_rpc(query_text, top_k)
+        legacy_fallback = getattr(settings, "enable_kb_legacy_fallback", False)
+        try:
+            rows = await self._full_text_rpc(query_text, top_k)
+        except Exception:
+            # Without the legacy path the leg has failed; with it, the legacy
+            # query's outcome (which may itself raise) decides.
+            if not legacy_fallback:
+                raise
+            rows = []
         if not rows:
-            if getattr(settings, "enable_kb_legacy_fallback", False):
+            if legacy_fallback:
                 rows = await self._legacy_text_search(query_text, top_k)
             if not rows:
                 return []
@@ -111,19 +202,16 @@ class HybridRetrieval:
 
         try:
             response = await asyncio.to_thread(_call_rpc)
-            return response.data or []
         except APIError as exc:
-            # Graceful downgrade when RPC is missing or misconfigured
+            # Usually a missing or misconfigured RPC; the caller degrades.
             logger.warning(
                 "Full-text RPC search failed with APIError",
                 error=str(exc),
                 code=getattr(exc, "code", None),
                 hint=getattr(exc, "hint", None),
             )
-            return []
-        except Exception as exc:
-            logger.warning("Full-text RPC search failed: %s", exc)
-            return []
+            raise
+        return response.data or []
 
     async def _legacy_text_search(
         self, query_text: str, top_k: int
@@ -173,12 +261,8 @@ class HybridRetrieval:
 
             return query_builder.limit(top_k).execute()
 
-        try:
-            response = await asyncio.to_thread(_run_query)
-            return response.data or []
-        except Exception as exc:  # pragma: no cover - best effort fallback
-            logger.warning("Fallback full-text KB search failed: %s", exc)
-            return []
+        response = await asyncio.to_thread(_run_query)
+        return response.data or []
 
     def _passes_filters(
         self, row: Dict[str, Any], filters: Optional[Dict[str, Any]]
@@ -0,0 +1,309 @@
+"""Shared result cache and rate limiting for web research tools.
+
+Concurrent tickets and subagents often research the same product issues and
+URLs. Research results are cached per normalized query/URL with:
+
+- a fresh TTL, after which the entry is served stale while one background
+  refresh runs (stale-while-revalidate), until the stale window also ends
+- single-flight coalescing, so identical in-flight requests share one call
+
+``ResearchCache.get_or_compute`` serves the sync tool methods (they run in
+worker threads via ``asyncio.to_thread``); ``aget_or_compute`` serves async
+callers such as the grounding service. Failures are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.logging_config import get_logger
+
+logger = get_logger("research_cache")
+
+SEARCH_TTL_SECONDS = float(os.getenv("RESEARCH_CACHE_SEARCH_TTL_SEC", "900"))
+SCRAPE_TTL_SECONDS = float(os.getenv("RESEARCH_CACHE_SCRAPE_TTL_SEC", "3600"))
+STALE_SECONDS = float(os.getenv("RESEARCH_CACHE_STALE_SEC", "3600"))
+MAX_ENTRIES = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "512"))
+FIRECRAWL_MIN_INTERVAL_SECONDS = float(os.getenv("FIRECRAWL_MIN_INTERVAL_SEC", "1.0"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid")
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return _WHITESPACE_RE.sub(" ", (query or "").strip()).lower()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical URL: lowercase scheme/host, no fragment, tracking params or
+    trailing slash, sorted query string."""
+    raw = (url or "").strip()
+    try:
+        parts = urlsplit(raw)
+    except ValueError:
+        return raw
+    if not parts.scheme or not parts.netloc:
+        return raw
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), "")
+    )
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def make_key(namespace: str, *parts: Any, **options: Any) -> Hashable:
+    """Build a cache key from already-normalized parts and call options."""
+    return (namespace, _freeze(parts), _freeze(options))
+
+
+def _copy(value: Any) -> Any:
+    # Callers annotate results in place; hand each one its own top-level dict.
+    return dict(value) if isinstance(value, dict) else value
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class ResearchCache:
+    """Bounded TTL cache with stale-while-revalidate and single-flight."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self._max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._async_in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="research-refresh"
+        )
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    # -- storage -----------------------------------------------------------
+
+    def _lookup(self, key: Hashable) -> Tuple[Optional[_Entry], bool]:
+        """Return (entry, is_fresh); expired entries are dropped."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            if now >= entry.stale_until:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return entry, now < entry.fresh_until
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(value, now + ttl, now + ttl + STALE_SECONDS)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    # -- sync callers ------------------------------------------------------
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        *,
+        ttl: float,
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Any:
+        entry, fresh = self._lookup(key)
+        if entry is not None:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._start_flight(key, compute, ttl, cacheable, background=True)
+            return _copy(entry.value)
+
+        self.misses += 1
+        future, owner = self._start_flight(key, compute, ttl, cacheable)
+        if not owner:
+            self.coalesced += 1
+        return _copy(future.result())
+
+    def _start_flight(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: float,
+        cacheable: Callable[[Any], bool],
+        *,
+        background: bool = False,
+    ) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._in_flight[key] = future
+
+        def _run() -> None:
+            try:
+                result = compute()
+            except BaseException as exc:
+                future.set_exception(exc)
+                if background:
+                    logger.warning("research_cache_refresh_failed", error=str(exc))
+            else:
+                if cacheable(result):
+                    self._store(key, result, ttl)
+                future.set_result(result)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+        if background:
+            self._refresh_pool.submit(_run)
+        else:
+            _run()
+        return future, True
+
+    # -- async callers -----------------------------------------------------
+
+    async def aget_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        ttl: float,
+        cacheable: Callable[[Any], bool] = lambda result: True,
+    ) -> Any:
+        entry, fresh = self._lookup(key)
+        if entry is not None:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if key not in self._async_in_flight:
+                    task = asyncio.create_task(
+                        self._acompute(key, compute, ttl, cacheable)
+                    )
+                    task.add_done_callback(_log_refresh_failure)
+            return _copy(entry.value)
+
+        self.misses += 1
+        in_flight = self._async_in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return _copy(await asyncio.shield(in_flight))
+        return _copy(await self._acompute(key, compute, ttl, cacheable))
+
+    async def _acompute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        cacheable: Callable[[Any], bool],
+    ) -> Any:
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._async_in_flight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved for the owner's copy.
+            future.exception()
+            raise
+        else:
+            if cacheable(result):
+                self._store(key, result, ttl)
+            future.set_result(result)
+            return result
+        finally:
+            if self._async_in_flight.get(key) is future:
+                del self._async_in_flight[key]
+
+    # -- observability -----------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _log_refresh_failure(task: "asyncio.Task[Any]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("research_cache_refresh_failed", error=str(task.exception()))
+
+
+class MinIntervalLimiter:
+    """Thread-safe limiter spacing calls at least ``interval`` seconds apart.
+
+    Each caller reserves the next free slot under a lock and only waits for
+    the remainder of its own slot, so calls that are already spaced out do
+    not wait at all. Tool methods run in worker threads, so waiting here
+    never blocks the event loop.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = max(0.0, interval)
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+research_cache = ResearchCache()
+firecrawl_limiter = MinIntervalLimiter(FIRECRAWL_MIN_INTERVAL_SECONDS)
+
+
+def get_research_cache_stats() -> Dict[str, Any]:
+    """Return research cache statistics for observability."""
+    return research_cache.stats()
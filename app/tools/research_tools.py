@@ -1,5 +1,4 @@
 import os
-import time
 from typing import Any, Optional, Callable
 
 from dotenv import load_dotenv
@@ -26,12 +25,27 @@ try:  # pragma: no cover – optional dependency
 except ImportError:  # pragma: no cover
     TavilyClient = None  # type: ignore
 
+from app.tools.research_cache import (
+    SCRAPE_TTL_SECONDS,
+    SEARCH_TTL_SECONDS,
+    firecrawl_limiter,
+    make_key,
+    normalize_query,
+    normalize_url,
+    research_cache,
+)
+
 # Load environment variables from .env file (noop if file missing)
 load_dotenv()
 
 # NOTE: Redis caching for Firecrawl has been removed.
-# Firecrawl caching is handled by the service itself via the `max_age` parameter
-# when using scrape endpoints. The unified tool wrappers avoid extra cache layers.
+# Results are cached in-process by `research_cache` (normalized query/URL keys,
+# stale-while-revalidate, single-flight); Firecrawl additionally honours
+# `max_age` on scrape endpoints.
+
+
+def _is_successful(result: Any) -> bool:
+    return isinstance(result, dict) and not result.get("error")
 
 
 class TavilySearchTool:
@@ -79,12 +93,6 @@ class TavilySearchTool:
         self.client = TavilyClient(api_key=api_key)
         self.disabled = False
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type(Exception),
-    )
     def search(
         self,
         query: str,
@@ -116,6 +124,40 @@ class TavilySearchTool:
             # Return empty list while still conforming to schema
             return {"urls": [], "images": [], "results": []}
 
+        options = {
+            "max_results": max_results,
+            "include_images": include_images,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "days": days,
+            "topic": topic,
+        }
+        return research_cache.get_or_compute(
+            make_key("tavily.search", normalize_query(query), **options),
+            lambda: self._search(query, **options),
+            ttl=SEARCH_TTL_SECONDS,
+            cacheable=lambda result: bool(result.get("results")),
+        )
+
+    @retry(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type(Exception),
+    )
+    def _search(
+        self,
+        query: str,
+        max_results: int,
+        include_images: bool,
+        search_depth: str,
+        include_domains: list | None,
+        exclude_domains: list | None,
+        days: int | None,
+        topic: str | None,
+    ) -> dict:
+
         # Build search kwargs with all supported parameters
         search_kwargs: dict[str, Any] = {
             "query": query,
@@ -211,12 +253,6 @@ class TavilySearchTool:
             "attribution": results.get("attribution"),
         }
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type(Exception),
-    )
     def extract(self, urls: list[str]) -> dict:
         """Extract full content from URLs using Tavily's extract feature.
 
@@ -236,6 +272,21 @@ class TavilySearchTool:
 
         # Limit to 10 URLs as per Tavily's API limits
         urls = urls[:10]
+        return research_cache.get_or_compute(
+            make_key("tavily.extract", *(normalize_url(u) for u in urls)),
+            lambda: self._extract(urls),
+            ttl=SCRAPE_TTL_SECONDS,
+            cacheable=lambda result: _is_successful(result)
+            and bool(result.get("results")),
+        )
+
+    @retry(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type(Exception),
+    )
+    def _extract(self, urls: list[str]) -> dict:
         client = self.client
         if client is None:
             return {"error": "tavily_unavailable", "results": []}
@@ -283,9 +334,9 @@ class FirecrawlTool:
 
     Supports: scrape, search, map, crawl, and extract operations.
 
-    NOTE: Caching is handled by Firecrawl via the `max_age` parameter on scrape
-    calls. This class provides the direct SDK interface without additional
-    caching to avoid redundant cache layers.
+    Scrape and search results are cached in-process by ``research_cache``;
+    crawl, map, extract and status calls always go to the API. Outgoing calls
+    share ``firecrawl_limiter`` instead of sleeping a fixed second each.
     """
 
     def __init__(self, api_key: Optional[str] = None):
@@ -331,9 +382,14 @@ class FirecrawlTool:
         if self.disabled:
             return {"error": "firecrawl_disabled"}
 
-        # Respect a minimal delay between subsequent API calls (simple rate-limit)
-        time.sleep(1)
+        return research_cache.get_or_compute(
+            make_key("firecrawl.scrape", normalize_url(url)),
+            lambda: self._scrape_url(url),
+            ttl=SCRAPE_TTL_SECONDS,
+            cacheable=_is_successful,
+        )
 
+    def _scrape_url(self, url: str) -> dict:
         @retry(
             reraise=True,
             stop=stop_after_attempt(3),
@@ -345,6 +401,7 @@ class FirecrawlTool:
             scrape_fn = getattr(self.app, "scrape", None)
             if scrape_fn is None:
                 raise AttributeError("Firecrawl client missing `scrape` method")
+            firecrawl_limiter.wait()
             return scrape_fn(u)
 
         try:
@@ -430,8 +487,15 @@ class FirecrawlTool:
         if max_age is not None:
             scrape_params["max_age"] = max_age
 
-        time.sleep(1)  # Rate limiting
+        cache_params = dict(scrape_params, url=normalize_url(url))
+        return research_cache.get_or_compute(
+            make_key("firecrawl.scrape_with_options", **cache_params),
+            lambda: self._scrape_with_params(url, scrape_params),
+            ttl=SCRAPE_TTL_SECONDS,
+            cacheable=_is_successful,
+        )
 
+    def _scrape_with_params(self, url: str, scrape_params: dict) -> dict:
         @retry(
             reraise=True,
             stop=stop_after_attempt(3),
@@ -441,6 +505,7 @@ class FirecrawlTool:
         def _call_scrape():
             scrape_args = dict(scrape_params)
             scrape_url = scrape_args.pop("url", url)
+            firecrawl_limiter.wait()
             return self.app.scrape(scrape_url, **scrape_args)
 
         try:
@@ -465,6 +530,14 @@ class FirecrawlTool:
         if app is None:
             return {"error": "firecrawl_disabled"}
 
+        return research_cache.get_or_compute(
+            make_key("firecrawl.search", normalize_query(query)),
+            lambda: self._search(app, query),
+            ttl=SEARCH_TTL_SECONDS,
+            cacheable=_is_successful,
+        )
+
+    def _search(self, app: Any, query: str) -> dict:
         @retry(
             reraise=True,
             stop=stop_after_attempt(3),
@@ -472,6 +545,7 @@ class FirecrawlTool:
             retry=retry_if_exception_type(Exception),
         )
         def _call_search(q: str):
+            firecrawl_limiter.wait()
             return app.search(q)
 
         try:
@@ -510,6 +584,15 @@ class FirecrawlTool:
         if scrape_options:
             search_params["scrape_options"] = scrape_options
 
+        cache_params = dict(search_params, query=normalize_query(query))
+        return research_cache.get_or_compute(
+            make_key("firecrawl.search_web", **cache_params),
+            lambda: self._search_web(search_params),
+            ttl=SEARCH_TTL_SECONDS,
+            cacheable=_is_successful,
+        )
+
+    def _search_web(self, search_params: dict) -> dict:
         @retry(
             reraise=True,
             stop=stop_after_attempt(3),
@@ -517,6 +600,7 @@ class FirecrawlTool:
             retry=retry_if_exception_type(Exception),
         )
         def _call_search():
+            firecrawl_limiter.wait()
             return self.app.search(**search_params)
 
         try:
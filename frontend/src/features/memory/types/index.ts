@@ -273,7 +273,8 @@ export interface ExportFilters {
 }
 
 export interface ExportMemoriesRequest {
-  format: "json";
+  format: "json" | "ndjson";
+  compress?: boolean;
   filters?: ExportFilters;
 }
 
@@ -0,0 +1,104 @@
+"""
+Benchmark EnhancedPDFParser direct-extraction throughput.
+
+Compares serial parsing against page-range sharding across the process pool
+for one or more PDFs. Without --pdf, a synthetic multi-hundred-page transcript
+is generated with reportlab.
+
+Example:
+    python scripts/benchmark_pdf_parser.py --pages 400 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+# ruff: noqa: E402
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.feedme.parsers.pdf_parser import EnhancedPDFParser
+
+
+def _build_synthetic_pdf(pages: int) -> bytes:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buf = io.BytesIO()
+    pdf = canvas.Canvas(buf, pagesize=letter)
+    width, height = letter
+    for page in range(1, pages + 1):
+        y = height - 50
+        pdf.drawString(50, y, f"Ticket #{100000 + page} - page {page}")
+        for line in range(45):
+            y -= 14
+            speaker = "Customer" if line % 2 == 0 else "Mailbird Support"
+            pdf.drawString(
+                50,
+                y,
+                f"{speaker}: message {line} about IMAP sync, OAuth and folder settings",
+            )
+        pdf.showPage()
+    pdf.save()
+    return buf.getvalue()
+
+
+def _time_parse(
+    parser: EnhancedPDFParser, content: bytes, repeat: int
+) -> tuple[list[float], int]:
+    timings = []
+    pages = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = parser._parse_pdf_sync(content)
+        timings.append(time.perf_counter() - started)
+        if not result.success:
+            raise RuntimeError(result.error_message or "parse failed")
+        pages = len(result.pages)
+    return timings, pages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", type=Path, nargs="*", default=[])
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pages-per-shard", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    documents: list[tuple[str, bytes]] = [(str(p), p.read_bytes()) for p in args.pdf]
+    if not documents:
+        documents.append((f"synthetic-{args.pages}p", _build_synthetic_pdf(args.pages)))
+
+    for name, content in documents:
+        baseline = None
+        for workers in args.workers:
+            pdf_parser = EnhancedPDFParser(
+                max_pages=10_000,
+                enable_ocr=False,
+                parse_workers=workers,
+                pages_per_shard=args.pages_per_shard,
+            )
+            # Warm the process pool so start-up cost is not attributed to parsing
+            pdf_parser._parse_pdf_sync(content)
+            timings, pages = _time_parse(pdf_parser, content, args.repeat)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(
+                f"{name}: workers={workers:<2} median={median:.2f}s "
+                f"pages/s={pages / median:.1f} "
+                f"speedup={baseline / median:.2f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
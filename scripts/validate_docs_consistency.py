@@ -104,7 +104,10 @@ def load_api_routes() -> set[str]:
     try:
         if str(ROOT) not in sys.path:
             sys.path.insert(0, str(ROOT))
-        from app.main import app  # type: ignore
+        from app.main import app, load_routers  # type: ignore
+
+        # Routers are registered lazily at startup; force them in for validation.
+        load_routers()
     except Exception as exc:  # pragma: no cover - best effort for local env differences
         print(f"[warn] Could not import app.main for endpoint validation: {exc}")
         return set()
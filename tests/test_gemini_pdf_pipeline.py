@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.rate_limiting.exceptions import RateLimitExceededException
+from app.feedme.processors import gemini_pdf_processor as gpp
+
+
+class _PassThroughLimiter:
+    async def execute_with_protection(self, _name, func, *args):
+        return await func(*args)
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(gpp, "get_rate_limiter", lambda: _PassThroughLimiter())
+    monkeypatch.setattr(
+        gpp,
+        "_render_page_range",
+        lambda _pdf, first, last: [f"pages {first}-{last}"],
+    )
+
+    def run(generate, *, use_pages, on_progress=None, max_concurrent_calls=2):
+        monkeypatch.setattr(gpp, "_agenerate_content", generate)
+        return asyncio.run(
+            gpp._run_extraction_pipeline(
+                b"%PDF",
+                use_pages=use_pages,
+                total_pages=use_pages,
+                truncated=False,
+                pages_per_call=1,
+                model_candidates=["test-model"],
+                max_concurrent_calls=max_concurrent_calls,
+                render_prefetch=2,
+                on_progress=on_progress,
+            )
+        )
+
+    return run
+
+
+def test_progress_callback_may_run_its_own_event_loop(pipeline):
+    # Mirrors update_conversation_status, which persists via asyncio.run().
+    recorded = []
+    threads = set()
+
+    async def _persist(progress):
+        recorded.append(progress)
+
+    def on_progress(_partial, progress):
+        threads.add(threading.current_thread())
+        asyncio.run(_persist(dict(progress)))
+
+    async def generate(_model, parts):
+        if parts[0] != gpp._final_merge_prompt():
+            return f"# {parts[-1]}"
+        return parts[-1]
+
+    markdown, info = pipeline(generate, use_pages=3, on_progress=on_progress)
+
+    assert [p["chunks_completed"] for p in recorded] == sorted(
+        p["chunks_completed"] for p in recorded
+    )
+    assert threading.main_thread() not in threads
+    assert recorded[-1]["chunks_completed"] == 3
+    assert recorded[-1]["pages_completed"] == 3
+    assert info["pages_processed"] == 3
+    assert "pages 3-3" in markdown
+
+
+def test_rate_limit_keeps_only_contiguous_prefix(pipeline):
+    async def generate(_model, parts):
+        chunk = parts[-1]
+        if chunk == "pages 2-2":
+            raise RateLimitExceededException()
+        # Page 3 is already in flight when page 2 is rate limited.
+        await asyncio.sleep(0.05)
+        return f"# {chunk}"
+
+    markdown, info = pipeline(generate, use_pages=4, max_concurrent_calls=3)
+
+    assert markdown == "# pages 1-1"
+    assert info["pages_processed"] == 1
+    assert info["chunks_completed"] == 1
+    assert any("after page 1 of 4" in warning for warning in info["warnings"])